@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Tuple, Dict, Any, List, Optional, Union
+from typing import Tuple, Dict, Any, List, Optional, Union, BinaryIO
 import pandas as pd
 import numpy as np
 from io import BytesIO
@@ -10,16 +10,17 @@ def cleaned_table_name(dataset_id: int) -> str:
     return f"cleaned_{dataset_id}"  # simple helper
 
 
-def detect_header_and_read(path_or_bytes: Union[bytes, str], delimiter: Optional[str] = None) -> pd.DataFrame:
+def detect_header_and_read(path_or_bytes: Union[bytes, str, BinaryIO], delimiter: Optional[str] = None) -> pd.DataFrame:
     """Simplified reader: always treat first row as header.
 
     Previous heuristic sometimes mis-identified a data row as the header when
     the first data line had more distinct tokens than the real header, producing
     'broken' column names (e.g. first data row values becoming headers).
     This simplified version favors correctness for standard CSV/Excel files.
+    Accepts raw bytes, a seekable binary file object (e.g. a spooled upload), or a path.
     """
-    if isinstance(path_or_bytes, bytes):
-        bio = BytesIO(path_or_bytes)
+    if isinstance(path_or_bytes, bytes) or hasattr(path_or_bytes, 'read'):
+        bio = BytesIO(path_or_bytes) if isinstance(path_or_bytes, bytes) else path_or_bytes
         # Peek to decide excel vs csv
         peek = bio.read(4)
         bio.seek(0)
@@ -121,11 +122,13 @@ def infer_and_cast_dtypes(df: pd.DataFrame, date_cols: Optional[List[str]] = Non
 
 def handle_missing_values(df: pd.DataFrame, cfg: CleaningConfig) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     info: Dict[str, Any] = {}
-    missing_before = {c: int(df[c].isna().sum()) for c in df.columns}
+    # One isna() pass gives both the per-column counts and the per-row fractions drop_rows needs
+    missing_mask = df.isna()
+    missing_before = dict(zip(df.columns, missing_mask.sum().tolist()))
 
     rows_dropped = 0
     if cfg.missing_mode == 'drop_rows':
-        row_missing_fraction = df.isna().mean(axis=1)
+        row_missing_fraction = missing_mask.mean(axis=1)
         to_drop = row_missing_fraction > cfg.drop_row_missing_threshold
         rows_dropped = int(to_drop.sum())
         if rows_dropped:
@@ -160,7 +163,7 @@ def handle_missing_values(df: pd.DataFrame, cfg: CleaningConfig) -> Tuple[pd.Dat
                 df[col] = s.fillna(fill_val)
     # leave mode -> no filling
 
-    missing_after = {c: int(df[c].isna().sum()) for c in df.columns}
+    missing_after = dict(zip(df.columns, df.isna().sum().tolist()))
     info['missing_by_column'] = {c: {'before': missing_before[c], 'after': missing_after[c]} for c in df.columns}
     info['missing_mode'] = cfg.missing_mode
     return df, info
@@ -282,7 +285,7 @@ def run_cleaning_pipeline(df_raw: pd.DataFrame, cfg: CleaningConfig) -> Tuple[pd
     return df, metadata
 
 # Backwards compatibility wrappers (if older code still imports them)
-def read_file_to_df(filename: str, content: bytes, delimiter: Optional[str] = None) -> pd.DataFrame:
+def read_file_to_df(filename: str, content: Union[bytes, BinaryIO], delimiter: Optional[str] = None) -> pd.DataFrame:
     return detect_header_and_read(content, delimiter=delimiter)
 
 def clean_dataframe(df: pd.DataFrame, config: Optional[CleaningConfig] = None):  # deprecated
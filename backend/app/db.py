@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
@@ -9,22 +10,75 @@ engine = create_engine(
     DATABASE_URL,
     connect_args={
         "check_same_thread": False,
-        "timeout": 30  # seconds
+        "timeout": 30,  # seconds
+        # per-connection prepared statement cache (sqlite3 default 128); endpoints reuse a fixed set
+        # of log/snapshot/PRAGMA statements across many dataset tables
+        "cached_statements": 256
     }
 )
 
+def _apply_common_pragmas(cursor):
+    cursor.execute("PRAGMA cache_size=-64000;")  # ~64MB page cache (negative means KB units)
+    cursor.execute("PRAGMA temp_store=MEMORY;")  # sort/temp b-trees (CTAS snapshots, ORDER BY) stay off disk
+    cursor.execute("PRAGMA mmap_size=268435456;")  # read pages through a 256MB memory map
+
+
 # Enable WAL mode and a slightly larger cache for better concurrency on SQLite.
+# The busy timeout comes from connect_args above.
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     try:
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA journal_mode=WAL;")
         cursor.execute("PRAGMA synchronous=NORMAL;")
-        cursor.execute("PRAGMA cache_size=-64000;")  # ~64MB page cache (negative means KB units)
+        _apply_common_pragmas(cursor)
+        cursor.execute("PRAGMA wal_autocheckpoint=1000;")
         cursor.close()
     except Exception:
         pass
 
+
+# Separate pool for read-only traffic (graph rendering). Under WAL readers don't block the writer,
+# so keeping them off the main pool means slow chart queries never hold connections that mutating
+# endpoints are waiting for. query_only makes an accidental write fail instead of taking the lock.
+if ":memory:" in DATABASE_URL:
+    # an in-memory database is private to its connection; a second engine would see nothing
+    engine_ro = engine
+else:
+    engine_ro = create_engine(
+        DATABASE_URL,
+        pool_size=os.cpu_count() or 4,
+        max_overflow=0,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": 30,
+            "cached_statements": 256
+        }
+    )
+
+    @event.listens_for(engine_ro, "connect")
+    def set_sqlite_readonly_pragma(dbapi_connection, connection_record):
+        try:
+            cursor = dbapi_connection.cursor()
+            _apply_common_pragmas(cursor)
+            cursor.execute("PRAGMA query_only=1;")
+            cursor.close()
+        except Exception:
+            pass
+
+
+@contextmanager
+def begin_immediate():
+    """engine.begin() that takes the SQLite write lock up front with BEGIN IMMEDIATE.
+
+    A deferred transaction only asks for the lock at its first write, and if another writer got
+    there in between it fails with SQLITE_BUSY; an immediate one waits for the lock (up to the
+    busy timeout) before doing any work. Use it for transactions that read and then write.
+    """
+    with engine.begin() as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        yield conn
+
 # Configure sessionmaker with explicit settings for deletions
 SessionLocal = sessionmaker(
     autocommit=False, 
@@ -6,8 +6,10 @@ with the existing dataset infrastructure. Users can create various types of
 graphs with customizable options including colors, labels, spacing, and more.
 """
 
+import os
 import json
 import base64
+from functools import lru_cache
 from io import BytesIO
 from typing import List, Dict, Any, Optional, Literal, Union
 import pandas as pd
@@ -17,8 +19,23 @@ import seaborn as sns
 import numpy as np
 
 from ..models import Dataset
-from ..pipeline import load_preview_from_sqlite, list_table_columns
-from ..db import engine
+from ..pipeline import load_preview_from_sqlite, list_table_columns, cleaned_table_version
+from ..db import engine_ro
+
+
+# Correlation heatmaps and pairplots only need screen precision, so their numeric columns are
+# downcast to float32 (half the memory per frame). Set GRAPH_HIGH_PRECISION=1 to keep float64.
+HIGH_PRECISION = os.environ.get("GRAPH_HIGH_PRECISION", "0") == "1"
+
+
+def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the numeric columns of ``df`` to float32 unless HIGH_PRECISION is set."""
+    if HIGH_PRECISION:
+        return df
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    if len(numeric_cols) == 0:
+        return df
+    return df.astype({col: 'float32' for col in numeric_cols})
 
 
 # Chart type definitions (kept for documentation; runtime accepts any string)
@@ -91,12 +108,26 @@ class GraphGenerator:
     
     def __init__(self, dataset_id: int, db_engine: Any = None):
         self.dataset_id = dataset_id
-        self.engine = db_engine or engine
+        self.engine = db_engine or engine_ro
         self._data_cache = None
         self._columns_cache = None
+        self._plot_data_builder = None
+        self._last_png = None
     
-    def _get_data(self, limit: Optional[int] = None) -> pd.DataFrame:
-        """Load data from the dataset, with optional caching."""
+    def _get_data(self, limit: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load data from the dataset, with optional caching.
+
+        ``columns`` restricts the SELECT to the columns a chart uses, so the driver never builds
+        Python objects for the rest of the table. Such partial reads are not cached.
+        """
+        if columns is not None and not limit:
+            wanted = list(dict.fromkeys(c for c in columns if c))
+            if self._data_cache is not None:
+                return self._data_cache[wanted]
+            col_sql = ', '.join('"' + c.replace('"', '""') + '"' for c in wanted)
+            return pd.read_sql_query(
+                f"SELECT {col_sql} FROM cleaned_{self.dataset_id}", self.engine
+            )
         if self._data_cache is None or limit:
             if limit:
                 query = f"SELECT * FROM cleaned_{self.dataset_id} LIMIT {limit}"
@@ -110,6 +141,18 @@ class GraphGenerator:
     # Public accessor for downstream packaging
     def get_dataframe(self) -> pd.DataFrame:
         return self._get_data()
+
+    def get_plot_data(self) -> Optional[Dict[str, Any]]:
+        """JSON-ready values behind the last bar/line/scatter/histogram chart.
+
+        Built lazily from what the chart method already computed (counts, aggregates, sorted
+        frame, histogram bins), so nothing is re-read or re-aggregated.
+        """
+        return self._plot_data_builder() if self._plot_data_builder else None
+
+    def get_png_bytes(self) -> Optional[bytes]:
+        """Raw PNG of the last chart, for callers that send the image without base64/JSON."""
+        return self._last_png
     
     def _get_columns(self) -> List[str]:
         """Get list of available columns in the dataset."""
@@ -164,17 +207,16 @@ class GraphGenerator:
         cmap = plt.cm.get_cmap(config.color_palette)
         return [cmap(i / (n_colors - 1)) for i in range(n_colors)]
     
-    def _save_plot_to_base64(self, config: GraphConfiguration) -> str:
-        """Convert the current plot to base64 string."""
+    def _save_plot_to_base64(self, config: GraphConfiguration, figure: Any = None) -> str:
+        """Convert the current plot (or the given figure) to base64 string."""
         if config.tight_layout:
             plt.tight_layout()
         
         buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=config.dpi, bbox_inches='tight')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
+        (figure or plt).savefig(buffer, format='png', dpi=config.dpi, bbox_inches='tight')
         plt.close()
-        return image_base64
+        self._last_png = buffer.getvalue()
+        return base64.b64encode(self._last_png).decode()
 
     def _resolve_custom_value(self, value: Any, data: pd.DataFrame) -> Any:
         """Resolve special placeholder values used in custom plot specifications."""
@@ -311,7 +353,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[x_column, y_column])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
@@ -326,10 +368,16 @@ class GraphGenerator:
             ax.set_xticklabels(value_counts.index)
             if not config.ylabel:
                 config.ylabel = "Count"
+            self._plot_data_builder = lambda: {
+                "labels": value_counts.index.tolist(),
+                "values": value_counts.values.tolist(),
+                "metric": "count"
+            }
         else:
             # Aggregated bar chart
             if data[y_column].dtype in ['object', 'category']:
                 grouped = data.groupby(x_column)[y_column].count()
+                metric = f"count({y_column})"
                 if not config.ylabel:
                     config.ylabel = f"Count of {y_column}"
             else:
@@ -343,11 +391,17 @@ class GraphGenerator:
                 }
                 agg_key = agg_funcs.get(aggregation.lower(), 'mean')
                 grouped = data.groupby(x_column)[y_column].agg(agg_key)
+                metric = f"{agg_key}({y_column})"
                 if not config.ylabel:
                     config.ylabel = f"{aggregation.title()} of {y_column}"
             
             colors = self._get_colors(config, len(grouped))
             bars = ax.bar(grouped.index, grouped.values, color=colors, alpha=config.alpha)
+            self._plot_data_builder = lambda: {
+                "labels": [str(label) for label in grouped.index.tolist()],
+                "values": grouped.values.tolist(),
+                "metric": metric
+            }
         
         self._apply_common_formatting(ax, config)
         return self._save_plot_to_base64(config)
@@ -363,7 +417,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[x_column, y_column, group_by])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
@@ -374,6 +428,10 @@ class GraphGenerator:
         if group_by is None:
             # Simple line plot
             data_sorted = data.sort_values(x_column)
+            self._plot_data_builder = lambda: {
+                "x": data_sorted[x_column].tolist(),
+                "y": data_sorted[y_column].tolist()
+            }
             colors = self._get_colors(config, 1)
             color = colors[0] if colors else None
             ax.plot(
@@ -402,6 +460,12 @@ class GraphGenerator:
                     linestyle=line_style,
                     **extra_kwargs
                 )
+            self._plot_data_builder = lambda: {
+                "series": [
+                    {"group": str(name), "x": g[x_column].tolist(), "y": g[y_column].tolist()}
+                    for name, g in data.sort_values(x_column).groupby(group_by)
+                ]
+            }
         
         self._apply_common_formatting(ax, config)
         return self._save_plot_to_base64(config)
@@ -418,7 +482,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[x_column, y_column, color_by, size_by])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
@@ -460,6 +524,15 @@ class GraphGenerator:
         # Add colorbar if using continuous color mapping
         if color_by and data[color_by].dtype not in ['object', 'category']:
             plt.colorbar(scatter, ax=ax, label=color_by)
+
+        def scatter_data() -> Dict[str, Any]:
+            payload = {"x": data[x_column].tolist(), "y": data[y_column].tolist()}
+            if color_by and color_by in data.columns:
+                payload["color_by"] = data[color_by].astype(str).tolist()
+            if size_by and size_by in data.columns:
+                payload["size_by"] = data[size_by].tolist()
+            return payload
+        self._plot_data_builder = scatter_data
         
         self._apply_common_formatting(ax, config)
         return self._save_plot_to_base64(config)
@@ -473,14 +546,19 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[column])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
         
         colors = self._get_colors(config, 1)
-        ax.hist(data[column].dropna(), bins=config.bins, 
-               color=colors[0], alpha=config.alpha, edgecolor='black')
+        counts, bin_edges, _ = ax.hist(data[column].dropna().to_numpy(), bins=config.bins,
+                                       color=colors[0], alpha=config.alpha, edgecolor='black')
+        self._plot_data_builder = lambda: {
+            "bins": bin_edges.tolist(),
+            "counts": counts.astype(int).tolist(),
+            "column": column
+        }
         
         if not config.xlabel:
             config.xlabel = column
@@ -500,7 +578,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[x_column, y_column])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
@@ -527,7 +605,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[x_column, y_column])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
@@ -552,7 +630,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[column])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
@@ -580,7 +658,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=columns)
         self._setup_plot_style(config)
         
         if columns is None:
@@ -588,6 +666,7 @@ class GraphGenerator:
             numeric_data = data.select_dtypes(include=[np.number])
         else:
             numeric_data = data[columns].select_dtypes(include=[np.number])
+        numeric_data = _downcast_numeric(numeric_data)
         
         fig, ax = plt.subplots(figsize=config.figsize)
         
@@ -624,6 +703,7 @@ class GraphGenerator:
             plot_data = data[numeric_cols]
         else:
             plot_data = data[columns]
+        plot_data = _downcast_numeric(plot_data)
         
         # Add color column if specified
         if color_by and color_by in data.columns:
@@ -639,15 +719,7 @@ class GraphGenerator:
         if config.title:
             g.fig.suptitle(config.title, y=1.02, fontsize=config.title_size)
         
-        if config.tight_layout:
-            plt.tight_layout()
-        
-        buffer = BytesIO()
-        g.savefig(buffer, format='png', dpi=config.dpi, bbox_inches='tight')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        plt.close()
-        return image_base64
+        return self._save_plot_to_base64(config, figure=g)
 
     def create_area_chart(
         self, 
@@ -659,7 +731,7 @@ class GraphGenerator:
         if config is None:
             config = GraphConfiguration()
         
-        data = self._get_data()
+        data = self._get_data(columns=[x_column, *y_columns])
         self._setup_plot_style(config)
         
         fig, ax = plt.subplots(figsize=config.figsize)
@@ -680,11 +752,20 @@ def get_available_columns(dataset_id: int, db_engine: Any = None) -> Dict[str, L
     """
     Get available columns for a dataset, categorized by data type.
     
+    Results are cached per cleaned_table_version, since any schema change or edit can change
+    the inferred types.
+    
     Returns:
         Dict with keys: 'numerical', 'categorical', 'datetime', 'all'
     """
-    engine_to_use = db_engine or engine
-    
+    engine_to_use = db_engine or engine_ro
+    version = cleaned_table_version(dataset_id, engine_to_use)
+    cached = _cached_available_columns(dataset_id, engine_to_use, version)
+    return {key: list(cols) for key, cols in cached.items()}
+
+
+@lru_cache(maxsize=256)
+def _cached_available_columns(dataset_id: int, engine_to_use: Any, version: tuple) -> Dict[str, List[str]]:
     # Load a small sample to infer types
     sample_data = pd.read_sql_query(
         f"SELECT * FROM cleaned_{dataset_id} LIMIT 100", engine_to_use
@@ -754,17 +835,22 @@ def validate_chart_parameters(
 
 
 # Convenience functions for common chart types
-def quick_bar_chart(dataset_id: int, x_column: str, title: str = None) -> str:
-    """Quick bar chart with minimal configuration."""
+def quick_bar_chart(dataset_id: int, x_column: str, title: str = None,
+                    generator: Optional[GraphGenerator] = None) -> str:
+    """Quick bar chart with minimal configuration.
+
+    Pass ``generator`` to render through an existing one (e.g. to read its PNG bytes afterwards).
+    """
     config = GraphConfiguration(title=title or f"Distribution of {x_column}")
-    generator = GraphGenerator(dataset_id)
+    generator = generator or GraphGenerator(dataset_id)
     return generator.create_bar_chart(x_column, config=config)
 
 
-def quick_correlation_matrix(dataset_id: int, title: str = None) -> str:
-    """Quick correlation matrix with minimal configuration."""
+def quick_correlation_matrix(dataset_id: int, title: str = None,
+                             generator: Optional[GraphGenerator] = None) -> str:
+    """Quick correlation matrix with minimal configuration (``generator`` as in quick_bar_chart)."""
     config = GraphConfiguration(title=title or "Correlation Matrix", figsize=(12, 10))
-    generator = GraphGenerator(dataset_id)
+    generator = generator or GraphGenerator(dataset_id)
     return generator.create_correlation_matrix(config=config)
 
 
@@ -772,13 +858,14 @@ def quick_scatter_plot(
     dataset_id: int, 
     x_column: str, 
     y_column: str, 
-    title: str = None
+    title: str = None,
+    generator: Optional[GraphGenerator] = None
 ) -> str:
-    """Quick scatter plot with minimal configuration."""
+    """Quick scatter plot with minimal configuration (``generator`` as in quick_bar_chart)."""
     config = GraphConfiguration(
         title=title or f"{y_column} vs {x_column}",
         xlabel=x_column,
         ylabel=y_column
     )
-    generator = GraphGenerator(dataset_id)
+    generator = generator or GraphGenerator(dataset_id)
     return generator.create_scatter_plot(x_column, y_column, config=config)
@@ -1,7 +1,9 @@
 import os
 import logging
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .db import Base, engine
 from sqlalchemy import text
@@ -13,7 +15,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger("udc")
 
-app = FastAPI(title="Universal Data Cleaner", version="0.1.0")
+
+class AppJSONResponse(ORJSONResponse):
+    """orjson-rendered responses (graph payloads carry a base64 PNG plus long numeric series).
+
+    Non-string dict keys are allowed so payloads keyed by ints render as they did with json.dumps,
+    and numpy scalars/arrays returned directly (outside a response_model) are serialised natively.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(title="Universal Data Cleaner", version="0.1.0", default_response_class=AppJSONResponse)
 
 default_origins = [
     "http://localhost:3000",
@@ -51,6 +65,13 @@ def _ensure_column(table: str, column: str, ddl: str):
     except Exception as e:
         logger.warning("Failed adding column %s.%s: %s", table, column, e)
 
+def _ensure_index(name: str, table: str, columns: str):
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+    except Exception as e:
+        logger.warning("Failed creating index %s on %s: %s", name, table, e)
+
 # Only run for SQLite (simple) - you can migrate to Alembic later
 try:
     _ensure_column('datasets', 'updated_at', 'TIMESTAMP')
@@ -61,6 +82,8 @@ try:
     _ensure_column('datasets', 'is_multi_source', 'BOOLEAN DEFAULT 0')
     _ensure_column('datasets', 'source_count', 'INTEGER DEFAULT 1')
     _ensure_column('datasets', 'merge_history', 'TEXT DEFAULT "[]"')
+    # Case-insensitive name index backing the related-datasets prefix lookup
+    _ensure_index('ix_datasets_name_nocase', 'datasets', 'name COLLATE NOCASE')
 except Exception as e:
     logger.warning("Column ensure step failed: %s", e)
 
@@ -73,3 +96,7 @@ app.include_router(modeling.router)
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+# Build /openapi.json once the routes above are registered, while the worker starts:
+# app.openapi() caches it on the app, so no docs request pays for walking the schemas
+app.openapi()
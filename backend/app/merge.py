@@ -17,10 +17,13 @@ from sqlalchemy import text
 from . import models
 from .db import engine
 from .cleaning import cleaned_table_name
-from .pipeline import save_cleaned_to_sqlite
+from .pipeline import save_cleaned_to_sqlite, _quote_identifier
 
 logger = logging.getLogger("udc.merge")
 
+# Number of existing rows merged against when only a preview of the result is needed
+PREVIEW_SAMPLE_ROWS = 1000
+
 
 class MergeError(Exception):
     """Exception raised during merge operations."""
@@ -156,9 +159,26 @@ def merge_on_column_join(existing_df: pd.DataFrame, new_df: pd.DataFrame,
         raise MergeError(f"Failed to merge on column '{merge_column}': {e}")
 
 
+def _joined_row_count(table_name: str, new_df: pd.DataFrame, merge_column: str, join_type: str) -> int:
+    """Rows the full join of table_name with new_df on merge_column would produce.
+
+    Only per-key row counts are needed: the table's come from a GROUP BY, and joining the two count
+    frames with pd.merge matches keys exactly as the real merge does (NaN with NaN included).
+    """
+    column = _quote_identifier(merge_column)
+    existing_counts = pd.read_sql_query(
+        f"SELECT {column} AS k, COUNT(*) AS n FROM {table_name} GROUP BY {column}", engine
+    )
+    new_counts = new_df[merge_column].value_counts(dropna=False).rename_axis('k').reset_index(name='n')
+    joined = pd.merge(existing_counts, new_counts, on='k', how=join_type, suffixes=('_existing', '_new'))
+    # a key on one side only contributes its own rows (outer/left/right)
+    return int((joined['n_existing'].fillna(1) * joined['n_new'].fillna(1)).sum())
+
+
 def perform_merge_operation(dataset_id: int, new_df: pd.DataFrame, merge_strategy: str,
                           merge_column: Optional[str] = None, join_type: str = 'outer',
-                          prefix_conflicting_columns: bool = True) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+                          prefix_conflicting_columns: bool = True,
+                          preview: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Perform a merge operation based on the specified strategy.
     
@@ -169,6 +189,8 @@ def perform_merge_operation(dataset_id: int, new_df: pd.DataFrame, merge_strateg
         merge_column: Column to merge on (required for merge_on_column)
         join_type: Type of join for merge_on_column
         prefix_conflicting_columns: Whether to prefix conflicting columns
+        preview: Merge against only the first PREVIEW_SAMPLE_ROWS existing rows. The
+            metadata then carries 'existing_rows_total' and 'estimated_rows' for the full merge.
     
     Returns:
         Tuple of (merged_df, merge_metadata)
@@ -176,15 +198,42 @@ def perform_merge_operation(dataset_id: int, new_df: pd.DataFrame, merge_strateg
     try:
         # Load existing dataset
         table_name = cleaned_table_name(dataset_id)
-        existing_df = pd.read_sql_table(table_name, con=engine)
+        existing_total = None
+        if preview:
+            existing_df = pd.read_sql_query(f"SELECT * FROM {table_name} LIMIT {PREVIEW_SAMPLE_ROWS}", engine)
+            with engine.connect() as conn:
+                existing_total = int(conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table_name}").scalar() or 0)
+        else:
+            existing_df = pd.read_sql_table(table_name, con=engine)
+        sample_rows = len(existing_df)
         
         if merge_strategy == 'append_below':
-            return append_below_merge(existing_df, new_df, prefix_conflicting_columns)
+            merged_df, merge_metadata = append_below_merge(existing_df, new_df, prefix_conflicting_columns)
+            if existing_total is not None:
+                merge_metadata.update({
+                    "rows_before": existing_total,
+                    "rows_after": existing_total + len(new_df),
+                    "existing_rows_total": existing_total,
+                    "estimated_rows": existing_total + len(new_df)
+                })
+            return merged_df, merge_metadata
         
         elif merge_strategy == 'merge_on_column':
             if not merge_column:
                 raise MergeError("merge_column is required for merge_on_column strategy")
-            return merge_on_column_join(existing_df, new_df, merge_column, join_type, prefix_conflicting_columns)
+            merged_df, merge_metadata = merge_on_column_join(existing_df, new_df, merge_column, join_type, prefix_conflicting_columns)
+            if existing_total is not None:
+                if existing_total <= sample_rows:
+                    # The sample covered the whole table, so the join result is exact
+                    estimated_rows = len(merged_df)
+                else:
+                    estimated_rows = _joined_row_count(table_name, new_df, merge_column, join_type)
+                merge_metadata.update({
+                    "rows_before_existing": existing_total,
+                    "existing_rows_total": existing_total,
+                    "estimated_rows": estimated_rows
+                })
+            return merged_df, merge_metadata
         
         elif merge_strategy == 'keep_separate':
             # For keep_separate, we don't actually merge - this would create a new dataset
@@ -293,9 +342,11 @@ def get_available_merge_columns(dataset_id: int, new_df: pd.DataFrame) -> Dict[s
     """
     try:
         table_name = cleaned_table_name(dataset_id)
-        existing_df = pd.read_sql_table(table_name, con=engine)
-        
-        existing_cols = set(existing_df.columns)
+        # Only the column names are needed, so read the schema rather than the table contents
+        with engine.connect() as conn:
+            existing_cols = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table_name})").fetchall()}
+        if not existing_cols:
+            raise MergeError(f"Table {table_name} not found")
         new_cols = set(new_df.columns)
         
         return {
@@ -1,18 +1,62 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Tuple
 import pandas as pd
+from pandas.io.sql import SQLDatabase, SQLTable
 from sqlalchemy.engine import Engine
 
 from .cleaning import cleaned_table_name
 
 
+def _quote_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sqlite_column_values(series: pd.Series) -> list:
+    """Column values as plain Python objects the sqlite3 driver can bind (missing -> None).
+
+    Matches what to_sql stores: datetimes as SQLAlchemy's DateTime text, dates as Date text,
+    timedeltas as int nanoseconds.
+    """
+    missing = series.isna()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+    elif pd.api.types.is_timedelta64_dtype(series):
+        series = series.astype('int64')
+    elif series.dtype == object:
+        kind = pd.api.types.infer_dtype(series, skipna=True)
+        if kind == 'date':
+            series = series.map(lambda v: v.isoformat(), na_action='ignore')
+        elif kind == 'datetime':
+            series = series.map(lambda v: v.strftime('%Y-%m-%d %H:%M:%S.%f'), na_action='ignore')
+    values = series.astype(object)
+    if missing.any():
+        values = values.where(~missing, None)
+    return values.tolist()
+
+
 def save_cleaned_to_sqlite(df: pd.DataFrame, dataset_id: int, engine: Engine, if_exists: str = 'replace') -> None:
     """Persist cleaned dataframe to a per-dataset table.
     Table name pattern: cleaned_<dataset_id>
-    Uses pandas to_sql with index=False.
+    pandas to_sql (index=False) creates the table from the empty frame, with the column types pandas
+    infers from the full frame (an empty object column would otherwise always become TEXT); rows are
+    then bulk inserted with a single DB-API executemany in the same transaction, skipping to_sql's
+    per-row overhead.
     """
     table = cleaned_table_name(dataset_id)
-    df.to_sql(table, engine, if_exists=if_exists, index=False)
+    with engine.begin() as conn:
+        schema = SQLTable(table, SQLDatabase(conn), frame=df, index=False)
+        dtypes = {column.name: column.type for column in schema.table.columns}
+        df.head(0).to_sql(table, conn, if_exists=if_exists, index=False, dtype=dtypes)
+        if df.empty:
+            return
+        columns = ', '.join(_quote_identifier(c) for c in df.columns)
+        placeholders = ', '.join('?' for _ in df.columns)
+        rows = zip(*(_sqlite_column_values(df.iloc[:, i]) for i in range(df.shape[1])))
+        cursor = conn.connection.cursor()
+        try:
+            cursor.executemany(f"INSERT INTO {_quote_identifier(table)} ({columns}) VALUES ({placeholders})", rows)
+        finally:
+            cursor.close()
 
 
 def load_preview_from_sqlite(dataset_id: int, engine: Engine, limit: int = 50) -> pd.DataFrame:
@@ -26,6 +70,23 @@ def list_table_columns(dataset_id: int, engine: Engine) -> List[str]:
     table = cleaned_table_name(dataset_id)
     # Use PRAGMA table_info
     with engine.connect() as conn:
-        res = conn.execute(f"PRAGMA table_info({table})")
+        res = conn.exec_driver_sql(f"PRAGMA table_info({_quote_identifier(table)})")
         cols = [row[1] for row in res.fetchall()]
     return cols
+
+
+def cleaned_table_version(dataset_id: int, engine: Engine) -> Tuple:
+    """Cheap token that changes whenever the dataset's cleaned table may have changed.
+
+    PRAGMA schema_version moves on any DDL (table replaced, columns added/dropped/renamed,
+    snapshot restored), the latest operation log id on every logged edit, and datasets.updated_at
+    on writes that aren't logged, such as the batch cell editor.
+    """
+    with engine.connect() as conn:
+        schema_version = conn.exec_driver_sql("PRAGMA schema_version").scalar()
+        last_log_id, updated_at = conn.exec_driver_sql(
+            "SELECT (SELECT MAX(id) FROM operation_logs WHERE dataset_id = ?), "
+            "(SELECT updated_at FROM datasets WHERE id = ?)",
+            (dataset_id, dataset_id)
+        ).first()
+    return schema_version, last_log_id, updated_at
@@ -1,5 +1,5 @@
 import os
-from .db import engine, Base, DATABASE_URL
+from .db import engine, engine_ro, Base, DATABASE_URL
 from sqlalchemy import text
 
 SQLITE_PATH = DATABASE_URL.replace('sqlite:///','') if DATABASE_URL.startswith('sqlite:///') else None
@@ -19,6 +19,7 @@ def full_reset(delete_file: bool = False):
     if SQLITE_PATH and delete_file:
         try:
             engine.dispose()
+            engine_ro.dispose()
         finally:
             for suffix in ['', '-wal', '-shm']:
                 path = SQLITE_PATH + suffix
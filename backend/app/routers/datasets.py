@@ -1,24 +1,32 @@
 import json
 import logging
+import orjson
 import builtins
-from typing import Any, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request, Form
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 import time
 import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import count, groupby
 import pandas as pd
 import numpy as np
 from sklearn.impute import KNNImputer
-from ..db import get_db, engine
+from ..db import get_db, engine, begin_immediate
 from ..reset_db import full_reset, attempt_corruption_recovery, integrity_check
 from .. import models, schemas
 from ..cleaning import read_file_to_df, run_cleaning_pipeline, cleaned_table_name, CleaningConfig
 from ..profiling import profile_columns
 from ..pipeline import save_cleaned_to_sqlite, load_preview_from_sqlite, list_table_columns
 from ..merge import perform_merge_operation, update_dataset_with_merge, get_available_merge_columns, MergeError
-from datetime import datetime
+from .modeling import delete_dataset_model_runs, delete_all_model_runs
+from datetime import datetime, timezone
 from sqlalchemy import insert
 
 logger = logging.getLogger("udc.upload")
@@ -34,7 +42,10 @@ SAFE_EVAL_BUILTIN_NAMES = [
 SAFE_EVAL_BUILTINS = {name: getattr(builtins, name) for name in SAFE_EVAL_BUILTIN_NAMES if hasattr(builtins, name)}
 
 MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50 MB per spec
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # read uploads 1 MB at a time
+UPLOAD_SPOOL_MAX = 32 * 1024 * 1024  # keep up to 32 MB in memory before spilling to disk
 ALLOWED_EXT = {'.csv', '.tsv', '.txt', '.xlsx', '.xls'}
+SQLITE_HAS_DROP_COLUMN = sqlite3.sqlite_version_info >= (3, 35, 0)
 
 
 def _validate_extension(filename: str):
@@ -45,6 +56,58 @@ def _validate_extension(filename: str):
     raise HTTPException(status_code=400, detail="Unsupported file type. Use CSV/TSV/TXT or XLSX")
 
 
+async def _spool_upload(file: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """Copy an upload body into a spooled temp file in chunks, enforcing MAX_UPLOAD_SIZE as we go."""
+    buf = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX)
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > MAX_UPLOAD_SIZE:
+            buf.close()
+            raise HTTPException(status_code=400, detail="File too large")
+        buf.write(chunk)
+    buf.seek(0)
+    return buf
+
+
+def _inline_schema_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """``node`` with every ``$ref`` into ``defs`` replaced by the definition itself."""
+    if isinstance(node, dict):
+        ref = node.get('$ref')
+        if ref is not None:
+            return _inline_schema_refs(defs[ref.rsplit('/', 1)[-1]], defs)
+        return {key: _inline_schema_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_schema_refs(value, defs) for value in node]
+    return node
+
+
+def _raw_json_body(model: type):
+    """Dependency validating the request body as ``model`` straight from its bytes.
+
+    model_validate_json skips the json.loads dict FastAPI would otherwise build and then walk
+    again; use it for bodies that can hold thousands of items. Errors keep FastAPI's 422 shape.
+    Pass ``_raw_json_body_openapi(model)`` as the route's openapi_extra to keep it documented.
+    """
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, 'loc': ('body', *error['loc'])} for error in exc.errors(include_url=False)]
+            )
+    return parse
+
+
+def _raw_json_body_openapi(model: type) -> Dict[str, Any]:
+    schema = model.model_json_schema()
+    schema = _inline_schema_refs(schema, schema.pop('$defs', {}))
+    return {'requestBody': {'required': True, 'content': {'application/json': {'schema': schema}}}}
+
+
 def _normalize_delimiter(raw: Optional[str]) -> Optional[str]:
     if raw is None:
         return None
@@ -69,28 +132,222 @@ def qi(name: str) -> str:
     return '"' + name.replace('"','""') + '"'
 
 
-def _snapshot_table(dataset_id: int, conn, source_table: str) -> Optional[int]:
+# table name -> _table_column_entry tuple; SQLite bumps PRAGMA schema_version on any DDL
+_TABLE_COLUMNS_CACHE: dict = {}
+
+
+# Suffix source for scratch table names; next() on a count is atomic under the GIL, so names
+# stay unique across threads even when two rebuilds start within the same clock tick.
+_TMP_TABLE_COUNTER = count()
+
+
+def _table_column_entry(conn, table: str) -> tuple:
+    """Cached (schema_version, columns, quoted columns, quoted column list, '?' placeholders) for ``table``.
+
+    PRAGMA table_info and the quoting are redone only after a schema change.
+    """
+    version = conn.exec_driver_sql("PRAGMA schema_version").scalar()
+    cached = _TABLE_COLUMNS_CACHE.get(table)
+    if cached is not None and cached[0] == version:
+        return cached
+    cols = tuple(row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall())
+    quoted = tuple(qi(c) for c in cols)
+    entry = (version, cols, quoted, ','.join(quoted), ','.join(['?'] * len(cols)))
+    _TABLE_COLUMNS_CACHE[table] = entry
+    return entry
+
+
+def _table_columns(conn, table: str) -> List[str]:
+    """Column names of ``table``, re-read with PRAGMA table_info only after a schema change."""
+    return list(_table_column_entry(conn, table)[1])
+
+
+# Shared text for every log insert so sqlite3's per-connection statement cache reuses one prepared statement
+INSERT_OPERATION_LOG_SQL = "INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)"
+
+
+def _dump_log_params(params: Any) -> str:
+    """params_json for INSERT_OPERATION_LOG_SQL; orjson since a log row is written on every edit."""
+    return orjson.dumps(params, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Cell-level operations and row appends snapshot only what they changed (see _snapshot_table); every
+# other logged operation keeps a full snap_<dataset_id>_<log_id> table copy.
+DELTA_SNAPSHOT_ACTIONS = {'edit_cell', 'edit_cells', 'impute', 'round', 'timeformat', 'add_row', 'add_rows'}
+
+# (rowid, column, old_value, new_value); column None records an appended row
+CellChange = Tuple[int, Optional[str], Any, Any]
+
+
+def _ensure_snapshot_delta_table(conn) -> None:
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS snap_deltas ("
+        "dataset_id INTEGER NOT NULL, log_id INTEGER NOT NULL, row_id INTEGER NOT NULL, "
+        "col TEXT, old_value, new_value)"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_snap_deltas_log ON snap_deltas (dataset_id, log_id)")
+
+
+def _ensure_snapshot_head_table(conn) -> None:
+    conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS snap_heads (dataset_id INTEGER PRIMARY KEY, log_id INTEGER NOT NULL)")
+
+
+def _snapshot_head(conn, dataset_id: int) -> Optional[int]:
+    """Log id whose snapshot the live cleaned table is known to match, or None."""
+    _ensure_snapshot_head_table(conn)
+    return conn.exec_driver_sql("SELECT log_id FROM snap_heads WHERE dataset_id = ?", (dataset_id,)).scalar()
+
+
+def _clear_snapshot_head(conn, dataset_id: int) -> None:
+    """Call before writing the cleaned table outside the transaction that logs and snapshots the write.
+
+    Until the next snapshot succeeds revert_to_snapshot cannot trust the live table, so it rebuilds
+    from a full snapshot instead of undoing deltas.
+    """
+    _ensure_snapshot_head_table(conn)
+    conn.exec_driver_sql("DELETE FROM snap_heads WHERE dataset_id = ?", (dataset_id,))
+
+
+def _invalidate_snapshot_head(dataset_id: int) -> None:
+    with begin_immediate() as conn:
+        _clear_snapshot_head(conn, dataset_id)
+
+
+def _copy_table(conn, source: str, dest: str) -> None:
+    """CREATE TABLE dest as a copy of source keeping every rowid (a plain CTAS renumbers rows, which
+    would misalign the rowid-keyed snapshot deltas)."""
+    conn.exec_driver_sql(f'CREATE TABLE {dest} AS SELECT * FROM {source} WHERE 0')
+    cols = ','.join(qi(row[1]) for row in conn.exec_driver_sql(f'PRAGMA table_info({dest})').fetchall())
+    conn.exec_driver_sql(f'INSERT INTO {dest} (rowid,{cols}) SELECT rowid,{cols} FROM {source}')
+
+
+def _full_snapshot_log_ids(conn, dataset_id: int) -> set:
+    prefix = f"snap_{dataset_id}_"
+    names = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'snap%'").fetchall()
+    return {int(name[len(prefix):]) for (name,) in names if name.startswith(prefix) and name[len(prefix):].isdigit()}
+
+
+def _insert_snapshot_deltas(conn, dataset_id: int, log_id: int, changes: List[CellChange]) -> None:
+    _ensure_snapshot_delta_table(conn)
+    if changes:
+        conn.exec_driver_sql(
+            "INSERT INTO snap_deltas (dataset_id, log_id, row_id, col, old_value, new_value) VALUES (?, ?, ?, ?, ?, ?)",
+            [(dataset_id, log_id, rid, col, old, new) for rid, col, old, new in changes]
+        )
+
+
+def _snapshot_table(dataset_id: int, conn, source_table: str, changes: Optional[List[CellChange]] = None,
+                    log_id: Optional[int] = None) -> Optional[int]:
     """Create a snapshot of the current cleaned table right AFTER the operation log row is inserted.
 
     Strategy:
-      1. Insert an operation_logs row externally (caller) and retrieve its id (last_insert_rowid()).
-      2. Duplicate cleaned_<id> into snap_<id>_<log_id>.
-    Returns the snapshot log_id used or None on failure.
+      1. Insert an operation_logs row externally (caller) and retrieve its id (passed as ``log_id``,
+         otherwise read back with last_insert_rowid()).
+      2. Without ``changes``: duplicate cleaned_<id> into snap_<id>_<log_id>.
+         With ``changes``: store only the mutated cells (old and new value) in snap_deltas once the
+         dataset has a full snapshot to replay from; revert_to_snapshot rebuilds the state from a
+         full snapshot or the live table plus deltas.
+      3. Record log_id in snap_heads as the state the live table now matches.
+    Returns the snapshot log_id used or None on failure. Callers passing ``changes`` make the edit,
+    its log row and its delta in one transaction, so a failure there is raised to roll the edit back.
     """
+    snap_name = None
     try:
-        # fetch last log id for this connection via SQLite function
-        log_id = conn.exec_driver_sql("SELECT last_insert_rowid()").scalar()
+        if log_id is None:
+            # fetch last log id for this connection via SQLite function
+            log_id = conn.exec_driver_sql("SELECT last_insert_rowid()").scalar()
         if log_id is None:
             return None
-        snap_name = f"snap_{dataset_id}_{log_id}"
-        cleaned = cleaned_table_name(dataset_id)
-        conn.exec_driver_sql(f'CREATE TABLE IF NOT EXISTS {snap_name} AS SELECT * FROM {cleaned}')
+        # deltas need a full snapshot to replay from; the first one for a dataset is taken in full
+        if changes is not None and _full_snapshot_log_ids(conn, dataset_id):
+            _insert_snapshot_deltas(conn, dataset_id, log_id, changes)
+        else:
+            snap_name = f"snap_{dataset_id}_{log_id}"
+            exists = conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (snap_name,)).scalar()
+            if exists:
+                snap_name = None
+            else:
+                _copy_table(conn, cleaned_table_name(dataset_id), snap_name)
+        _ensure_snapshot_head_table(conn)
+        conn.exec_driver_sql("INSERT OR REPLACE INTO snap_heads (dataset_id, log_id) VALUES (?, ?)", (dataset_id, log_id))
         return log_id
     except Exception as e:
+        if changes is not None:
+            raise
         logger.warning("Snapshot creation failed for dataset %s: %s", dataset_id, e)
+        if snap_name:
+            # don't leave a half-copied snapshot behind in the caller's transaction
+            try:
+                conn.exec_driver_sql(f'DROP TABLE IF EXISTS {snap_name}')
+            except Exception:
+                pass
         return None
 
 
+# Rowids bound per "rowid IN (...)" lookup, well under SQLite's host-parameter limit
+ROWID_LOOKUP_CHUNK = 500
+
+
+def _cell_values(conn, table: str, column: str, rowids: List[int]) -> dict:
+    """Map rowid -> stored value for one column, for the given rowids only (missing rows are absent)."""
+    values: dict = {}
+    for start in range(0, len(rowids), ROWID_LOOKUP_CHUNK):
+        chunk = rowids[start:start + ROWID_LOOKUP_CHUNK]
+        values.update(conn.exec_driver_sql(
+            f"SELECT rowid, {qi(column)} FROM {table} WHERE rowid IN ({','.join('?' * len(chunk))})", tuple(chunk)
+        ).fetchall())
+    return values
+
+
+def _restore_full_snapshot(conn, cleaned: str, snap_name: str) -> None:
+    # move the current table aside (metadata-only), copy the snapshot in, then drop the old pages,
+    # all inside the caller's transaction
+    old_cleaned = f"_old_{cleaned}"
+    conn.exec_driver_sql(f'DROP TABLE IF EXISTS {old_cleaned}')
+    conn.exec_driver_sql(f'ALTER TABLE {cleaned} RENAME TO {old_cleaned}')
+    _copy_table(conn, snap_name, cleaned)
+    conn.exec_driver_sql(f'DROP TABLE {old_cleaned}')
+
+
+def _log_table_rewrite(dataset_id: int, action: str, params: dict) -> None:
+    """Log an operation that rewrote the whole cleaned table, with a full snapshot of the result so
+    reverts across it never replay older deltas onto the rewritten rows."""
+    try:
+        with begin_immediate() as conn:
+            conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                                 {"d": dataset_id, "a": action, "p": _dump_log_params(params), "c": datetime.utcnow()})
+            _snapshot_table(dataset_id, conn, cleaned_table_name(dataset_id))
+    except Exception as e:
+        logger.warning("Failed logging/snapshot %s: %s", action, e)
+
+
+def _replay_snapshot_deltas(conn, dataset_id: int, table: str, log_ids: List[int], undo: bool) -> None:
+    """Write recorded cell deltas back into ``table``.
+
+    undo=True restores old values walking the logs newest-first (removing appended rows); otherwise
+    new values are re-applied oldest-first (re-inserting appended rows under their rowid).
+    """
+    if not log_ids:
+        return
+    _ensure_snapshot_delta_table(conn)
+    order = 'DESC' if undo else 'ASC'
+    value_col = 'old_value' if undo else 'new_value'
+    for log_id in sorted(log_ids, reverse=undo):
+        rows = conn.exec_driver_sql(
+            f"SELECT col, {value_col}, row_id FROM snap_deltas WHERE dataset_id = ? AND log_id = ? ORDER BY rowid {order}",
+            (dataset_id, log_id)
+        ).fetchall()
+        for col, group in groupby(rows, key=lambda row: row[0]):
+            if col is None:
+                row_sql = f"DELETE FROM {table} WHERE rowid = ?" if undo else f"INSERT INTO {table} (rowid) VALUES (?)"
+                conn.exec_driver_sql(row_sql, [(rid,) for _, _, rid in group])
+                continue
+            conn.exec_driver_sql(
+                f"UPDATE {table} SET {qi(col)} = ? WHERE rowid = ?",
+                [(value, rid) for _, value, rid in group]
+            )
+
+
 def _series_supports_numeric(series: pd.Series) -> bool:
     if pd.api.types.is_numeric_dtype(series):
         return True
@@ -316,7 +573,13 @@ def _convert_series_type(series: pd.Series, dtype: str, errors: str) -> pd.Serie
     raise HTTPException(status_code=400, detail=f"Unsupported dtype {dtype}")
 
 
+_SERIALIZABLE_SCALARS = (str, int, float, bool, type(None))
+
+
 def _to_serializable(obj: Any) -> Any:
+    # plain JSON scalars are the bulk of op results; one type check returns them as they are
+    if type(obj) in _SERIALIZABLE_SCALARS:
+        return obj
     if isinstance(obj, dict):
         return {k: _to_serializable(v) for k, v in obj.items()}
     if isinstance(obj, list):
@@ -441,14 +704,13 @@ async def upload_dataset(
                 issues_json=json.dumps({}),
             )
             db.add(report)
+            # Log operation in the same commit as the report
+            db.add(models.OperationLog(
+                dataset_id=dataset.id,
+                action_type="upload",
+                params_json=json.dumps({"rows_raw": raw_rows, "cols_raw": raw_cols}),
+            ))
             db.commit()
-            # Log operation
-            try:
-                db.execute(text("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d, :a, :p, :c)"),
-                           {"d": dataset.id, "a": "upload", "p": json.dumps({"rows_raw": raw_rows, "cols_raw": raw_cols}), "c": datetime.utcnow()})
-                db.commit()
-            except Exception as e:
-                logger.warning("Failed logging upload operation: %s", e)
             break
         except Exception as e:
             db.rollback()
@@ -457,11 +719,13 @@ async def upload_dataset(
                 if corruption_stage == 0:
                     logger.error("Corruption detected (stage 0). Dropping tables and retrying upload once.")
                     attempt_corruption_recovery(escalate=False)
+                    _TABLE_COLUMNS_CACHE.clear()
                     corruption_stage = 1
                     continue
                 elif corruption_stage == 1:
                     logger.error("Corruption persisted (stage 1). Performing full file reset (WAL/SHM removed) and retrying last time.")
                     attempt_corruption_recovery(escalate=True)
+                    _TABLE_COLUMNS_CACHE.clear()
                     corruption_stage = 2
                     continue
                 else:
@@ -523,7 +787,10 @@ def list_datasets(limit: int = 50, offset: int = 0, db: Session = Depends(get_db
 
 
 @router.get('/dataset/{dataset_id}/preview', response_model=schemas.PreviewResponse)
-def dataset_preview(dataset_id: int, db: Session = Depends(get_db), limit: int = 10, offset: int = 0):
+def dataset_preview(dataset_id: int, db: Session = Depends(get_db), limit: int = 10, offset: int = 0,
+                    columnar: bool = False):
+    """Page of the cleaned table. columnar=true returns the rows as value lists (rows_columnar)
+    rather than one dict per row, which is much smaller for wide previews."""
     dataset = db.query(models.Dataset).filter(models.Dataset.id == dataset_id).first()
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
@@ -538,13 +805,18 @@ def dataset_preview(dataset_id: int, db: Session = Depends(get_db), limit: int =
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to read cleaned table")
     cols = df.columns.tolist()
-    return schemas.PreviewResponse(preview=schemas.PreviewBlock(columns=cols, rows=df.to_dict(orient='records'), total_rows=total, offset=offset, limit=limit))
+    if columnar:
+        block = schemas.PreviewBlock(columns=cols, rows_columnar=df.to_dict(orient='split')['data'], total_rows=total, offset=offset, limit=limit)
+    else:
+        block = schemas.PreviewBlock(columns=cols, rows=df.to_dict(orient='records'), total_rows=total, offset=offset, limit=limit)
+    return schemas.PreviewResponse(preview=block)
 
 
-@router.post('/dataset/{dataset_id}/cells', response_model=schemas.CellEditResponse)
+@router.post('/dataset/{dataset_id}/cells', response_model=schemas.CellEditResponse,
+             openapi_extra=_raw_json_body_openapi(schemas.CellEditBatch))
 def update_dataset_cells(
     dataset_id: int,
-    edits: schemas.CellEditBatch,
+    edits: schemas.CellEditBatch = Depends(_raw_json_body(schemas.CellEditBatch)),
     db: Session = Depends(get_db)
 ):
     dataset = db.query(models.Dataset).filter(models.Dataset.id == dataset_id).first()
@@ -555,17 +827,20 @@ def update_dataset_cells(
         return schemas.CellEditResponse(updated=0)
 
     table = cleaned_table_name(dataset_id)
-    available_columns = set(list_table_columns(table, engine) or [])
+    available_columns = set(list_table_columns(dataset_id, engine) or [])
     invalid_columns = [edit.column for edit in edits.edits if edit.column not in available_columns]
     if invalid_columns:
         raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(sorted(set(invalid_columns)))}")
 
     try:
-        with engine.begin() as conn:
-            for edit in edits.edits:
+        with begin_immediate() as conn:
+            # these edits are not logged, so the live table no longer matches the latest snapshot
+            _clear_snapshot_head(conn, dataset_id)
+            # One executemany per run of consecutive edits to the same column, in request order
+            for column, group in groupby(edits.edits, key=lambda edit: edit.column):
                 conn.exec_driver_sql(
-                    f'UPDATE {qi(table)} SET {qi(edit.column)} = :value WHERE rowid = :rowid',
-                    {"value": edit.value, "rowid": edit.rowid}
+                    f'UPDATE {qi(table)} SET {qi(column)} = ? WHERE rowid = ?',
+                    [(edit.value, edit.rowid) for edit in group]
                 )
     except Exception as exc:
         logger.error("Failed to update cells for dataset %s: %s", dataset_id, exc)
@@ -578,6 +853,326 @@ def update_dataset_cells(
     return schemas.CellEditResponse(updated=len(edits.edits))
 
 
+def _manipulate_drop_columns(df: pd.DataFrame, op: schemas.DropColumnsOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    missing = [col for col in op.columns if col not in df.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown columns for drop: {', '.join(missing)}")
+    df = df.drop(columns=op.columns)
+    return df, {
+        'columns_dropped': op.columns,
+        'remaining_columns': df.columns.tolist()
+    }
+
+
+def _manipulate_filter_rows(df: pd.DataFrame, op: schemas.FilterRowsOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    before = len(df)
+    mask = _build_filter_mask(df, op)
+    df = df[mask].copy()
+    after = len(df)
+    return df, {
+        'conditions': [cond.model_dump() for cond in op.conditions],
+        'logic': op.logic,
+        'rows_before': before,
+        'rows_after': after,
+        'rows_removed': before - after
+    }
+
+
+def _manipulate_sort_values(df: pd.DataFrame, op: schemas.SortValuesOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    if not op.keys:
+        raise HTTPException(status_code=400, detail="Sort requires at least one key")
+    missing = [key.column for key in op.keys if key.column not in df.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown columns for sort: {', '.join(missing)}")
+    by = [key.column for key in op.keys]
+    ascending = [key.ascending for key in op.keys]
+    df = df.sort_values(by=by, ascending=ascending, na_position=op.na_position).reset_index(drop=True)
+    return df, {
+        'keys': [key.model_dump() for key in op.keys],
+        'na_position': op.na_position
+    }
+
+
+def _manipulate_drop_duplicates(df: pd.DataFrame, op: schemas.DropDuplicatesOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    subset = op.subset or None
+    if subset:
+        missing = [col for col in subset if col not in df.columns]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Unknown columns for drop_duplicates: {', '.join(missing)}")
+    before = len(df)
+    keep_param: Union[str, bool] = False if op.keep == 'none' else op.keep
+    df = df.drop_duplicates(subset=subset, keep=keep_param).reset_index(drop=True)
+    after = len(df)
+    return df, {
+        'subset': subset,
+        'keep': op.keep,
+        'rows_removed': before - after
+    }
+
+
+def _manipulate_fill_missing(df: pd.DataFrame, op: schemas.FillMissingOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    column = op.column
+    if column not in df.columns:
+        raise HTTPException(status_code=400, detail=f"Column {column} not found for fill_missing")
+    series = df[column]
+    before_na = int(series.isna().sum())
+    if op.strategy in {'mean', 'median'}:
+        if not _series_supports_numeric(series):
+            raise HTTPException(status_code=400, detail=f"Column {column} is not numeric")
+        computed = getattr(series, op.strategy)()
+        if pd.isna(computed):
+            raise HTTPException(status_code=400, detail=f"Unable to compute {op.strategy} for column {column}")
+        df[column] = series.fillna(computed)
+        fill_value = computed
+    elif op.strategy == 'mode':
+        mode_vals = series.mode(dropna=True)
+        if mode_vals.empty:
+            raise HTTPException(status_code=400, detail=f"Unable to determine mode for column {column}")
+        fill_value = mode_vals.iloc(0) if callable(getattr(mode_vals, '__call__', None)) else mode_vals.iloc[0]
+        df[column] = series.fillna(fill_value)
+    elif op.strategy == 'constant':
+        if op.value is None:
+            raise HTTPException(status_code=400, detail="Constant value is required for fill_missing")
+        fill_value = _coerce_scalar(series, op.value)
+        df[column] = series.fillna(fill_value)
+    elif op.strategy == 'forward_fill':
+        df[column] = series.ffill()
+        fill_value = 'forward_fill'
+    elif op.strategy == 'backward_fill':
+        df[column] = series.bfill()
+        fill_value = 'backward_fill'
+    else:
+        raise HTTPException(status_code=400, detail=f"Unsupported fill strategy {op.strategy}")
+    after_na = int(df[column].isna().sum())
+    return df, {
+        'column': column,
+        'strategy': op.strategy,
+        'value': _to_serializable(fill_value),
+        'filled': before_na - after_na
+    }
+
+
+def _manipulate_knn_impute(df: pd.DataFrame, op: schemas.KNNImputeOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    if not op.columns:
+        raise HTTPException(status_code=400, detail="KNN imputation requires at least one column")
+    missing = [col for col in op.columns if col not in df.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found for KNN imputation: {', '.join(missing)}")
+    for col in op.columns:
+        if not _series_supports_numeric(df[col]):
+            raise HTTPException(status_code=400, detail=f"Column {col} is not numeric enough for KNN imputation")
+    subset = pd.DataFrame({col: pd.to_numeric(df[col], errors='coerce') for col in op.columns}, index=df.index)
+    if subset.isna().all(axis=None):
+        raise HTTPException(status_code=400, detail="Selected columns could not be coerced to numeric for KNN imputation")
+    imputer = KNNImputer(n_neighbors=op.n_neighbors, weights=op.weights)
+    before_na = {col: int(df[col].isna().sum()) for col in op.columns}
+    try:
+        imputed_values = imputer.fit_transform(subset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"KNN imputation failed: {exc}")
+    imputed_df = pd.DataFrame(imputed_values, columns=subset.columns, index=subset.index)
+    df[op.columns] = imputed_df
+    after_na = {col: int(df[col].isna().sum()) for col in op.columns}
+    return df, {
+        'columns': op.columns,
+        'n_neighbors': op.n_neighbors,
+        'weights': op.weights,
+        'filled_by_column': {col: before_na[col] - after_na[col] for col in op.columns}
+    }
+
+
+def _manipulate_rename_columns(df: pd.DataFrame, op: schemas.RenameColumnsOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    if not op.mapping:
+        raise HTTPException(status_code=400, detail="Rename operation requires at least one mapping")
+    missing = [old for old in op.mapping.keys() if old not in df.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found for rename: {', '.join(missing)}")
+    new_names = list(op.mapping.values())
+    collision = set(new_names) - set(op.mapping.keys())
+    existing = set(df.columns) - set(op.mapping.keys())
+    if collision & existing:
+        raise HTTPException(status_code=400, detail=f"Rename would create duplicate columns: {', '.join(sorted(collision & existing))}")
+    df = df.rename(columns=op.mapping)
+    return df, {
+        'mapping': op.mapping,
+        'columns': df.columns.tolist()
+    }
+
+
+def _manipulate_convert_type(df: pd.DataFrame, op: schemas.ConvertTypeOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    column = op.column
+    if column not in df.columns:
+        raise HTTPException(status_code=400, detail=f"Column {column} not found for convert_type")
+    converted = _convert_series_type(df[column], op.dtype, op.errors)
+    df[column] = converted
+    return df, {
+        'column': column,
+        'dtype': op.dtype,
+        'errors': op.errors
+    }
+
+
+def _manipulate_normalize_columns(df: pd.DataFrame, op: schemas.NormalizeColumnsOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    if not op.columns:
+        raise HTTPException(status_code=400, detail="Normalization requires at least one column")
+    missing = [col for col in op.columns if col not in df.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found for normalization: {', '.join(missing)}")
+    column_details: List[dict] = []
+    normalized_frames: dict[str, pd.Series] = {}
+    for col in op.columns:
+        series = pd.to_numeric(df[col], errors='coerce')
+        if series.isna().all():
+            raise HTTPException(status_code=400, detail=f"Column {col} cannot be normalized (non-numeric values)")
+        if op.method == 'minmax':
+            min_val = series.min()
+            max_val = series.max()
+            denom = max_val - min_val
+            norm_series = pd.Series(0.0, index=series.index) if denom == 0 else (series - min_val) / denom
+            column_details.append({'column': col, 'method': 'minmax', 'min': float(min_val), 'max': float(max_val)})
+        else:
+            mean_val = series.mean()
+            std_val = series.std(ddof=0)
+            norm_series = pd.Series(0.0, index=series.index) if std_val == 0 else (series - mean_val) / std_val
+            column_details.append({'column': col, 'method': 'zscore', 'mean': float(mean_val), 'std': float(std_val)})
+        normalized_frames[col] = norm_series
+    for col, norm_series in normalized_frames.items():
+        df[col] = norm_series
+    return df, {
+        'method': op.method,
+        'columns': column_details
+    }
+
+
+def _manipulate_groupby(df: pd.DataFrame, op: schemas.GroupByOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    if not op.group_by:
+        raise HTTPException(status_code=400, detail="GroupBy operation requires grouping columns")
+    for col in op.group_by:
+        if col not in df.columns:
+            raise HTTPException(status_code=400, detail=f"Group-by column {col} not found")
+    if not op.aggregations:
+        raise HTTPException(status_code=400, detail="GroupBy operation requires at least one aggregation")
+    named_aggs: dict[str, tuple[str, str]] = {}
+    for agg in op.aggregations:
+        if agg.column not in df.columns:
+            raise HTTPException(status_code=400, detail=f"Aggregation column {agg.column} not found")
+        alias = agg.alias or f"{agg.column}_{agg.func}"
+        if alias in named_aggs:
+            raise HTTPException(status_code=400, detail=f"Duplicate aggregation alias {alias}")
+        named_aggs[alias] = (agg.column, agg.func)
+    try:
+        grouped = df.groupby(op.group_by, dropna=False).agg(**named_aggs).reset_index()
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"GroupBy failed: {exc}")
+    before_rows = len(df)
+    df = grouped
+    return df, {
+        'group_by': op.group_by,
+        'aggregations': [
+            {
+                'column': agg.column,
+                'func': agg.func,
+                'alias': agg.alias or f"{agg.column}_{agg.func}"
+            }
+            for agg in op.aggregations
+        ],
+        'rows_before': before_rows,
+        'rows_after': len(df)
+    }
+
+
+def _manipulate_pandas_code(df: pd.DataFrame, op: schemas.PandasCodeOperation) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    code_text = op.code or ''
+    if not code_text.strip():
+        raise HTTPException(status_code=400, detail="Pandas code block cannot be empty")
+
+    rows_before, cols_before = df.shape
+    previous_columns = list(df.columns)
+    df_snapshot = df.copy()
+    exec_globals = {
+        '__builtins__': SAFE_EVAL_BUILTINS,
+        'pd': pd,
+        'np': np
+    }
+    local_env: dict[str, Any] = {
+        'df': df_snapshot,
+        'result': None
+    }
+
+    try:
+        exec(code_text, exec_globals, local_env)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Pandas code execution failed: {exc}")
+
+    new_df = local_env.get('df')
+    if new_df is None:
+        raise HTTPException(status_code=400, detail="Pandas code must leave a DataFrame in the variable 'df'")
+    if not isinstance(new_df, pd.DataFrame):
+        raise HTTPException(status_code=400, detail="Variable 'df' must be a pandas DataFrame after execution")
+
+    df = new_df
+
+    op_result = local_env.get('result')
+    result_payload: Optional[dict[str, Any]] | Any = None
+    if isinstance(op_result, pd.DataFrame):
+        result_payload = {
+            'type': 'dataframe',
+            'shape': [int(op_result.shape[0]), int(op_result.shape[1])],
+            'preview': op_result.head(5).to_dict(orient='records')
+        }
+    elif isinstance(op_result, pd.Series):
+        result_payload = {
+            'type': 'series',
+            'length': int(op_result.shape[0]),
+            'preview': op_result.head(10).tolist()
+        }
+    elif op_result is not None:
+        result_payload = _to_serializable(op_result)
+
+    added_columns = sorted(set(df.columns) - set(previous_columns))
+    removed_columns = sorted(set(previous_columns) - set(df.columns))
+
+    code_lines = [line.rstrip()[:160] for line in code_text.strip().splitlines()]
+    if len(code_lines) > 4:
+        code_preview = code_lines[:4] + ['...']
+    else:
+        code_preview = code_lines
+
+    details: dict[str, Any] = {
+        'code_preview': code_preview,
+        'rows_before': rows_before,
+        'rows_after': len(df),
+        'cols_before': cols_before,
+        'cols_after': len(df.columns)
+    }
+    if added_columns:
+        details['columns_added'] = added_columns
+    if removed_columns:
+        details['columns_removed'] = removed_columns
+    if op.description:
+        details['description'] = op.description
+    if result_payload is not None:
+        details['result'] = result_payload
+
+    return df, details
+
+
+# operation type -> handler; each takes (frame, operation) and returns the new frame and its summary details
+MANIPULATION_HANDLERS: Dict[str, Callable[[pd.DataFrame, Any], Tuple[pd.DataFrame, Dict[str, Any]]]] = {
+    'drop_columns': _manipulate_drop_columns,
+    'filter_rows': _manipulate_filter_rows,
+    'sort_values': _manipulate_sort_values,
+    'drop_duplicates': _manipulate_drop_duplicates,
+    'fill_missing': _manipulate_fill_missing,
+    'knn_impute': _manipulate_knn_impute,
+    'rename_columns': _manipulate_rename_columns,
+    'convert_type': _manipulate_convert_type,
+    'normalize_columns': _manipulate_normalize_columns,
+    'groupby': _manipulate_groupby,
+    'pandas_code': _manipulate_pandas_code,
+}
+
+
 @router.post('/dataset/{dataset_id}/manipulate', response_model=schemas.ManipulationResponse)
 def manipulate_dataset(
     dataset_id: int,
@@ -601,327 +1196,16 @@ def manipulate_dataset(
     summaries: List[dict] = []
 
     for op in request.operations:
-        if op.type == 'drop_columns':
-            missing = [col for col in op.columns if col not in df.columns]
-            if missing:
-                raise HTTPException(status_code=400, detail=f"Unknown columns for drop: {', '.join(missing)}")
-            df = df.drop(columns=op.columns)
-            summaries.append({
-                'operation': 'drop_columns',
-                'details': {
-                    'columns_dropped': op.columns,
-                    'remaining_columns': df.columns.tolist()
-                }
-            })
-        elif op.type == 'filter_rows':
-            before = len(df)
-            mask = _build_filter_mask(df, op)
-            df = df[mask].copy()
-            after = len(df)
-            summaries.append({
-                'operation': 'filter_rows',
-                'details': {
-                    'conditions': [cond.dict() for cond in op.conditions],
-                    'logic': op.logic,
-                    'rows_before': before,
-                    'rows_after': after,
-                    'rows_removed': before - after
-                }
-            })
-        elif op.type == 'sort_values':
-            if not op.keys:
-                raise HTTPException(status_code=400, detail="Sort requires at least one key")
-            missing = [key.column for key in op.keys if key.column not in df.columns]
-            if missing:
-                raise HTTPException(status_code=400, detail=f"Unknown columns for sort: {', '.join(missing)}")
-            by = [key.column for key in op.keys]
-            ascending = [key.ascending for key in op.keys]
-            df = df.sort_values(by=by, ascending=ascending, na_position=op.na_position).reset_index(drop=True)
-            summaries.append({
-                'operation': 'sort_values',
-                'details': {
-                    'keys': [key.dict() for key in op.keys],
-                    'na_position': op.na_position
-                }
-            })
-        elif op.type == 'drop_duplicates':
-            subset = op.subset or None
-            if subset:
-                missing = [col for col in subset if col not in df.columns]
-                if missing:
-                    raise HTTPException(status_code=400, detail=f"Unknown columns for drop_duplicates: {', '.join(missing)}")
-            before = len(df)
-            keep_param: Union[str, bool] = False if op.keep == 'none' else op.keep
-            df = df.drop_duplicates(subset=subset, keep=keep_param).reset_index(drop=True)
-            after = len(df)
-            summaries.append({
-                'operation': 'drop_duplicates',
-                'details': {
-                    'subset': subset,
-                    'keep': op.keep,
-                    'rows_removed': before - after
-                }
-            })
-        elif op.type == 'fill_missing':
-            column = op.column
-            if column not in df.columns:
-                raise HTTPException(status_code=400, detail=f"Column {column} not found for fill_missing")
-            series = df[column]
-            before_na = int(series.isna().sum())
-            if op.strategy in {'mean', 'median'}:
-                if not _series_supports_numeric(series):
-                    raise HTTPException(status_code=400, detail=f"Column {column} is not numeric")
-                computed = getattr(series, op.strategy)()
-                if pd.isna(computed):
-                    raise HTTPException(status_code=400, detail=f"Unable to compute {op.strategy} for column {column}")
-                df[column] = series.fillna(computed)
-                fill_value = computed
-            elif op.strategy == 'mode':
-                mode_vals = series.mode(dropna=True)
-                if mode_vals.empty:
-                    raise HTTPException(status_code=400, detail=f"Unable to determine mode for column {column}")
-                fill_value = mode_vals.iloc(0) if callable(getattr(mode_vals, '__call__', None)) else mode_vals.iloc[0]
-                df[column] = series.fillna(fill_value)
-            elif op.strategy == 'constant':
-                if op.value is None:
-                    raise HTTPException(status_code=400, detail="Constant value is required for fill_missing")
-                fill_value = _coerce_scalar(series, op.value)
-                df[column] = series.fillna(fill_value)
-            elif op.strategy == 'forward_fill':
-                df[column] = series.ffill()
-                fill_value = 'forward_fill'
-            elif op.strategy == 'backward_fill':
-                df[column] = series.bfill()
-                fill_value = 'backward_fill'
-            else:
-                raise HTTPException(status_code=400, detail=f"Unsupported fill strategy {op.strategy}")
-            after_na = int(df[column].isna().sum())
-            summaries.append({
-                'operation': 'fill_missing',
-                'details': {
-                    'column': column,
-                    'strategy': op.strategy,
-                    'value': _to_serializable(fill_value),
-                    'filled': before_na - after_na
-                }
-            })
-        elif op.type == 'knn_impute':
-            if not op.columns:
-                raise HTTPException(status_code=400, detail="KNN imputation requires at least one column")
-            missing = [col for col in op.columns if col not in df.columns]
-            if missing:
-                raise HTTPException(status_code=400, detail=f"Columns not found for KNN imputation: {', '.join(missing)}")
-            for col in op.columns:
-                if not _series_supports_numeric(df[col]):
-                    raise HTTPException(status_code=400, detail=f"Column {col} is not numeric enough for KNN imputation")
-            subset = pd.DataFrame({col: pd.to_numeric(df[col], errors='coerce') for col in op.columns}, index=df.index)
-            if subset.isna().all(axis=None):
-                raise HTTPException(status_code=400, detail="Selected columns could not be coerced to numeric for KNN imputation")
-            imputer = KNNImputer(n_neighbors=op.n_neighbors, weights=op.weights)
-            before_na = {col: int(df[col].isna().sum()) for col in op.columns}
-            try:
-                imputed_values = imputer.fit_transform(subset)
-            except ValueError as exc:
-                raise HTTPException(status_code=400, detail=f"KNN imputation failed: {exc}")
-            imputed_df = pd.DataFrame(imputed_values, columns=subset.columns, index=subset.index)
-            df[op.columns] = imputed_df
-            after_na = {col: int(df[col].isna().sum()) for col in op.columns}
-            summaries.append({
-                'operation': 'knn_impute',
-                'details': {
-                    'columns': op.columns,
-                    'n_neighbors': op.n_neighbors,
-                    'weights': op.weights,
-                    'filled_by_column': {col: before_na[col] - after_na[col] for col in op.columns}
-                }
-            })
-        elif op.type == 'rename_columns':
-            if not op.mapping:
-                raise HTTPException(status_code=400, detail="Rename operation requires at least one mapping")
-            missing = [old for old in op.mapping.keys() if old not in df.columns]
-            if missing:
-                raise HTTPException(status_code=400, detail=f"Columns not found for rename: {', '.join(missing)}")
-            new_names = list(op.mapping.values())
-            collision = set(new_names) - set(op.mapping.keys())
-            existing = set(df.columns) - set(op.mapping.keys())
-            if collision & existing:
-                raise HTTPException(status_code=400, detail=f"Rename would create duplicate columns: {', '.join(sorted(collision & existing))}")
-            df = df.rename(columns=op.mapping)
-            summaries.append({
-                'operation': 'rename_columns',
-                'details': {
-                    'mapping': op.mapping,
-                    'columns': df.columns.tolist()
-                }
-            })
-        elif op.type == 'convert_type':
-            column = op.column
-            if column not in df.columns:
-                raise HTTPException(status_code=400, detail=f"Column {column} not found for convert_type")
-            converted = _convert_series_type(df[column], op.dtype, op.errors)
-            df[column] = converted
-            summaries.append({
-                'operation': 'convert_type',
-                'details': {
-                    'column': column,
-                    'dtype': op.dtype,
-                    'errors': op.errors
-                }
-            })
-        elif op.type == 'normalize_columns':
-            if not op.columns:
-                raise HTTPException(status_code=400, detail="Normalization requires at least one column")
-            missing = [col for col in op.columns if col not in df.columns]
-            if missing:
-                raise HTTPException(status_code=400, detail=f"Columns not found for normalization: {', '.join(missing)}")
-            column_details: List[dict] = []
-            normalized_frames: dict[str, pd.Series] = {}
-            for col in op.columns:
-                series = pd.to_numeric(df[col], errors='coerce')
-                if series.isna().all():
-                    raise HTTPException(status_code=400, detail=f"Column {col} cannot be normalized (non-numeric values)")
-                if op.method == 'minmax':
-                    min_val = series.min()
-                    max_val = series.max()
-                    denom = max_val - min_val
-                    norm_series = pd.Series(0.0, index=series.index) if denom == 0 else (series - min_val) / denom
-                    column_details.append({'column': col, 'method': 'minmax', 'min': float(min_val), 'max': float(max_val)})
-                else:
-                    mean_val = series.mean()
-                    std_val = series.std(ddof=0)
-                    norm_series = pd.Series(0.0, index=series.index) if std_val == 0 else (series - mean_val) / std_val
-                    column_details.append({'column': col, 'method': 'zscore', 'mean': float(mean_val), 'std': float(std_val)})
-                normalized_frames[col] = norm_series
-            for col, norm_series in normalized_frames.items():
-                df[col] = norm_series
-            summaries.append({
-                'operation': 'normalize_columns',
-                'details': {
-                    'method': op.method,
-                    'columns': column_details
-                }
-            })
-        elif op.type == 'groupby':
-            if not op.group_by:
-                raise HTTPException(status_code=400, detail="GroupBy operation requires grouping columns")
-            for col in op.group_by:
-                if col not in df.columns:
-                    raise HTTPException(status_code=400, detail=f"Group-by column {col} not found")
-            if not op.aggregations:
-                raise HTTPException(status_code=400, detail="GroupBy operation requires at least one aggregation")
-            named_aggs: dict[str, tuple[str, str]] = {}
-            for agg in op.aggregations:
-                if agg.column not in df.columns:
-                    raise HTTPException(status_code=400, detail=f"Aggregation column {agg.column} not found")
-                alias = agg.alias or f"{agg.column}_{agg.func}"
-                if alias in named_aggs:
-                    raise HTTPException(status_code=400, detail=f"Duplicate aggregation alias {alias}")
-                named_aggs[alias] = (agg.column, agg.func)
-            try:
-                grouped = df.groupby(op.group_by, dropna=False).agg(**named_aggs).reset_index()
-            except Exception as exc:
-                raise HTTPException(status_code=400, detail=f"GroupBy failed: {exc}")
-            before_rows = len(df)
-            df = grouped
-            summaries.append({
-                'operation': 'groupby',
-                'details': {
-                    'group_by': op.group_by,
-                    'aggregations': [
-                        {
-                            'column': agg.column,
-                            'func': agg.func,
-                            'alias': agg.alias or f"{agg.column}_{agg.func}"
-                        }
-                        for agg in op.aggregations
-                    ],
-                    'rows_before': before_rows,
-                    'rows_after': len(df)
-                }
-            })
-        elif op.type == 'pandas_code':
-            code_text = op.code or ''
-            if not code_text.strip():
-                raise HTTPException(status_code=400, detail="Pandas code block cannot be empty")
-
-            rows_before, cols_before = df.shape
-            previous_columns = list(df.columns)
-            df_snapshot = df.copy()
-            exec_globals = {
-                '__builtins__': SAFE_EVAL_BUILTINS,
-                'pd': pd,
-                'np': np
-            }
-            local_env: dict[str, Any] = {
-                'df': df_snapshot,
-                'result': None
-            }
-
-            try:
-                exec(code_text, exec_globals, local_env)
-            except Exception as exc:
-                raise HTTPException(status_code=400, detail=f"Pandas code execution failed: {exc}")
-
-            new_df = local_env.get('df')
-            if new_df is None:
-                raise HTTPException(status_code=400, detail="Pandas code must leave a DataFrame in the variable 'df'")
-            if not isinstance(new_df, pd.DataFrame):
-                raise HTTPException(status_code=400, detail="Variable 'df' must be a pandas DataFrame after execution")
-
-            df = new_df
-
-            op_result = local_env.get('result')
-            result_payload: Optional[dict[str, Any]] | Any = None
-            if isinstance(op_result, pd.DataFrame):
-                result_payload = {
-                    'type': 'dataframe',
-                    'shape': [int(op_result.shape[0]), int(op_result.shape[1])],
-                    'preview': op_result.head(5).to_dict(orient='records')
-                }
-            elif isinstance(op_result, pd.Series):
-                result_payload = {
-                    'type': 'series',
-                    'length': int(op_result.shape[0]),
-                    'preview': op_result.head(10).tolist()
-                }
-            elif op_result is not None:
-                result_payload = _to_serializable(op_result)
-
-            added_columns = sorted(set(df.columns) - set(previous_columns))
-            removed_columns = sorted(set(previous_columns) - set(df.columns))
-
-            code_lines = [line.rstrip()[:160] for line in code_text.strip().splitlines()]
-            if len(code_lines) > 4:
-                code_preview = code_lines[:4] + ['...']
-            else:
-                code_preview = code_lines
-
-            details: dict[str, Any] = {
-                'code_preview': code_preview,
-                'rows_before': rows_before,
-                'rows_after': len(df),
-                'cols_before': cols_before,
-                'cols_after': len(df.columns)
-            }
-            if added_columns:
-                details['columns_added'] = added_columns
-            if removed_columns:
-                details['columns_removed'] = removed_columns
-            if op.description:
-                details['description'] = op.description
-            if result_payload is not None:
-                details['result'] = result_payload
-
-            summaries.append({
-                'operation': 'pandas_code',
-                'details': details
-            })
-        else:
+        handler = MANIPULATION_HANDLERS.get(op.type)
+        if handler is None:
             raise HTTPException(status_code=400, detail=f"Unsupported operation type {op.type}")
+        df, details = handler(df, op)
+        summaries.append({'operation': op.type, 'details': details})
 
     df = df.reset_index(drop=True)
 
     try:
+        _invalidate_snapshot_head(dataset_id)
         save_cleaned_to_sqlite(df, dataset_id, engine, if_exists='replace')
     except Exception as exc:
         logger.error("Failed to persist manipulated dataset %s: %s", dataset_id, exc)
@@ -961,7 +1245,7 @@ def manipulate_dataset(
     }
 
     try:
-        with engine.begin() as conn:
+        with begin_immediate() as conn:
             conn.execute(
                 insert(models.OperationLog),
                 {
@@ -1067,7 +1351,7 @@ def delete_dataset(dataset_id: int, db: Session = Depends(get_db)):
         
         # Drop associated SQLite tables outside of the main transaction to avoid locks
         try:
-            with engine.begin() as conn:
+            with begin_immediate() as conn:
                 for name in filter(None, tables_to_drop):
                     try:
                         conn.exec_driver_sql(f"DROP TABLE IF EXISTS {qi(name)}")
@@ -1084,8 +1368,12 @@ def delete_dataset(dataset_id: int, db: Session = Depends(get_db)):
                         conn.exec_driver_sql(f"DROP TABLE IF EXISTS {qi(snap_name)}")
                     except Exception as drop_exc:
                         logger.warning("Failed to drop snapshot table %s for dataset %s: %s", snap_name, dataset_id, drop_exc)
+                _ensure_snapshot_delta_table(conn)
+                conn.exec_driver_sql("DELETE FROM snap_deltas WHERE dataset_id = :d", {"d": dataset_id})
+                _clear_snapshot_head(conn, dataset_id)
         except Exception as e:
             logger.warning("Failed to drop auxiliary tables for dataset %s: %s", dataset_id, e)
+        delete_dataset_model_runs(dataset_id)
     
     except Exception as e:
         db.rollback()
@@ -1109,7 +1397,7 @@ def download_cleaned(dataset_id: int, db: Session = Depends(get_db)):
     # Stream using SQL chunking to avoid loading entire table for very large datasets
     def row_iter():
         # First yield header
-        cols = list_table_columns(table, engine)
+        cols = list_table_columns(dataset_id, engine)
         if not cols:
             return
         yield ','.join(cols) + '\n'
@@ -1146,6 +1434,7 @@ def reclean_dataset(dataset_id: int, config: Optional[schemas.CleaningConfig] =
         "handle_missing_values"
     ]
     try:
+        _invalidate_snapshot_head(dataset_id)
         max_attempts = 5
         for attempt in range(1, max_attempts + 1):
             try:
@@ -1172,6 +1461,7 @@ def reclean_dataset(dataset_id: int, config: Optional[schemas.CleaningConfig] =
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Re-clean failed: {e}")
+    _log_table_rewrite(dataset_id, "reclean", cfg.model_dump())
     # Return normalized report
     return schemas.MetadataResponse(report=_build_report_block(metadata))
 
@@ -1209,6 +1499,7 @@ def reprocess_from_raw(dataset_id: int, config: Optional[schemas.CleaningConfig]
         "handle_missing_values"
     ]
     try:
+        _invalidate_snapshot_head(dataset_id)
         save_cleaned_to_sqlite(df_new, dataset.id, engine, if_exists='replace')
         dataset.n_rows_clean = new_rows
         dataset.n_cols_clean = new_cols
@@ -1220,22 +1511,18 @@ def reprocess_from_raw(dataset_id: int, config: Optional[schemas.CleaningConfig]
             report = models.CleaningReport(dataset_id=dataset_id, summary_json=json.dumps(metadata), issues_json=json.dumps({}))
             db.add(report)
         db.commit()
-        try:
-            log_params = cfg.model_dump()
-            if fallback_used:
-                log_params["fallback_used"] = True
-            db.execute(text("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)"),
-                       {"d": dataset_id, "a": "reprocess", "p": json.dumps(log_params), "c": datetime.utcnow()})
-            db.commit()
-        except Exception as e:
-            logger.warning("Failed logging reprocess: %s", e)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Reprocess failed: {e}")
+    log_params = cfg.model_dump()
+    if fallback_used:
+        log_params["fallback_used"] = True
+    _log_table_rewrite(dataset_id, "reprocess", log_params)
     return schemas.MetadataResponse(report=_build_report_block(metadata))
 
-@router.patch('/dataset/{dataset_id}/cells')
-def edit_cells(dataset_id: int, batch: schemas.CellEditBatch, db: Session = Depends(get_db)):
+@router.patch('/dataset/{dataset_id}/cells', openapi_extra=_raw_json_body_openapi(schemas.CellEditBatch))
+def edit_cells(dataset_id: int, batch: schemas.CellEditBatch = Depends(_raw_json_body(schemas.CellEditBatch)),
+               db: Session = Depends(get_db)):
     dataset = db.query(models.Dataset).filter(models.Dataset.id == dataset_id).first()
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
@@ -1243,29 +1530,30 @@ def edit_cells(dataset_id: int, batch: schemas.CellEditBatch, db: Session = Depe
     # Basic validation: ensure columns exist
     if not batch.edits:
         return {"updated": 0}
-    with engine.begin() as conn:
-        existing_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+    with begin_immediate() as conn:
+        existing_cols = _table_columns(conn, table)
         for e in batch.edits:
             if e.column not in existing_cols:
                 raise HTTPException(status_code=400, detail=f"Column {e.column} does not exist")
-        # Apply edits one by one (can optimize later)
-        updated = 0
-        for e in batch.edits:
-            # Use parameter binding
-            col_q = qi(e.column)
+        # One lookup of the old values and one executemany per run of consecutive edits to the same
+        # column, in request order
+        changes: List[CellChange] = []
+        for column, group in groupby(batch.edits, key=lambda edit: edit.column):
+            group = list(group)
+            current = _cell_values(conn, table, column, list({e.rowid: None for e in group}))
+            for e in group:
+                # a rowid edited twice in the run records the first edit's value as the second's old one
+                changes.append((e.rowid, column, current.get(e.rowid), e.value))
+                current[e.rowid] = e.value
             conn.exec_driver_sql(
-                f"UPDATE {table} SET {col_q} = :val WHERE rowid = :rid",
-                {"val": e.value, "rid": e.rowid}
+                f"UPDATE {table} SET {qi(column)} = ? WHERE rowid = ?",
+                [(e.value, e.rowid) for e in group]
             )
-            updated += 1
-    # Log
-    try:
-        with engine.begin() as conn:
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "edit_cells", "p": json.dumps({"count": updated}), "c": datetime.utcnow()})
-            _snapshot_table(dataset_id, conn, table)
-    except Exception as e:
-        logger.warning("Failed logging/snapshot edit_cells: %s", e)
+        updated = len(batch.edits)
+        # Log and snapshot in the same transaction as the edits
+        conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                             {"d": dataset_id, "a": "edit_cells", "p": _dump_log_params({"count": updated}), "c": datetime.utcnow()})
+        _snapshot_table(dataset_id, conn, table, changes=changes)
     return {"updated": updated}
 
 
@@ -1277,8 +1565,8 @@ def rename_columns(dataset_id: int, batch: schemas.ColumnRenameBatch, db: Sessio
     if not batch.renames:
         return {"renamed": 0}
     table = cleaned_table_name(dataset_id)
-    with engine.begin() as conn:
-        existing_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+    with begin_immediate() as conn:
+        existing_cols = _table_columns(conn, table)
         # Validate uniqueness after rename
         target_names = set(existing_cols)
         for r in batch.renames:
@@ -1292,6 +1580,8 @@ def rename_columns(dataset_id: int, batch: schemas.ColumnRenameBatch, db: Sessio
         # SQLite lacks simple RENAME COLUMN prior to modern versions; use ALTER TABLE RENAME in loop if available
         renamed = 0
         backup_table = f"num_backup_{dataset_id}"
+        # logged and snapshotted in a later transaction
+        _clear_snapshot_head(conn, dataset_id)
         for r in batch.renames:
             try:
                 conn.exec_driver_sql(f'ALTER TABLE {table} RENAME COLUMN {qi(r.old)} TO {qi(r.new)}')
@@ -1299,7 +1589,7 @@ def rename_columns(dataset_id: int, batch: schemas.ColumnRenameBatch, db: Sessio
                 try:
                     exists_backup = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table' AND name = :n", {"n": backup_table}).fetchone()
                     if exists_backup:
-                        backup_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({backup_table})").fetchall()]
+                        backup_cols = _table_columns(conn, backup_table)
                         if r.old in backup_cols and r.new not in backup_cols:
                             conn.exec_driver_sql(f'ALTER TABLE {backup_table} RENAME COLUMN {qi(r.old)} TO {qi(r.new)}')
                 except Exception as be:
@@ -1312,9 +1602,9 @@ def rename_columns(dataset_id: int, batch: schemas.ColumnRenameBatch, db: Sessio
     db.add(dataset)
     db.commit()
     try:
-        with engine.begin() as conn:
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "rename_columns", "p": json.dumps({"renamed": renamed}), "c": datetime.utcnow()})
+        with begin_immediate() as conn:
+            conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                                 {"d": dataset_id, "a": "rename_columns", "p": _dump_log_params({"renamed": renamed}), "c": datetime.utcnow()})
             _snapshot_table(dataset_id, conn, table)
     except Exception as e:
         logger.warning("Failed logging/snapshot rename_columns: %s", e)
@@ -1331,8 +1621,8 @@ def round_columns(dataset_id: int, batch: schemas.RoundBatch, db: Session = Depe
     table = cleaned_table_name(dataset_id)
     rounded = 0
     backup_table = f"num_backup_{dataset_id}"
-    with engine.begin() as conn:
-        existing_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+    with begin_immediate() as conn:
+        existing_cols = _table_columns(conn, table)
         # Create backup table once (original numeric snapshot with rowid mapping)
         exists_backup = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table' AND name = :n", {"n": backup_table}).fetchone()
         if not exists_backup:
@@ -1342,31 +1632,39 @@ def round_columns(dataset_id: int, batch: schemas.RoundBatch, db: Session = Depe
                 logger.warning("Failed creating numeric backup for dataset %s: %s", dataset_id, e)
         backup_cols = []
         try:
-            backup_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({backup_table})").fetchall()]
+            backup_cols = _table_columns(conn, backup_table)
         except Exception:
             pass
+        changes: List[CellChange] = []
         for spec in batch.rounds:
             if spec.column not in existing_cols:
                 raise HTTPException(status_code=400, detail=f"Column {spec.column} does not exist")
             try:
                 col_q = qi(spec.column)
+                # Only the cells whose value changes are read (and rewritten), so the snapshot delta
+                # costs O(changed cells)
                 if spec.column in backup_cols:
-                    conn.exec_driver_sql(
-                        f"UPDATE {table} SET {col_q} = ROUND((SELECT b.{col_q} FROM {backup_table} b WHERE b._orig_rowid = {table}.rowid), :d) WHERE (SELECT b.{col_q} FROM {backup_table} b WHERE b._orig_rowid = {table}.rowid) IS NOT NULL",
+                    # round from the original numeric values, not from an earlier rounding
+                    changed = conn.exec_driver_sql(
+                        f"SELECT t.rowid, t.{col_q}, ROUND(b.{col_q}, :d) FROM {table} t JOIN {backup_table} b ON b._orig_rowid = t.rowid "
+                        f"WHERE b.{col_q} IS NOT NULL AND t.{col_q} IS NOT ROUND(b.{col_q}, :d)",
                         {"d": spec.decimals}
-                    )
+                    ).fetchall()
                 else:
-                    conn.exec_driver_sql(f"UPDATE {table} SET {col_q} = ROUND({col_q}, :d)", {"d": spec.decimals})
+                    changed = conn.exec_driver_sql(
+                        f"SELECT rowid, {col_q}, ROUND({col_q}, :d) FROM {table} WHERE {col_q} IS NOT ROUND({col_q}, :d)",
+                        {"d": spec.decimals}
+                    ).fetchall()
+                if changed:
+                    conn.exec_driver_sql(f"UPDATE {table} SET {col_q} = ? WHERE rowid = ?",
+                                         [(new, rid) for rid, _, new in changed])
+                changes.extend((rid, spec.column, old, new) for rid, old, new in changed)
                 rounded += 1
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Failed rounding {spec.column}: {e}")
-    try:
-        with engine.begin() as conn:
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "round", "p": json.dumps({"rounded": rounded}), "c": datetime.utcnow()})
-            _snapshot_table(dataset_id, conn, table)
-    except Exception as e:
-        logger.warning("Failed logging/snapshot round: %s", e)
+        conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                             {"d": dataset_id, "a": "round", "p": _dump_log_params({"rounded": rounded}), "c": datetime.utcnow()})
+        _snapshot_table(dataset_id, conn, table, changes=changes)
     return {"rounded": rounded}
 
 
@@ -1379,50 +1677,152 @@ def impute_columns(dataset_id: int, batch: schemas.ImputeBatch, db: Session = De
         return {"imputed": 0}
     table = cleaned_table_name(dataset_id)
     imputed = 0
-    with engine.begin() as conn:
-        existing_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+    with begin_immediate() as conn:
+        existing_cols = _table_columns(conn, table)
+        changes: List[CellChange] = []
         for spec in batch.imputations:
             if spec.column not in existing_cols:
                 raise HTTPException(status_code=400, detail=f"Column {spec.column} does not exist")
             try:
+                column_q = qi(spec.column)
                 if spec.strategy in ('mean','median'):
                     agg = 'avg' if spec.strategy == 'mean' else 'median'
                     # SQLite lacks MEDIAN natively; emulate via percentile using window (simpler: fetch to Python)
-                    column_q = qi(spec.column)
                     if agg == 'avg':
                         val = conn.exec_driver_sql(f"SELECT AVG({column_q}) FROM {table} WHERE {column_q} IS NOT NULL").scalar()
                     else:
                         # approximate median: select value at 50th percentile
                         val = conn.exec_driver_sql(f"SELECT {column_q} FROM {table} WHERE {column_q} IS NOT NULL ORDER BY {column_q} LIMIT 1 OFFSET (SELECT COUNT(*) FROM {table} WHERE {column_q} IS NOT NULL)/2").scalar()
-                    conn.exec_driver_sql(f"UPDATE {table} SET {column_q} = :v WHERE {column_q} IS NULL", {"v": val})
                 elif spec.strategy == 'zero':
-                    column_q = qi(spec.column)
-                    conn.exec_driver_sql(f"UPDATE {table} SET {column_q} = 0 WHERE {column_q} IS NULL")
+                    val = 0
                 elif spec.strategy == 'mode':
-                    column_q = qi(spec.column)
                     val = conn.exec_driver_sql(f"SELECT {column_q} FROM {table} WHERE {column_q} IS NOT NULL GROUP BY {column_q} ORDER BY COUNT(*) DESC LIMIT 1").scalar()
                     if val is None:
                         val = ''
-                    conn.exec_driver_sql(f"UPDATE {table} SET {column_q} = :v WHERE {column_q} IS NULL", {"v": val})
                 elif spec.strategy == 'constant':
-                    column_q = qi(spec.column)
-                    conn.exec_driver_sql(f"UPDATE {table} SET {column_q} = :v WHERE {column_q} IS NULL", {"v": spec.constant})
+                    val = spec.constant
                 else:
                     raise HTTPException(status_code=400, detail=f"Unsupported strategy {spec.strategy}")
+                # Only the NULL cells change; their rowids are the whole snapshot delta
+                missing = [rid for (rid,) in conn.exec_driver_sql(f"SELECT rowid FROM {table} WHERE {column_q} IS NULL").fetchall()]
+                if val is not None and missing:
+                    conn.exec_driver_sql(f"UPDATE {table} SET {column_q} = :v WHERE {column_q} IS NULL", {"v": val})
+                    changes.extend((rid, spec.column, None, val) for rid in missing)
                 imputed += 1
             except HTTPException:
                 raise
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Failed imputing {spec.column}: {e}")
-    try:
-        with engine.begin() as conn:
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "impute", "p": json.dumps({"imputed": imputed}), "c": datetime.utcnow()})
-            _snapshot_table(dataset_id, conn, table)
-    except Exception as e:
-        logger.warning("Failed logging/snapshot impute: %s", e)
+        conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                             {"d": dataset_id, "a": "impute", "p": _dump_log_params({"imputed": imputed}), "c": datetime.utcnow()})
+        _snapshot_table(dataset_id, conn, table, changes=changes)
     return {"imputed": imputed}
 
+TIME_PARSE_PATTERNS = (
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y/%m/%d", "%d-%m-%Y",
+    "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f",
+)
+TIME_FORMAT_WORKERS = 8
+TIME_FORMAT_WRITE_CHUNK = 10_000  # rows read, converted and written back per step
+
+
+def _parse_time_value(val: Any) -> Optional[datetime]:
+    for p in TIME_PARSE_PATTERNS:
+        try:
+            return datetime.strptime(str(val), p)
+        except Exception:
+            continue
+    # last resort ISO parser
+    try:
+        return datetime.fromisoformat(str(val).replace('Z', ''))
+    except Exception:
+        return None
+
+
+def _format_time_value(parsed: datetime, fmt: str, pattern: str) -> Any:
+    if fmt == 'iso':
+        return parsed.isoformat()
+    if fmt == 'date':
+        return parsed.date().isoformat()
+    if fmt == 'epoch_ms':
+        # naive values are taken as UTC, matching _format_time_series
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp() * 1000)
+    # treat as strftime pattern
+    try:
+        return parsed.strftime(pattern)
+    except Exception:
+        return parsed.isoformat()
+
+
+def _format_time_series(parsed: pd.Series, fmt: str, pattern: str) -> pd.Series:
+    """Vectorized _format_time_value for a datetime64[ns] series without NaT."""
+    if fmt == 'iso':
+        out = parsed.dt.strftime('%Y-%m-%dT%H:%M:%S')
+        with_micros = parsed.dt.microsecond != 0
+        if with_micros.any():
+            out = out.where(~with_micros, out + parsed.dt.strftime('.%f'))
+        return out
+    if fmt == 'date':
+        return parsed.dt.strftime('%Y-%m-%d')
+    if fmt == 'epoch_ms':
+        ns = parsed.astype('int64')
+        # truncate toward zero like int(timestamp * 1000) does for pre-1970 values
+        return ns.where(ns >= 0, ns + 999_999) // 1_000_000
+    try:
+        return parsed.dt.strftime(pattern)
+    except Exception:
+        return _format_time_series(parsed, 'iso', pattern)
+
+
+def _column_row_chunks(conn, table: str, column: str, size: int):
+    """Yield a column's (rowid, value) pairs in rowid order, ``size`` rows at a time.
+
+    Each chunk is a finished keyset query, so the caller may update the table between chunks.
+    """
+    last = -2 ** 63
+    while True:
+        rows = conn.exec_driver_sql(
+            f"SELECT rowid, {qi(column)} FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?", (last, size)
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def _convert_time_rows(rows: List[Tuple[int, Any]], fmt: str, pattern: str) -> List[Tuple[int, Any, Any]]:
+    """Reformat one column's (rowid, value) pairs, returning (rowid, old_value, new_value) for parsed values.
+
+    Each pattern is tried column-wide with pd.to_datetime (first match wins, as with strptime);
+    values none of them accept go through the per-value parser.
+    """
+    values = pd.Series([val for _, val in rows], dtype=object)
+    present = values.notna() & (values != '')
+    text_values = values[present].astype(str)
+    parsed = pd.Series(pd.NaT, index=text_values.index, dtype='datetime64[ns]')
+    for p in TIME_PARSE_PATTERNS:
+        pending = parsed.isna()
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text_values[pending], format=p, errors='coerce')
+    matched = parsed.dropna()
+    converted = dict(zip(matched.index, _format_time_series(matched, fmt, pattern).tolist()))
+    out: List[Tuple[int, Any, Any]] = []
+    for idx in text_values.index:
+        if idx in converted:
+            newv = converted[idx]
+        else:
+            value = _parse_time_value(text_values[idx])
+            if value is None:
+                continue
+            newv = _format_time_value(value, fmt, pattern)
+        rid, val = rows[idx]
+        out.append((rid, val, newv))
+    return out
+
+
 @router.patch('/dataset/{dataset_id}/timeformat', response_model=schemas.TimeFormatResponse)
 def format_time_columns(dataset_id: int, spec: schemas.TimeFormatSpec, db: Session = Depends(get_db)):
     dataset = db.query(models.Dataset).filter(models.Dataset.id == dataset_id).first()
@@ -1434,56 +1834,41 @@ def format_time_columns(dataset_id: int, spec: schemas.TimeFormatSpec, db: Sessi
     fmt = spec.format.lower()
     formatted = 0
     # Accept keywords or strftime patterns
-    with engine.begin() as conn:
-        existing_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
-        targets = [c for c in spec.columns if c in existing_cols]
-        for col in targets:
-            # Fetch column values to python for robust parsing then write back
-            col_q = qi(col)
-            rows = conn.exec_driver_sql(f"SELECT rowid, {col_q} FROM {table}").fetchall()
-            out: list[tuple[int, any]] = []
-            for rid, val in rows:
-                if val is None or val == '':
-                    continue
-                parsed = None
-                # Try several common parse patterns
-                for p in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y/%m/%d", "%d-%m-%Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"):
-                    try:
-                        parsed = datetime.strptime(str(val), p)
-                        break
-                    except Exception:
-                        continue
-                if parsed is None:
-                    # last resort ISO parser
-                    try:
-                        parsed = datetime.fromisoformat(str(val).replace('Z',''))
-                    except Exception:
-                        continue
-                if fmt == 'iso':
-                    newv = parsed.isoformat()
-                elif fmt == 'date':
-                    newv = parsed.date().isoformat()
-                elif fmt == 'epoch_ms':
-                    newv = int(parsed.timestamp() * 1000)
-                else:
-                    # treat as strftime pattern
-                    try:
-                        newv = parsed.strftime(spec.format)
-                    except Exception:
-                        newv = parsed.isoformat()
-                out.append((rid, newv))
-            # write back
-            for rid, newv in out:
-                conn.exec_driver_sql(f"UPDATE {table} SET {col_q} = :v WHERE rowid = :rid", {"v": newv, "rid": rid})
-            if out:
-                formatted += 1
-    try:
-        with engine.begin() as conn:
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "timeformat", "p": json.dumps({"formatted": formatted, "format": spec.format}), "c": datetime.utcnow()})
-            _snapshot_table(dataset_id, conn, table)
-    except Exception as e:
-        logger.warning("Failed logging/snapshot timeformat: %s", e)
+    with begin_immediate() as conn:
+        existing_cols = _table_columns(conn, table)
+        targets = [c for c in dict.fromkeys(spec.columns) if c in existing_cols]
+        # The log row comes first so each chunk's deltas can be stored as it is written; they are
+        # only kept once the dataset has a full snapshot to replay them from (see _snapshot_table)
+        log_id = conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                                      {"d": dataset_id, "a": "timeformat", "p": _dump_log_params({"format": spec.format}), "c": datetime.utcnow()}).lastrowid
+        store_deltas = bool(_full_snapshot_log_ids(conn, dataset_id))
+        # Each column is read in chunks, parsed on the pool up to TIME_FORMAT_WORKERS chunks ahead and
+        # written back chunk by chunk, so no more than that many chunks are held at a time
+        with ThreadPoolExecutor(max_workers=TIME_FORMAT_WORKERS) as pool:
+            for col in targets:
+                update_sql = f"UPDATE {table} SET {qi(col)} = ? WHERE rowid = ?"
+                pending: deque = deque()
+                changed = False
+
+                def write_next() -> bool:
+                    out = pending.popleft().result()
+                    if out:
+                        conn.exec_driver_sql(update_sql, [(newv, rid) for rid, _, newv in out])
+                        if store_deltas:
+                            _insert_snapshot_deltas(conn, dataset_id, log_id, [(rid, col, val, newv) for rid, val, newv in out])
+                    return bool(out)
+
+                for rows in _column_row_chunks(conn, table, col, TIME_FORMAT_WRITE_CHUNK):
+                    pending.append(pool.submit(_convert_time_rows, rows, fmt, spec.format))
+                    if len(pending) >= TIME_FORMAT_WORKERS:
+                        changed |= write_next()
+                while pending:
+                    changed |= write_next()
+                if changed:
+                    formatted += 1
+        conn.exec_driver_sql("UPDATE operation_logs SET params_json = ? WHERE id = ?",
+                             (_dump_log_params({"formatted": formatted, "format": spec.format}), log_id))
+        _snapshot_table(dataset_id, conn, table, changes=[], log_id=log_id)
     return schemas.TimeFormatResponse(formatted=formatted, format=spec.format, columns=spec.columns)
 @router.put('/dataset/{dataset_id}/revert/{log_id}')
 def revert_to_snapshot(dataset_id: int, log_id: int, db: Session = Depends(get_db)):
@@ -1497,18 +1882,45 @@ def revert_to_snapshot(dataset_id: int, log_id: int, db: Session = Depends(get_d
         raise HTTPException(status_code=404, detail="Dataset not found")
     snap_name = f"snap_{dataset_id}_{log_id}"
     cleaned = cleaned_table_name(dataset_id)
-    # ensure snapshot exists
+    not_found = HTTPException(status_code=404, detail="Snapshot not found for log id (not captured or pruned)")
     try:
-        with engine.begin() as conn:
-            exists = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table' AND name = :n", {"n": snap_name}).fetchone()
-            if not exists:
-                raise HTTPException(status_code=404, detail="Snapshot not found for log id (not captured or pruned)")
-            # replace cleaned table with snapshot content (drop then recreate via copy)
-            conn.exec_driver_sql(f'DROP TABLE IF EXISTS {cleaned}')
-            conn.exec_driver_sql(f'CREATE TABLE {cleaned} AS SELECT * FROM {snap_name}')
+        with begin_immediate() as conn:
+            full_ids = _full_snapshot_log_ids(conn, dataset_id)
+            if log_id in full_ids:
+                _restore_full_snapshot(conn, cleaned, snap_name)
+            else:
+                # cell-level operations only store deltas; rebuild their state from the live table
+                # (undo newer edits) or from the closest earlier full snapshot (redo edits up to log_id).
+                # Deltas are keyed by rowid, which full snapshots and restores preserve (_copy_table).
+                # The live table is only undone when snap_heads says it matches the latest log, i.e.
+                # nothing has written it since without a snapshot.
+                logs = conn.exec_driver_sql(
+                    "SELECT id, action_type FROM operation_logs WHERE dataset_id = :d ORDER BY id",
+                    {"d": dataset_id}
+                ).fetchall()
+                actions = {lid: action for lid, action in logs}
+                if actions.get(log_id) not in DELTA_SNAPSHOT_ACTIONS:
+                    raise not_found
+
+                def delta_backed(lid: int) -> bool:
+                    return actions[lid] in DELTA_SNAPSHOT_ACTIONS and lid not in full_ids
+
+                later = [lid for lid in actions if lid > log_id]
+                live_is_head = _snapshot_head(conn, dataset_id) == max(actions)
+                if live_is_head and all(delta_backed(lid) for lid in later):
+                    _replay_snapshot_deltas(conn, dataset_id, cleaned, later, undo=True)
+                else:
+                    base_id = max((lid for lid in full_ids if lid < log_id), default=None)
+                    if base_id is None:
+                        raise not_found
+                    pending = [lid for lid in actions if base_id < lid <= log_id]
+                    if not all(delta_backed(lid) for lid in pending):
+                        raise not_found
+                    _restore_full_snapshot(conn, cleaned, f"snap_{dataset_id}_{base_id}")
+                    _replay_snapshot_deltas(conn, dataset_id, cleaned, pending, undo=False)
             # log revert operation (and snapshot new state with new log id)
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "revert", "p": json.dumps({"to_log_id": log_id}), "c": datetime.utcnow()})
+            conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                                 {"d": dataset_id, "a": "revert", "p": _dump_log_params({"to_log_id": log_id}), "c": datetime.utcnow()})
             _snapshot_table(dataset_id, conn, cleaned)
     except HTTPException:
         raise
@@ -1566,14 +1978,13 @@ async def add_data_to_dataset(
     
     # Validate file
     _validate_extension(file.filename)
-    content = await file.read()
-    if len(content) > MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=400, detail="File too large")
+    upload_buf = await _spool_upload(file)
     
     try:
         # Read and clean new data
         delimiter_value = _normalize_delimiter(delimiter)
-        df_raw = read_file_to_df(file.filename, content, delimiter=delimiter_value)
+        with upload_buf:
+            df_raw = read_file_to_df(file.filename, upload_buf, delimiter=delimiter_value)
         
         if config:
             cfg_obj = CleaningConfig(**json.loads(config))
@@ -1669,6 +2080,7 @@ async def add_data_to_dataset(
             )
             
             # Update dataset with merged data
+            _invalidate_snapshot_head(dataset_id)
             updated_dataset = update_dataset_with_merge(
                 db=db,
                 dataset_id=dataset_id,
@@ -1676,6 +2088,12 @@ async def add_data_to_dataset(
                 merge_metadata=merge_metadata,
                 source_filename=file.filename
             )
+            _log_table_rewrite(dataset_id, "merge", {
+                "strategy": merge_metadata.get("strategy"),
+                "merge_column": merge_metadata.get("merge_column"),
+                "source_filename": file.filename,
+                "rows_after": len(merged_df)
+            })
             
             # Get all sources for response
             sources = db.query(models.DatasetSource).filter(models.DatasetSource.dataset_id == dataset_id).all()
@@ -1735,10 +2153,12 @@ def get_merge_info(dataset_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Dataset not found")
     
     try:
-        # Get current columns
+        # Get current columns and row count without materializing the table
         table_name = cleaned_table_name(dataset_id)
-        current_df = pd.read_sql_table(table_name, con=engine)
-        
+        with engine.connect() as conn:
+            current_columns = _table_columns(conn, table_name)
+            current_rows = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table_name}").scalar() or 0
+
         # Get sources information
         sources = db.query(models.DatasetSource).filter(models.DatasetSource.dataset_id == dataset_id).all()
         source_info = [
@@ -1755,9 +2175,9 @@ def get_merge_info(dataset_id: int, db: Session = Depends(get_db)):
         
         return {
             "dataset_id": dataset_id,
-            "current_columns": current_df.columns.tolist(),
-            "current_rows": len(current_df),
-            "current_cols": len(current_df.columns),
+            "current_columns": current_columns,
+            "current_rows": int(current_rows),
+            "current_cols": len(current_columns),
             "is_multi_source": dataset.is_multi_source,
             "source_count": dataset.source_count,
             "sources": source_info,
@@ -1786,14 +2206,13 @@ async def preview_merge_operation(
         raise HTTPException(status_code=404, detail="Dataset not found")
     
     _validate_extension(file.filename)
-    content = await file.read()
-    if len(content) > MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=400, detail="File too large")
+    upload_buf = await _spool_upload(file)
     
     try:
         # Read new data
         delimiter_value = _normalize_delimiter(delimiter)
-        df_raw = read_file_to_df(file.filename, content, delimiter=delimiter_value)
+        with upload_buf:
+            df_raw = read_file_to_df(file.filename, upload_buf, delimiter=delimiter_value)
         cleaned_df, _ = run_cleaning_pipeline(df_raw, CleaningConfig())
         
         # Get column analysis
@@ -1807,7 +2226,8 @@ async def preview_merge_operation(
                     new_df=cleaned_df,
                     merge_strategy=merge_strategy,
                     merge_column=merge_column,
-                    join_type=join_type
+                    join_type=join_type,
+                    preview=True
                 )
                 
                 preview_rows = merged_df.head(5).to_dict(orient='records')
@@ -1838,7 +2258,7 @@ async def preview_merge_operation(
             "preview_rows": preview_rows,
             "merge_metadata": merge_metadata,
             "estimated_result_shape": {
-                "rows": len(merged_df) if merged_df is not None else len(cleaned_df),
+                "rows": merge_metadata.get("estimated_rows", len(merged_df)) if merged_df is not None else len(cleaned_df),
                 "cols": len(merged_df.columns) if merged_df is not None else len(cleaned_df.columns)
             } if success else None
         }
@@ -1879,8 +2299,12 @@ def get_related_datasets(dataset_id: int, db: Session = Depends(get_db)):
             
         # Also find datasets with similar names (heuristic for related datasets)
         base_name = current_dataset.name.split(' - ')[0]  # Remove filename suffix
+        # Prefix match as a NOCASE range so it can use ix_datasets_name_nocase (LIKE cannot on a
+        # BINARY column); same ASCII case folding as LIKE, without treating % or _ as wildcards
+        name_nocase = models.Dataset.name.collate('NOCASE')
         similar_datasets = db.query(models.Dataset).filter(
-            models.Dataset.name.like(f"{base_name}%"),
+            name_nocase >= base_name,
+            name_nocase < base_name + '\U0010ffff',
             models.Dataset.id != dataset_id
         ).all()
         
@@ -1984,31 +2408,72 @@ def update_single_cell(dataset_id: int, request: dict, db: Session = Depends(get
     
     table = cleaned_table_name(dataset_id)
     
-    with engine.begin() as conn:
+    with begin_immediate() as conn:
         # Check if column exists
-        existing_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+        existing_cols = _table_columns(conn, table)
         if column_name not in existing_cols:
             raise HTTPException(status_code=400, detail=f"Column {column_name} does not exist")
         
         # Update the cell
         col_q = qi(column_name)
+        old_value = conn.exec_driver_sql(f"SELECT {col_q} FROM {table} WHERE rowid = :rid", {"rid": row_id}).scalar()
         conn.exec_driver_sql(
             f"UPDATE {table} SET {col_q} = :val WHERE rowid = :rid",
             {"val": new_value, "rid": row_id}
         )
+        
+        # Log the operation in the same transaction so the edit costs a single commit
+        conn.exec_driver_sql(
+            INSERT_OPERATION_LOG_SQL,
+            {"d": dataset_id, "a": "edit_cell", "p": _dump_log_params({"row_id": row_id, "column": column_name, "value": new_value}), "c": datetime.utcnow()}
+        )
+        _snapshot_table(dataset_id, conn, table, changes=[(row_id, column_name, old_value, new_value)])
     
-    # Log the operation
-    try:
-        with engine.begin() as conn:
+    return {"status": "updated"}
+
+
+MAX_ADD_ROWS = 10_000
+
+
+def _append_rows(dataset_id: int, rows: List[dict], action: str, params: dict) -> List[int]:
+    """Append ``rows`` (column -> value, missing columns NULL) to the cleaned table in one transaction.
+
+    The rows, the operation log, the row-count update and the snapshot delta commit together.
+    Returns the new rowids.
+    """
+    table = cleaned_table_name(dataset_id)
+    with begin_immediate() as conn:
+        _, cols, _, col_list, placeholders = _table_column_entry(conn, table)
+        if not cols:
+            raise HTTPException(status_code=500, detail="No columns found for table")
+        unknown = sorted({key for row in rows for key in row} - set(cols))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+        if len(rows) == 1:
+            # single row: the driver reports the new rowid, no extra statement needed
+            result = conn.exec_driver_sql(f"INSERT INTO {table} ({col_list}) VALUES ({placeholders})",
+                                          tuple(rows[0].get(c) for c in cols))
+            rowids = [result.lastrowid]
+        else:
+            # rowids are assigned explicitly so the snapshot delta can name them
+            start = conn.exec_driver_sql(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").scalar()
+            rowids = list(range(start + 1, start + 1 + len(rows)))
             conn.exec_driver_sql(
-                "INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                {"d": dataset_id, "a": "edit_cell", "p": json.dumps({"row_id": row_id, "column": column_name, "value": new_value}), "c": datetime.utcnow()}
+                f"INSERT INTO {table} (rowid,{col_list}) VALUES (?,{placeholders})",
+                [(rid, *(row.get(c) for c in cols)) for rid, row in zip(rowids, rows)]
             )
-            _snapshot_table(dataset_id, conn, table)
-    except Exception as e:
-        logger.warning("Failed logging/snapshot edit_cell: %s", e)
-    
-    return {"status": "updated"}
+        # row markers first, then each column's values contiguously, so replay inserts the rows in one
+        # statement and fills each column with one executemany
+        changes: List[CellChange] = [(rid, None, None, None) for rid in rowids]
+        for c in cols:
+            changes.extend((rid, c, None, row[c]) for rid, row in zip(rowids, rows) if row.get(c) is not None)
+        log_id = conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                                      {"d": dataset_id, "a": action, "p": _dump_log_params(params), "c": datetime.utcnow()}).lastrowid
+        _snapshot_table(dataset_id, conn, table, changes=changes, log_id=log_id)
+        # update dataset stats in the same transaction
+        conn.exec_driver_sql("UPDATE datasets SET n_rows_clean = COALESCE(n_rows_clean, 0) + :n, updated_at = :u WHERE id = :id",
+                             {"n": len(rows), "u": datetime.utcnow(), "id": dataset_id})
+    return rowids
 
 
 @router.post('/dataset/{dataset_id}/add-row')
@@ -2017,24 +2482,9 @@ def add_row(dataset_id: int, db: Session = Depends(get_db)):
     dataset = db.query(models.Dataset).filter(models.Dataset.id == dataset_id).first()
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
-    table = cleaned_table_name(dataset_id)
     try:
-        with engine.begin() as conn:
-            # Insert a row with NULLs for all columns; use explicit column list
-            cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
-            if not cols:
-                raise HTTPException(status_code=500, detail="No columns found for table")
-            col_list = ','.join([qi(c) for c in cols])
-            placeholders = ','.join(['NULL' for _ in cols])
-            conn.exec_driver_sql(f"INSERT INTO {table} ({col_list}) VALUES ({placeholders})")
-            new_rowid = conn.exec_driver_sql("SELECT last_insert_rowid()").scalar()
-            # update dataset stats
-            dataset.n_rows_clean = dataset.n_rows_clean + 1
-            db.add(dataset)
-            db.commit()
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "add_row", "p": json.dumps({}), "c": datetime.utcnow()})
-            _snapshot_table(dataset_id, conn, table)
+        new_rowid = _append_rows(dataset_id, [{}], "add_row", {})[0]
+        db.expire(dataset)
         return {"status": "ok", "rowid": new_rowid}
     except HTTPException:
         raise
@@ -2043,6 +2493,39 @@ def add_row(dataset_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to add row: {e}")
 
 
+@router.post('/dataset/{dataset_id}/add-rows')
+def add_rows(dataset_id: int, payload: dict, db: Session = Depends(get_db)):
+    """Append several rows in one transaction. Payload: { count: int } for empty rows or
+    { rows: [ {column: value, ...}, ... ] }. Returns the new rowids."""
+    dataset = db.query(models.Dataset).filter(models.Dataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    rows = payload.get('rows')
+    if rows is None:
+        try:
+            count = int(payload.get('count', 1))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="count must be an integer")
+        if count > MAX_ADD_ROWS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_ADD_ROWS} rows per request")
+        rows = [{} for _ in range(max(count, 0))]
+    elif not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        raise HTTPException(status_code=400, detail="rows must be a list of objects")
+    if not rows:
+        raise HTTPException(status_code=400, detail="Nothing to add")
+    if len(rows) > MAX_ADD_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_ADD_ROWS} rows per request")
+    try:
+        rowids = _append_rows(dataset_id, rows, "add_rows", {"count": len(rows)})
+        db.expire(dataset)
+        return {"status": "ok", "added": len(rowids), "rowids": rowids}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Failed to add rows: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to add rows: {e}")
+
+
 @router.post('/dataset/{dataset_id}/add-column')
 def add_column(dataset_id: int, payload: dict, db: Session = Depends(get_db)):
     """Add a new column with the supplied name (NULL values). Payload: { column_name: str }"""
@@ -2054,19 +2537,19 @@ def add_column(dataset_id: int, payload: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Dataset not found")
     table = cleaned_table_name(dataset_id)
     try:
-        with engine.begin() as conn:
+        with begin_immediate() as conn:
             # basic validation: ensure column doesn't already exist
-            existing = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+            existing = _table_columns(conn, table)
             if name in existing:
                 raise HTTPException(status_code=400, detail="Column already exists")
             # Add as TEXT (safe default)
             conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {qi(name)} TEXT")
-            dataset.n_cols_clean = dataset.n_cols_clean + 1
-            db.add(dataset)
-            db.commit()
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "add_column", "p": json.dumps({"column": name}), "c": datetime.utcnow()})
+            conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                                 {"d": dataset_id, "a": "add_column", "p": _dump_log_params({"column": name}), "c": datetime.utcnow()})
+            conn.exec_driver_sql("UPDATE datasets SET n_cols_clean = COALESCE(n_cols_clean, 0) + 1, updated_at = :u WHERE id = :id",
+                                 {"u": datetime.utcnow(), "id": dataset_id})
             _snapshot_table(dataset_id, conn, table)
+        db.expire(dataset)
         return {"status": "ok"}
     except HTTPException:
         raise
@@ -2086,23 +2569,27 @@ def drop_column(dataset_id: int, payload: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Dataset not found")
     table = cleaned_table_name(dataset_id)
     try:
-        with engine.begin() as conn:
-            existing = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+        with begin_immediate() as conn:
+            _, existing, quoted, _, _ = _table_column_entry(conn, table)
             if name not in existing:
                 raise HTTPException(status_code=400, detail="Column does not exist")
-            # SQLite doesn't support DROP COLUMN directly for older versions; use rebuild table strategy
             remaining = [c for c in existing if c != name]
-            cols_q = ','.join([qi(c) for c in remaining])
-            tmp = f"tmp_drop_{dataset_id}_{int(time.time())}"
-            conn.exec_driver_sql(f"CREATE TABLE {tmp} AS SELECT {cols_q} FROM {table}")
-            conn.exec_driver_sql(f"DROP TABLE {table}")
-            conn.exec_driver_sql(f"ALTER TABLE {tmp} RENAME TO {table}")
-            dataset.n_cols_clean = len(remaining)
-            db.add(dataset)
-            db.commit()
-            conn.exec_driver_sql("INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                                 {"d": dataset_id, "a": "drop_column", "p": json.dumps({"column": name}), "c": datetime.utcnow()})
+            if SQLITE_HAS_DROP_COLUMN:
+                # SQLite >= 3.35 rewrites every row in place, keeping rowids, with no temporary table copy
+                conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN {qi(name)}")
+            else:
+                # SQLite doesn't support DROP COLUMN directly for older versions; use rebuild table strategy
+                cols_q = ','.join(q for c, q in zip(existing, quoted) if c != name)
+                tmp = f"tmp_drop_{dataset_id}_{next(_TMP_TABLE_COUNTER)}_{time.monotonic_ns()}"
+                conn.exec_driver_sql(f"CREATE TABLE {tmp} AS SELECT {cols_q} FROM {table}")
+                conn.exec_driver_sql(f"DROP TABLE {table}")
+                conn.exec_driver_sql(f"ALTER TABLE {tmp} RENAME TO {table}")
+            conn.exec_driver_sql(INSERT_OPERATION_LOG_SQL,
+                                 {"d": dataset_id, "a": "drop_column", "p": _dump_log_params({"column": name}), "c": datetime.utcnow()})
+            conn.exec_driver_sql("UPDATE datasets SET n_cols_clean = :n, updated_at = :u WHERE id = :id",
+                                 {"n": len(remaining), "u": datetime.utcnow(), "id": dataset_id})
             _snapshot_table(dataset_id, conn, table)
+        db.expire(dataset)
         return {"status": "ok"}
     except HTTPException:
         raise
@@ -2126,9 +2613,9 @@ def rename_single_column(dataset_id: int, request: dict, db: Session = Depends(g
     
     table = cleaned_table_name(dataset_id)
     
-    with engine.begin() as conn:
+    with begin_immediate() as conn:
         # Check if old column exists and new column doesn't
-        existing_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()]
+        existing_cols = _table_columns(conn, table)
         if old_column_name not in existing_cols:
             raise HTTPException(status_code=400, detail=f"Column {old_column_name} does not exist")
         if new_column_name in existing_cols:
@@ -2143,7 +2630,7 @@ def rename_single_column(dataset_id: int, request: dict, db: Session = Depends(g
             try:
                 exists_backup = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table' AND name = :n", {"n": backup_table}).fetchone()
                 if exists_backup:
-                    backup_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({backup_table})").fetchall()]
+                    backup_cols = _table_columns(conn, backup_table)
                     if old_column_name in backup_cols and new_column_name not in backup_cols:
                         conn.exec_driver_sql(f'ALTER TABLE {backup_table} RENAME COLUMN {qi(old_column_name)} TO {qi(new_column_name)}')
             except Exception as be:
@@ -2151,22 +2638,15 @@ def rename_single_column(dataset_id: int, request: dict, db: Session = Depends(g
                 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed renaming {old_column_name} -> {new_column_name}: {e}")
-    
-    # Update dataset timestamp
-    dataset.updated_at = datetime.utcnow()
-    db.add(dataset)
-    db.commit()
-    
-    # Log the operation
-    try:
-        with engine.begin() as conn:
-            conn.exec_driver_sql(
-                "INSERT INTO operation_logs (dataset_id, action_type, params_json, created_at) VALUES (:d,:a,:p,:c)",
-                {"d": dataset_id, "a": "rename_column", "p": json.dumps({"old": old_column_name, "new": new_column_name}), "c": datetime.utcnow()}
-            )
-            _snapshot_table(dataset_id, conn, table)
-    except Exception as e:
-        logger.warning("Failed logging/snapshot rename_column: %s", e)
+        
+        # Update dataset timestamp and log the operation in the same transaction
+        conn.exec_driver_sql("UPDATE datasets SET updated_at = :u WHERE id = :id", {"u": datetime.utcnow(), "id": dataset_id})
+        conn.exec_driver_sql(
+            INSERT_OPERATION_LOG_SQL,
+            {"d": dataset_id, "a": "rename_column", "p": _dump_log_params({"old": old_column_name, "new": new_column_name}), "c": datetime.utcnow()}
+        )
+        _snapshot_table(dataset_id, conn, table)
+    db.expire(dataset)
     
     return {"status": "renamed"}
 
@@ -2174,6 +2654,8 @@ def rename_single_column(dataset_id: int, request: dict, db: Session = Depends(g
 def admin_reset(full: bool = False):
     """Clear all stored data. If full=true delete file (recreate), else drop tables only."""
     full_reset(delete_file=full)
+    _TABLE_COLUMNS_CACHE.clear()
+    delete_all_model_runs()
     return {"status": "reset", "mode": "file" if full else "tables"}
 
 @router.post('/admin/integrity')
@@ -6,12 +6,13 @@ from cleaned dataset data with customizable styling options.
 """
 
 import logging
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
+from collections import namedtuple
+from typing import Dict, Any, Callable, Optional
+from fastapi import APIRouter, Header, HTTPException, Path, Response
+from sqlalchemy import text
 
-from ..db import get_db, engine
-from .. import models, schemas
+from ..db import engine_ro
+from .. import schemas
 from ..graphing.basic_graphs import (
     GraphGenerator, 
     GraphConfiguration,
@@ -25,18 +26,27 @@ from ..graphing.basic_graphs import (
 logger = logging.getLogger("mango.graphing")
 router = APIRouter()
 
+DatasetRow = namedtuple("DatasetRow", ["id", "n_rows_clean", "n_cols_clean"])
 
-def _get_dataset_or_404(dataset_id: int, db: Session) -> models.Dataset:
-    """Get dataset by ID or raise 404."""
-    dataset = db.query(models.Dataset).filter(
-        models.Dataset.id == dataset_id,
-        models.Dataset.is_deleted == False
-    ).first()
+_DATASET_LOOKUP_SQL = text(
+    "SELECT id, n_rows_clean, n_cols_clean FROM datasets WHERE id = :id AND is_deleted = 0"
+)
+
+
+def _get_dataset_or_404_fast(dataset_id: int) -> DatasetRow:
+    """Existence check for read-only endpoints that skips the ORM session."""
+    with engine_ro.connect() as conn:
+        row = conn.execute(_DATASET_LOOKUP_SQL, {"id": dataset_id}).first()
     
-    if not dataset:
+    if row is None:
         raise HTTPException(status_code=404, detail="Dataset not found")
     
-    return dataset
+    return DatasetRow(*row)
+
+
+def _wants_png(accept: Optional[str]) -> bool:
+    """Whether the client asked for the PNG itself (Accept: image/png) instead of base64 JSON."""
+    return accept is not None and "image/png" in accept
 
 
 def _convert_config_request_to_graph_config(
@@ -69,36 +79,63 @@ def _convert_config_request_to_graph_config(
 
 @router.get("/datasets/{dataset_id}/columns", response_model=schemas.AvailableColumnsResponse)
 async def get_dataset_columns(
-    dataset_id: int = Path(..., description="Dataset ID"),
-    db: Session = Depends(get_db)
+    dataset_id: int = Path(..., description="Dataset ID")
 ):
     """Get available columns for a dataset, categorized by data type."""
-    dataset = _get_dataset_or_404(dataset_id, db)
+    dataset = _get_dataset_or_404_fast(dataset_id)
     
     try:
-        columns_info = get_available_columns(dataset_id, engine)
+        columns_info = get_available_columns(dataset_id, engine_ro)
         return schemas.AvailableColumnsResponse(**columns_info)
     except Exception as e:
         logger.error(f"Error getting columns for dataset {dataset_id}: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving dataset columns")
-SUPPORTED_CHART_TYPES = {
-    "bar", "line", "scatter", "histogram", "box", "violin",
-    "pie", "heatmap", "correlation", "pairplot", "area"
+
+
+# chart type -> renderer; each takes (generator, validated_params, config, request) and returns base64
+CHART_HANDLERS: Dict[str, Callable[..., str]] = {
+    "bar": lambda gen, p, config, req: gen.create_bar_chart(
+        p["x_column"], p.get("y_column"), config,
+        req.aggregation or ('count' if not p.get('y_column') else 'mean')
+    ),
+    "line": lambda gen, p, config, req: gen.create_line_chart(
+        p["x_column"], p["y_column"], p.get("group_by"), config
+    ),
+    "scatter": lambda gen, p, config, req: gen.create_scatter_plot(
+        p["x_column"], p["y_column"], p.get("color_by"), p.get("size_by"), config
+    ),
+    "histogram": lambda gen, p, config, req: gen.create_histogram(p["column"], config),
+    "box": lambda gen, p, config, req: gen.create_box_plot(p["y_column"], p.get("x_column"), config),
+    "violin": lambda gen, p, config, req: gen.create_violin_plot(p["y_column"], p.get("x_column"), config),
+    "pie": lambda gen, p, config, req: gen.create_pie_chart(p["column"], config),
+    "heatmap": lambda gen, p, config, req: gen.create_heatmap(p.get("columns"), config),
+    "correlation": lambda gen, p, config, req: gen.create_correlation_matrix(config),
+    "pairplot": lambda gen, p, config, req: gen.create_pairplot(p.get("columns"), p.get("color_by"), config),
+    "area": lambda gen, p, config, req: gen.create_area_chart(p["x_column"], p["y_columns"], config),
 }
+SUPPORTED_CHART_TYPES = frozenset(CHART_HANDLERS)
 
 
-@router.post("/datasets/{dataset_id}/graphs", response_model=schemas.GraphResponse)
+@router.post(
+    "/datasets/{dataset_id}/graphs",
+    response_model=schemas.GraphResponse,
+    responses={200: {"content": {"image/png": {}}}}
+)
 async def create_graph(
     dataset_id: int = Path(..., description="Dataset ID"),
     request: schemas.CreateGraphRequest = ...,
-    db: Session = Depends(get_db)
+    accept: Optional[str] = Header(None)
 ):
-    """Create a graph from dataset data with customizable options."""
-    dataset = _get_dataset_or_404(dataset_id, db)
+    """Create a graph from dataset data with customizable options.
+    
+    Send return_binary=true or an Accept: image/png header to get the PNG itself rather than a
+    JSON body with the image base64-encoded (ignored when return_data is requested).
+    """
+    dataset = _get_dataset_or_404_fast(dataset_id)
     
     try:
         # Get available columns for validation
-        available_columns = get_available_columns(dataset_id, engine)
+        available_columns = get_available_columns(dataset_id, engine_ro)
         
         # Prepare parameters for validation
         parameters = {
@@ -132,146 +169,16 @@ async def create_graph(
             config = _convert_config_request_to_graph_config(request.config)
         
         # Create graph generator
-        generator = GraphGenerator(dataset_id, engine)
+        generator = GraphGenerator(dataset_id, engine_ro)
         
         # Generate the appropriate chart
-        data_payload = None
-        if chart_type_key == "bar":
-            image_base64 = generator.create_bar_chart(
-                validated_params["x_column"],
-                validated_params.get("y_column"),
-                config,
-                request.aggregation or ('count' if not validated_params.get('y_column') else 'mean')
-            )
-            if request.return_data:
-                df = generator.get_dataframe()
-                x_col = validated_params["x_column"]
-                y_col = validated_params.get("y_column")
-                if y_col is None:
-                    vc = df[x_col].value_counts()
-                    data_payload = {
-                        "labels": vc.index.tolist(),
-                        "values": vc.values.tolist(),
-                        "metric": "count"
-                    }
-                else:
-                    # replicate aggregation logic
-                    if df[y_col].dtype in ['object','category']:
-                        grouped = df.groupby(x_col)[y_col].count()
-                        metric = f"count({y_col})"
-                    else:
-                        agg = (request.aggregation or 'mean').lower()
-                        allowed = {'count','sum','mean','median','min','max'}
-                        if agg not in allowed:
-                            agg = 'mean'
-                        grouped = df.groupby(x_col)[y_col].agg(agg)
-                        metric = f"{agg}({y_col})"
-                    data_payload = {
-                        "labels": list(map(str, grouped.index.tolist())),
-                        "values": grouped.values.tolist(),
-                        "metric": metric
-                    }
-        elif chart_type_key == "line":
-            image_base64 = generator.create_line_chart(
-                validated_params["x_column"],
-                validated_params["y_column"],
-                validated_params.get("group_by"),
-                config
-            )
-            if request.return_data:
-                df = generator.get_dataframe().sort_values(validated_params["x_column"])
-                if validated_params.get("group_by"):
-                    gb = validated_params["group_by"]
-                    groups = []
-                    for name, g in df.groupby(gb):
-                        groups.append({
-                            "group": str(name),
-                            "x": g[validated_params["x_column"]].tolist(),
-                            "y": g[validated_params["y_column"]].tolist()
-                        })
-                    data_payload = {"series": groups}
-                else:
-                    data_payload = {
-                        "x": df[validated_params["x_column"]].tolist(),
-                        "y": df[validated_params["y_column"]].tolist()
-                    }
-        elif chart_type_key == "scatter":
-            image_base64 = generator.create_scatter_plot(
-                validated_params["x_column"],
-                validated_params["y_column"],
-                validated_params.get("color_by"),
-                validated_params.get("size_by"),
-                config
-            )
-            if request.return_data:
-                df = generator.get_dataframe()
-                payload = {
-                    "x": df[validated_params["x_column"]].tolist(),
-                    "y": df[validated_params["y_column"]].tolist()
-                }
-                cb = validated_params.get("color_by")
-                sb = validated_params.get("size_by")
-                if cb and cb in df.columns:
-                    payload["color_by"] = df[cb].astype(str).tolist()
-                if sb and sb in df.columns:
-                    payload["size_by"] = df[sb].tolist()
-                data_payload = payload
-        elif chart_type_key == "histogram":
-            image_base64 = generator.create_histogram(
-                validated_params["column"],
-                config
-            )
-            if request.return_data:
-                df = generator.get_dataframe()
-                col = validated_params["column"]
-                series = df[col].dropna().values
-                import numpy as _np
-                hist, bin_edges = _np.histogram(series, bins=config.bins if config else 30)
-                data_payload = {
-                    "bins": bin_edges.tolist(),
-                    "counts": hist.tolist(),
-                    "column": col
-                }
-        elif chart_type_key == "box":
-            image_base64 = generator.create_box_plot(
-                validated_params["y_column"],
-                validated_params.get("x_column"),
-                config
-            )
-        elif chart_type_key == "violin":
-            image_base64 = generator.create_violin_plot(
-                validated_params["y_column"],
-                validated_params.get("x_column"),
-                config
-            )
-        elif chart_type_key == "pie":
-            image_base64 = generator.create_pie_chart(
-                validated_params["column"],
-                config
-            )
-        elif chart_type_key == "heatmap":
-            image_base64 = generator.create_heatmap(
-                validated_params.get("columns"),
-                config
-            )
-        elif chart_type_key == "correlation":
-            image_base64 = generator.create_correlation_matrix(config)
-        elif chart_type_key == "pairplot":
-            image_base64 = generator.create_pairplot(
-                validated_params.get("columns"),
-                validated_params.get("color_by"),
-                config
-            )
-        elif chart_type_key == "area":
-            image_base64 = generator.create_area_chart(
-                validated_params["x_column"],
-                validated_params["y_columns"],
-                config
-            )
+        handler = CHART_HANDLERS.get(chart_type_key)
+        if handler is not None:
+            image_base64 = handler(generator, validated_params, config, request)
         else:
             if request.custom_plot is None:
                 raise HTTPException(status_code=400, detail=f"Unsupported chart type: {request.chart_type}")
-            custom_spec = request.custom_plot.dict(exclude_none=True)
+            custom_spec = request.custom_plot.model_dump(exclude_none=True)
             image_base64 = generator.create_custom_plot(
                 custom_spec,
                 config
@@ -281,6 +188,13 @@ async def create_graph(
                 "custom_plot": custom_spec
             }
         
+        # Only bar/line/scatter/histogram register plot data; it is built only when asked for
+        data_payload = generator.get_plot_data() if request.return_data else None
+        
+        wants_png = request.return_binary or _wants_png(accept)
+        if wants_png and not request.return_data:
+            return Response(content=generator.get_png_bytes(), media_type="image/png")
+        
         return schemas.GraphResponse(
             chart_type=chart_type,
             image_base64=image_base64,
@@ -300,18 +214,21 @@ async def quick_bar_graph(
     dataset_id: int = Path(..., description="Dataset ID"),
     column: str = Path(..., description="Column name for bar chart"),
     title: str = None,
-    db: Session = Depends(get_db)
+    accept: Optional[str] = Header(None)
 ):
-    """Create a quick bar chart with minimal configuration."""
-    dataset = _get_dataset_or_404(dataset_id, db)
+    """Create a quick bar chart with minimal configuration (the PNG itself for Accept: image/png)."""
+    dataset = _get_dataset_or_404_fast(dataset_id)
     
     try:
         # Validate column exists
-        available_columns = get_available_columns(dataset_id, engine)
+        available_columns = get_available_columns(dataset_id, engine_ro)
         if column not in available_columns['all']:
             raise HTTPException(status_code=400, detail=f"Column '{column}' not found")
         
-        image_base64 = quick_bar_chart(dataset_id, column, title)
+        generator = GraphGenerator(dataset_id, engine_ro)
+        image_base64 = quick_bar_chart(dataset_id, column, title, generator=generator)
+        if _wants_png(accept):
+            return Response(content=generator.get_png_bytes(), media_type="image/png")
         
         return schemas.GraphResponse(
             chart_type="bar",
@@ -328,13 +245,16 @@ async def quick_bar_graph(
 async def quick_correlation_graph(
     dataset_id: int = Path(..., description="Dataset ID"),
     title: str = None,
-    db: Session = Depends(get_db)
+    accept: Optional[str] = Header(None)
 ):
-    """Create a quick correlation matrix with minimal configuration."""
-    dataset = _get_dataset_or_404(dataset_id, db)
+    """Create a quick correlation matrix with minimal configuration (PNG as for quick bar)."""
+    dataset = _get_dataset_or_404_fast(dataset_id)
     
     try:
-        image_base64 = quick_correlation_matrix(dataset_id, title)
+        generator = GraphGenerator(dataset_id, engine_ro)
+        image_base64 = quick_correlation_matrix(dataset_id, title, generator=generator)
+        if _wants_png(accept):
+            return Response(content=generator.get_png_bytes(), media_type="image/png")
         
         return schemas.GraphResponse(
             chart_type="correlation",
@@ -353,20 +273,23 @@ async def quick_scatter_graph(
     x_column: str = Path(..., description="X-axis column name"),
     y_column: str = Path(..., description="Y-axis column name"),
     title: str = None,
-    db: Session = Depends(get_db)
+    accept: Optional[str] = Header(None)
 ):
-    """Create a quick scatter plot with minimal configuration."""
-    dataset = _get_dataset_or_404(dataset_id, db)
+    """Create a quick scatter plot with minimal configuration (PNG as for quick bar)."""
+    dataset = _get_dataset_or_404_fast(dataset_id)
     
     try:
         # Validate columns exist
-        available_columns = get_available_columns(dataset_id, engine)
+        available_columns = get_available_columns(dataset_id, engine_ro)
         if x_column not in available_columns['all']:
             raise HTTPException(status_code=400, detail=f"Column '{x_column}' not found")
         if y_column not in available_columns['all']:
             raise HTTPException(status_code=400, detail=f"Column '{y_column}' not found")
         
-        image_base64 = quick_scatter_plot(dataset_id, x_column, y_column, title)
+        generator = GraphGenerator(dataset_id, engine_ro)
+        image_base64 = quick_scatter_plot(dataset_id, x_column, y_column, title, generator=generator)
+        if _wants_png(accept):
+            return Response(content=generator.get_png_bytes(), media_type="image/png")
         
         return schemas.GraphResponse(
             chart_type="scatter",
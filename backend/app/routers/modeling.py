@@ -1,10 +1,18 @@
 from __future__ import annotations
+import json
+import os
+import shutil
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 
 import pandas as pd
 from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 import numpy as np
 """Modeling endpoints. scikit-learn is optional for the rest of the app; we attempt
@@ -16,12 +24,20 @@ at import time.
 _SKLEARN_AVAILABLE = True
 try:
     from sklearn.model_selection import train_test_split, cross_validate, StratifiedKFold, KFold
-    from sklearn.preprocessing import OneHotEncoder, StandardScaler, PolynomialFeatures
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler, PolynomialFeatures
     from sklearn.compose import ColumnTransformer
+    from sklearn.base import clone
     from sklearn.pipeline import Pipeline
-    from sklearn.metrics import accuracy_score, f1_score, roc_auc_score, mean_squared_error, r2_score, mean_absolute_error
+    from sklearn.metrics import accuracy_score, roc_auc_score, mean_squared_error, r2_score, mean_absolute_error, classification_report
     from sklearn.linear_model import LogisticRegression, LinearRegression, Lasso, Ridge
     from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+    from joblib import parallel_backend, dump as joblib_dump, load as joblib_load
+    from threadpoolctl import threadpool_limits
+    # scipy ships with scikit-learn
+    import scipy.stats as stats
+    from scipy import sparse
+    from scipy.linalg import cholesky, get_lapack_funcs
+    from scipy.special import ndtri
 except Exception:  # pragma: no cover - best-effort import
     _SKLEARN_AVAILABLE = False
     # define placeholders to avoid NameError when referenced elsewhere
@@ -30,45 +46,51 @@ except Exception:  # pragma: no cover - best-effort import
     StratifiedKFold = None
     KFold = None
     OneHotEncoder = None
+    OrdinalEncoder = None
     StandardScaler = None
     PolynomialFeatures = None
     ColumnTransformer = None
+    clone = None
     Pipeline = Any
     accuracy_score = None
-    f1_score = None
     roc_auc_score = None
     mean_squared_error = None
     r2_score = None
     mean_absolute_error = None
+    classification_report = None
     LogisticRegression = None
     LinearRegression = None
     Lasso = None
     Ridge = None
     RandomForestClassifier = None
     RandomForestRegressor = None
+    parallel_backend = None
+    joblib_dump = None
+    joblib_load = None
+    threadpool_limits = None
+    stats = None
+    sparse = None
+    cholesky = None
+    get_lapack_funcs = None
+    ndtri = None
 
 if TYPE_CHECKING:  # pragma: no cover - typing imports only
     from sklearn.pipeline import Pipeline as SklearnPipeline
 else:
     SklearnPipeline = Any
 
-_STATSMODELS_AVAILABLE = True
-try:
-    import statsmodels.api as sm  # type: ignore
-    from statsmodels.tsa.statespace.sarimax import SARIMAX  # type: ignore
-    from statsmodels.graphics.tsaplots import acf as sm_acf, pacf as sm_pacf  # type: ignore
-    from statsmodels.stats.diagnostic import acorr_ljungbox  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    _STATSMODELS_AVAILABLE = False
-    sm = None
-    SARIMAX = None
-    sm_acf = None
-    sm_pacf = None
-    acorr_ljungbox = None
-
-from ..db import get_db, engine
+# statsmodels takes over a second to import and only time-series runs use it, so it is imported
+# by the first of them (see _require_statsmodels) rather than at startup
+_STATSMODELS_AVAILABLE: Optional[bool] = None
+SARIMAX = None
+sm_acf = None
+sm_pacf = None
+acorr_ljungbox = None
+
+from ..db import get_db, engine_ro
 from .. import models, schemas
 from ..cleaning import cleaned_table_name
+from ..pipeline import cleaned_table_version
 
 router = APIRouter()
 
@@ -81,14 +103,261 @@ def _require_sklearn():
         ))
 
 def _require_statsmodels():
+    global _STATSMODELS_AVAILABLE, SARIMAX, sm_acf, sm_pacf, acorr_ljungbox
+    if _STATSMODELS_AVAILABLE is None:
+        try:
+            from statsmodels.tsa.statespace.sarimax import SARIMAX  # type: ignore
+            from statsmodels.graphics.tsaplots import acf as sm_acf, pacf as sm_pacf  # type: ignore
+            from statsmodels.stats.diagnostic import acorr_ljungbox  # type: ignore
+            _STATSMODELS_AVAILABLE = True
+        except Exception:  # pragma: no cover - optional dependency
+            _STATSMODELS_AVAILABLE = False
     if not _STATSMODELS_AVAILABLE:
         raise HTTPException(status_code=503, detail=(
             'statsmodels is not installed in the server environment. '
             'Install it with `pip install statsmodels` to enable time-series modeling endpoints.'
         ))
 
-# In-memory registry for model runs (simple first pass). For production, persist to DB.
-_MODEL_RUNS: Dict[str, Dict[str, Any]] = {}
+# BLAS threads per tabular fit. Each uvicorn worker otherwise starts one BLAS thread per core,
+# and concurrent runs across workers oversubscribe the CPU.
+SKLEARN_BLAS_THREADS = int(os.environ.get("SKLEARN_BLAS_THREADS", "1"))
+
+# Random forests on fewer rows than this fit on a single thread: their trees build in milliseconds,
+# so dispatching them to a thread pool costs more than it saves. Larger fits get about one thread
+# per thousand rows, up to the core count.
+FOREST_SERIAL_MAX_ROWS = 2000
+
+# Largest dense one-hot design (float32 bytes) handed to a random forest instead of a sparse one
+FOREST_DENSE_MAX_BYTES = 256 * 1024 * 1024
+
+# Requested model type -> the one actually fitted, when it does not suit the detected problem type
+_MODEL_TYPE_FOR_PROBLEM: Dict[str, Dict[str, str]] = {
+    'classification': {
+        'linear_regression': 'logistic_regression',
+        'ridge_regression': 'logistic_regression',
+        'lasso_regression': 'logistic_regression',
+        'polynomial_regression': 'logistic_regression',
+        'weighted_least_squares': 'logistic_regression',
+        'random_forest_regression': 'random_forest_classification',
+    },
+    'regression': {
+        'logistic_regression': 'linear_regression',
+        'random_forest_classification': 'random_forest_regression',
+    },
+}
+
+# Cross-validation with fewer rows x folds than this runs its folds one after another; each fold
+# fit is then too short to pay for dispatching it to a thread
+CV_SERIAL_MAX_FOLD_ROWS = 5000
+
+# Validates a run's preview rows (and its feature importances and coefficient table) in one call
+# rather than one model construction per item
+_PREVIEW_ROWS = TypeAdapter(List[schemas.ModelPreviewRow])
+_FEATURE_IMPORTANCES = TypeAdapter(List[schemas.FeatureImportanceItem])
+_COEFFICIENT_ROWS = TypeAdapter(List[schemas.CoefficientSummary])
+# ...and likewise a dataset's stored run records when listing them
+_RUN_RESPONSES = TypeAdapter(List[schemas.ModelRunResponse])
+
+# Q-Q plots over more (sampled) residuals than QQ_FULL_SORT_MAX show QQ_GRID_POINTS evenly spaced
+# order statistics instead of every sorted point
+QQ_FULL_SORT_MAX = 50_000
+QQ_GRID_POINTS = 2000
+
+# Per-run series kept for /model/visual (test targets, predictions, probabilities, time-series
+# fits) live on disk as .npy files instead of as Python lists in the run records, grouped by
+# dataset: MODEL_RUNS_DIR/<dataset_id>/<run_id>/.
+MODEL_RUNS_DIR = os.environ.get("MODEL_RUNS_DIR", os.path.join(".cache", "model_runs"))
+
+
+def _run_dir(dataset_id: int, run_id: str) -> str:
+    return os.path.join(MODEL_RUNS_DIR, str(int(dataset_id)), run_id)
+
+
+def _is_run_id(run_id: str) -> bool:
+    """Whether run_id has the uuid4 form create_model_run hands out (so it is safe as a path part)."""
+    try:
+        return str(uuid.UUID(run_id)) == run_id
+    except (TypeError, ValueError, AttributeError):
+        return False
+
+
+def _store_run_arrays(run_id: str, record: Dict[str, Any]) -> None:
+    """Move the record's '_'-prefixed array/list values to <run dir>/<key>.npy.
+
+    Values that don't form a plain numeric/string array (None gaps, ragged rows, mixed objects)
+    stay in memory, as lists.
+    """
+    run_dir = _run_dir(record['dataset_id'], run_id)
+    stored: List[str] = []
+    for key in [k for k, v in record.items() if k.startswith('_') and isinstance(v, (list, np.ndarray))]:
+        arr = record[key]
+        if isinstance(arr, np.ndarray) and arr.dtype == object:
+            # e.g. string class labels from an object column
+            record[key] = arr = arr.tolist()
+        try:
+            arr = np.asarray(arr)
+        except ValueError:
+            continue
+        if arr.dtype == object:
+            continue
+        os.makedirs(run_dir, exist_ok=True)
+        np.save(os.path.join(run_dir, f"{key}.npy"), arr, allow_pickle=False)
+        del record[key]
+        stored.append(key)
+    record['_stored_arrays'] = stored
+
+
+# Run records kept in memory; older ones are read back from <run dir>/record.joblib
+MODEL_RUNS_IN_MEMORY = int(os.environ.get("MODEL_RUNS_IN_MEMORY", "16"))
+# Runs kept on disk per dataset; creating one more deletes the least recently saved
+MODEL_RUNS_PER_DATASET = int(os.environ.get("MODEL_RUNS_PER_DATASET", "50"))
+
+
+class _RunRegistry:
+    """Model run records: the most recently used in memory, every one saved to disk.
+
+    A record is written to <run dir>/record.joblib on each put, so evicting it from memory only
+    drops the in-memory copy. Records whose write failed stay in memory. Lookups that miss memory
+    go to disk, so runs written by another worker or before a restart are found as well.
+    """
+
+    def __init__(self, max_in_memory: int):
+        self.max_in_memory = max_in_memory
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._on_disk: set = set()
+
+    @staticmethod
+    def _path(dataset_id: int, run_id: str) -> str:
+        return os.path.join(_run_dir(dataset_id, run_id), "record.joblib")
+
+    def put(self, run_id: str, record: Dict[str, Any]) -> None:
+        self._recent[run_id] = record
+        self._recent.move_to_end(run_id)
+        path = self._path(record['dataset_id'], run_id)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            joblib_dump(record, path, compress=3)
+            self._on_disk.add(run_id)
+        except Exception:
+            self._on_disk.discard(run_id)
+        self._evict()
+
+    def get(self, dataset_id: int, run_id: str, keep: bool = True) -> Optional[Dict[str, Any]]:
+        """The dataset's run record, or None. keep=False reads a record from disk without caching it."""
+        record = self._recent.get(run_id)
+        if record is not None:
+            if record['dataset_id'] != dataset_id:
+                return None
+            self._recent.move_to_end(run_id)
+            return record
+        if not _is_run_id(run_id):
+            return None
+        try:
+            record = joblib_load(self._path(dataset_id, run_id))
+        except Exception:
+            return None
+        if keep:
+            self._recent[run_id] = record
+            self._on_disk.add(run_id)
+            self._evict()
+        return record
+
+    def run_ids(self, dataset_id: int) -> List[str]:
+        """Ids of the dataset's runs, on disk or held only in memory (in no particular order)."""
+        try:
+            ids = set(os.listdir(os.path.join(MODEL_RUNS_DIR, str(int(dataset_id)))))
+        except OSError:
+            ids = set()
+        ids.update(rid for rid, rec in self._recent.items() if rec['dataset_id'] == dataset_id)
+        return list(ids)
+
+    def prune(self, dataset_id: int, keep: int) -> None:
+        """Delete all but the ``keep`` most recently saved runs of the dataset, on disk and in memory."""
+        dataset_dir = os.path.join(MODEL_RUNS_DIR, str(int(dataset_id)))
+        try:
+            names = os.listdir(dataset_dir)
+        except OSError:
+            names = []
+        if keep <= 0:
+            for run_id in [rid for rid, rec in self._recent.items() if rec['dataset_id'] == dataset_id]:
+                del self._recent[run_id]
+            self._on_disk.difference_update(names)
+            shutil.rmtree(dataset_dir, ignore_errors=True)
+        elif len(names) > keep:
+            def saved_at(name: str) -> float:
+                try:
+                    return os.path.getmtime(os.path.join(dataset_dir, name, "record.joblib"))
+                except OSError:
+                    return 0.0
+            for name in sorted(names, key=saved_at, reverse=True)[keep:]:
+                self._recent.pop(name, None)
+                self._on_disk.discard(name)
+                shutil.rmtree(os.path.join(dataset_dir, name), ignore_errors=True)
+        else:
+            return
+        _load_run_array_file.cache_clear()
+
+    def clear(self) -> None:
+        """Delete every run, on disk and in memory."""
+        self._recent.clear()
+        self._on_disk.clear()
+        shutil.rmtree(MODEL_RUNS_DIR, ignore_errors=True)
+        _load_run_array_file.cache_clear()
+
+    def _evict(self) -> None:
+        excess = len(self._recent) - self.max_in_memory
+        if excess <= 0:
+            return
+        for run_id in [rid for rid in self._recent if rid in self._on_disk][:excess]:
+            del self._recent[run_id]
+
+
+_MODEL_RUNS = _RunRegistry(MODEL_RUNS_IN_MEMORY)
+
+
+@lru_cache(maxsize=32)
+def _load_run_array_file(dataset_id: int, run_id: str, key: str) -> np.ndarray:
+    """A stored run series, kept loaded for repeat visual requests (read-only, as it is shared)."""
+    arr = np.load(os.path.join(_run_dir(dataset_id, run_id), f"{key}.npy"), allow_pickle=False)
+    arr.flags.writeable = False
+    return arr
+
+
+def delete_dataset_model_runs(dataset_id: int) -> None:
+    """Remove a deleted dataset's model runs and their stored series."""
+    _MODEL_RUNS.prune(dataset_id, 0)
+
+
+def delete_all_model_runs() -> None:
+    _MODEL_RUNS.clear()
+
+
+def _run_array(record: Dict[str, Any], key: str, as_list: bool = True):
+    """A run's stored series, read back from disk if _store_run_arrays moved it there.
+
+    Returned as a list, or as an ndarray with as_list=False (None when the run has no such series).
+    """
+    if key in record.get('_stored_arrays', ()):
+        value = _load_run_array_file(record['dataset_id'], record['run_id'], key)
+    else:
+        value = record.get(key)
+    if as_list:
+        return value.tolist() if isinstance(value, np.ndarray) else value
+    return np.asarray(value) if value is not None else None
+
+
+def _json_array(arr: np.ndarray):
+    """``arr`` as ORJSONResponse content: numeric arrays as they are (orjson serialises them
+    without building Python floats), anything else, e.g. string class labels, as a list."""
+    if arr.dtype.kind in 'biuf' and arr.flags.c_contiguous:
+        return arr
+    return arr.tolist()
+
+
+def _run_json(record: Dict[str, Any], key: str):
+    """A run's stored series as ORJSONResponse content (see _json_array), or None."""
+    value = _run_array(record, key, as_list=False)
+    return _json_array(value) if value is not None else None
 
 
 def _get_dataset_or_404(dataset_id: int, db: Session) -> models.Dataset:
@@ -98,15 +367,163 @@ def _get_dataset_or_404(dataset_id: int, db: Session) -> models.Dataset:
     return ds
 
 
-def _load_cleaned_dataframe(dataset_id: int) -> pd.DataFrame:
+# Rows fetched per round trip when loading a cleaned table for modeling
+LOAD_CHUNK_ROWS = 50_000
+
+
+def _select_list(columns: Optional[Sequence[str]]) -> str:
+    """SQL select list for ``columns`` (``*`` when None)."""
+    if columns is None:
+        return '*'
+    return ', '.join('"' + c.replace('"', '""') + '"' for c in columns)
+
+
+def _model_columns(dataset_id: int, request: schemas.ModelTaskRequest) -> Optional[Tuple[str, ...]]:
+    """The cleaned-table columns a run can read, in table order, or None when it needs all of them.
+
+    Time-series runs read only the time and target columns; tabular runs with include/exclude
+    lists read the features those leave, plus the target and weight column.
+    """
+    is_time_series = request.problem_type == 'time_series' or request.model_type in ('arima', 'sarima')
+    if not is_time_series and not request.include_columns and not request.exclude_columns:
+        return None
+    with engine_ro.connect() as conn:
+        table_cols = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({cleaned_table_name(dataset_id)})").fetchall()]
+    if is_time_series:
+        needed = {request.target, request.time_column}
+    else:
+        # the same filtering _build_pipeline applies
+        needed = {c for c in table_cols if c != request.target and c != '_rowid'}
+        if request.include_columns:
+            needed &= set(request.include_columns)
+        if request.exclude_columns:
+            needed -= set(request.exclude_columns)
+        needed |= {request.target, request.weight_column}
+    columns = tuple(c for c in table_cols if c in needed)
+    # none of them present: read everything and let the usual column checks report it
+    return None if not columns or len(columns) == len(table_cols) else columns
+
+
+def _load_cleaned_dataframe(dataset_id: int, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """Cleaned table (only ``columns``, if given), reused across runs until the table changes.
+
+    The frame is shared between calls, so callers must copy before modifying it.
+    """
+    return _load_cleaned_dataframe_cached(dataset_id, cleaned_table_version(dataset_id, engine_ro), columns)
+
+
+@lru_cache(maxsize=4)
+def _load_cleaned_dataframe_cached(dataset_id: int, version: tuple, columns: Optional[Tuple[str, ...]]) -> pd.DataFrame:
     tbl = cleaned_table_name(dataset_id)
-    # Simple read; rely on pandas + sqlite
-    import sqlite3
-    conn = sqlite3.connect(engine.url.database)  # type: ignore
-    try:
-        return pd.read_sql_query(f"SELECT * FROM {tbl}", conn)
-    finally:
-        conn.close()
+    # Fetch in chunks so only one chunk of Python row tuples is alive at a time, instead of the
+    # whole table's worth alongside the DataFrame built from it. dtype_backend='pyarrow' would not
+    # help here: pandas still fetches SQLite rows as tuples through the DB-API cursor, and the
+    # ArrowDtype columns it returns would break the object/numeric splits in _build_pipeline.
+    # pandas reads from the raw sqlite3 connection, skipping SQLAlchemy's per-row Result wrapping.
+    with engine_ro.connect() as conn:
+        parts = list(pd.read_sql_query(f"SELECT {_select_list(columns)} FROM {tbl}", conn.connection.dbapi_connection, chunksize=LOAD_CHUNK_ROWS))
+    if not parts:
+        return pd.DataFrame()
+    if len(parts) == 1:
+        return _shrink_dtypes(parts[0])
+    # A chunk in which a numeric column is entirely NULL comes back as object dtype; a single read
+    # would have produced floats with NaN, so align such chunks before concatenating.
+    for col in parts[0].columns:
+        if len({p[col].dtype for p in parts}) == 1:
+            continue
+        dtypes = {p[col].dtype for p in parts if p[col].notna().any()}
+        if dtypes and all(pd.api.types.is_numeric_dtype(d) for d in dtypes):
+            for p in parts:
+                if p[col].dtype == object:
+                    p[col] = p[col].astype('float64')
+    return _shrink_dtypes(pd.concat(parts, ignore_index=True, copy=False))
+
+
+def _shrink_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Narrow a loaded frame in place so the cached copy holds fewer bytes.
+
+    Integer columns take the smallest signed width that holds them, and text columns repeating
+    values on average at least twice become categoricals (one string per category instead of one
+    per row). Text columns with NULLs stay object, so one-hot feature names keep reading 'col_None'.
+    Floats are left alone; _build_pipeline narrows the features it trains on.
+    """
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_integer_dtype(values.dtype):
+            df[col] = pd.to_numeric(values, downcast='integer')
+        elif values.dtype == object and len(values) and values.notna().all() and values.nunique() < len(values) * 0.5:
+            df[col] = values.astype('category')
+    return df
+
+
+def _load_sampled_dataframe(dataset_id: int, target: str, max_rows: int, random_state: int,
+                            columns: Optional[Tuple[str, ...]] = None) -> Optional[pd.DataFrame]:
+    """Load only the ``max_rows`` sampled rows with a non-null ``target`` (only ``columns``, if given).
+
+    The rows are a uniform draw without replacement, seeded by ``random_state``, and keep the index
+    a full read would have given them. Returns None when no sampling is needed (or the target
+    column doesn't exist); load the full table then.
+
+    Like _load_cleaned_dataframe, the sample is reused by reruns with the same arguments until the
+    table changes, and is shared between calls, so callers must copy before modifying it.
+    """
+    return _load_sampled_dataframe_cached(
+        dataset_id, cleaned_table_version(dataset_id, engine_ro), target, max_rows, random_state, columns
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_sampled_dataframe_cached(dataset_id: int, version: tuple, target: str, max_rows: int, random_state: int,
+                                   columns: Optional[Tuple[str, ...]]) -> Optional[pd.DataFrame]:
+    tbl = cleaned_table_name(dataset_id)
+    with engine_ro.connect() as conn:
+        declared = {row[1]: (row[2] or '').upper() for row in conn.exec_driver_sql(f"PRAGMA table_info({tbl})").fetchall()}
+        if target not in declared:
+            return None
+        quoted_target = '"' + target.replace('"', '""') + '"'
+        total, with_target, min_rowid, max_rowid = conn.exec_driver_sql(
+            f"SELECT COUNT(*), COUNT({quoted_target}), MIN(rowid), MAX(rowid) FROM {tbl}"
+        ).first()
+        if not total or with_target <= max_rows:
+            return None
+        # Generator.choice draws max_rows positions directly; RandomState.choice (what
+        # DataFrame.sample uses) shuffles all of them first, ~0.4s at 10M rows
+        rng = np.random.default_rng(random_state)
+        if with_target == total and max_rowid - min_rowid + 1 == total:
+            # Every row has the target and the rowids have no gaps, so row i of a full read has
+            # rowid min_rowid + i; only the sample itself is ever held in memory
+            chosen = rng.choice(total, size=max_rows, replace=False)
+            rowids = chosen + min_rowid
+        else:
+            # rowid + whether the target is set, for every row in table order; positions in this
+            # list are the index a full read would have given each row
+            result = conn.exec_driver_sql(f"SELECT rowid, {quoted_target} IS NOT NULL FROM {tbl}")
+            rowid_parts, has_target_parts = [], []
+            while True:
+                rows = result.fetchmany(LOAD_CHUNK_ROWS)
+                if not rows:
+                    break
+                arr = np.array(rows, dtype=np.int64)
+                rowid_parts.append(arr[:, 0])
+                has_target_parts.append(arr[:, 1].astype(bool))
+            positions = np.flatnonzero(np.concatenate(has_target_parts))
+            chosen = positions[rng.choice(len(positions), size=max_rows, replace=False)]
+            rowids = np.concatenate(rowid_parts)[chosen]
+        df = pd.read_sql_query(
+            f"SELECT rowid AS __sample_rowid, {_select_list(columns)} FROM {tbl} WHERE rowid IN (SELECT value FROM json_each(?))",
+            conn, params=(json.dumps(rowids.tolist()),)
+        )
+    df = df.set_index('__sample_rowid').loc[rowids]
+    df.index = pd.Index(chosen)
+    # a column that is NULL throughout the sample reads back as object; keep declared numerics numeric
+    for col in df.columns:
+        if df[col].dtype == object and declared.get(col) in ('INTEGER', 'REAL', 'FLOAT', 'NUMERIC') and df[col].isna().all():
+            df[col] = df[col].astype('float64')
+    return df
+
+
+# Leading rows checked for high cardinality before counting distinct values over the full target
+PROBLEM_TYPE_PREFIX_ROWS = 4096
 
 
 def _infer_problem_type(df: pd.DataFrame, target: str) -> str:
@@ -116,13 +533,15 @@ def _infer_problem_type(df: pd.DataFrame, target: str) -> str:
     - Otherwise regression.
     """
     y = df[target]
-    series = y.dropna()
-    unique_vals = series.unique()
-    nunique = len(unique_vals)
-    total = max(len(series), 1)
+    # More than 50 distinct values can only mean regression; a prefix usually shows that
+    # without hashing the whole column
+    if len(y) > PROBLEM_TYPE_PREFIX_ROWS and y.iloc[:PROBLEM_TYPE_PREFIX_ROWS].nunique() > 50:
+        return 'regression'
+    nunique = y.nunique(dropna=True)
+    total = max(int(y.count()), 1)
     unique_ratio = nunique / total
     # Object or low cardinality discrete
-    if y.dtype == object or str(y.dtype).startswith('category'):
+    if pd.api.types.is_object_dtype(y.dtype) or isinstance(y.dtype, pd.CategoricalDtype):
         if nunique <= 50:
             return 'classification'
     # Binary explicitly
@@ -134,6 +553,23 @@ def _infer_problem_type(df: pd.DataFrame, target: str) -> str:
     return 'regression'
 
 
+def _forest_jobs(n_rows: int) -> int:
+    """n_jobs for a random forest fit on ``n_rows`` rows (see FOREST_SERIAL_MAX_ROWS)."""
+    if n_rows < FOREST_SERIAL_MAX_ROWS:
+        return 1
+    return min(os.cpu_count() or 1, max(1, n_rows // 1000))
+
+
+def _table_problem_type(dataset_id: int, columns: Optional[Tuple[str, ...]], target: str) -> str:
+    """_infer_problem_type over the cached cleaned table, remembered until the table changes."""
+    return _table_problem_type_cached(dataset_id, cleaned_table_version(dataset_id, engine_ro), columns, target)
+
+
+@lru_cache(maxsize=64)
+def _table_problem_type_cached(dataset_id: int, version: tuple, columns: Optional[Tuple[str, ...]], target: str) -> str:
+    return _infer_problem_type(_load_cleaned_dataframe_cached(dataset_id, version, columns), target)
+
+
 def _build_pipeline(
     df: pd.DataFrame,
     target: str,
@@ -159,67 +595,78 @@ def _build_pipeline(
     if not feature_cols:
         raise HTTPException(status_code=400, detail="No feature columns available after filtering")
 
-    X = df[feature_cols].copy()
     y = df[target]
+    # The target keeps the dtype a plain read gives it (see _shrink_dtypes) for the metrics and summary
+    if isinstance(y.dtype, pd.CategoricalDtype):
+        y = y.astype(object)
+    elif pd.api.types.is_integer_dtype(y.dtype):
+        y = y.astype(np.int64)
 
     mask = y.notna()
-    X = X.loc[mask].copy()
+    # reindex and take each build a new, independent frame, so X is copied out of the (shared)
+    # loaded frame once, or twice when target-less rows are dropped, rather than copy-then-copy
+    X = df.reindex(columns=feature_cols)
+    if not mask.all():
+        X = X.take(np.flatnonzero(mask.to_numpy()))
     y = y.loc[mask]
     if weight_series is not None:
         weight_series = weight_series.loc[mask]
 
-    if req.max_rows and len(X) > req.max_rows:
-        sampled = X.sample(req.max_rows, random_state=req.random_state)
-        sample_index = sampled.index
-        X = sampled
-        y = y.loc[sample_index]
-        if weight_series is not None:
-            weight_series = weight_series.loc[sample_index]
-
     if weight_series is not None:
         weight_series = pd.to_numeric(weight_series, errors='coerce').fillna(0)
         if (weight_series < 0).any():
             raise HTTPException(status_code=400, detail='Weight column contains negative values which are not supported')
 
-    categorical = [c for c in X.columns if X[c].dtype == object]
-    numeric = [c for c in X.columns if c not in categorical]
+    # One pass over the dtypes: object, category (see _shrink_dtypes) and pandas string columns are
+    # encoded, everything else is numeric
+    dtypes = X.dtypes
+    is_categorical = [d == object or isinstance(d, (pd.CategoricalDtype, pd.StringDtype)) for d in dtypes]
+    categorical = [c for c, cat in zip(X.columns, is_categorical) if cat]
+    numeric = [c for c, cat in zip(X.columns, is_categorical) if not cat]
+
+    # float32 halves the bytes moved by the fits (tree ensembles convert to float32 internally
+    # anyway; the summary's Gram products upcast again, see _gram_with_intercept). Columns with magnitudes beyond 2**24 stay float64,
+    # where float32 would no longer resolve whole units (ids, epoch timestamps).
+    # The bounds come from min/max and the cast is one astype, so neither a copy of the numeric
+    # block nor an abs() temporary per column is made along the way.
+    downcast = [
+        c for c in numeric
+        if np.issubdtype(dtypes[c], np.number) and -2 ** 24 < X[c].min() and X[c].max() < 2 ** 24
+    ]
+    if downcast:
+        X = X.astype(dict.fromkeys(downcast, np.float32), copy=False)
+
+    effective_model_type = _MODEL_TYPE_FOR_PROBLEM.get(problem_type, {}).get(req.model_type, req.model_type)
+
+    # Forests split dense float32 input several times faster than CSR (the sparse splitter walks
+    # each column's nonzeros at every node), so their one-hot output is densified when it fits in
+    # FOREST_DENSE_MAX_BYTES. Linear models keep it sparse; the summary's Gram products handle both.
+    sparse_threshold = 0.3
+    if effective_model_type in ('random_forest_regression', 'random_forest_classification') and categorical:
+        dense_width = len(numeric) + sum(int(X[c].nunique()) + 1 for c in categorical)
+        if len(X) * dense_width * 4 <= FOREST_DENSE_MAX_BYTES:
+            sparse_threshold = 0.0
 
     transformers: List[Any] = []
     if categorical:
         if req.encode_categoricals == 'ordinal':
-            for c in categorical:
-                codes, _ = pd.factorize(X[c])
-                X.loc[:, c] = codes
-            categorical = []
+            transformers.append(('cat', OrdinalEncoder(
+                handle_unknown='use_encoded_value', unknown_value=-1, encoded_missing_value=-1,
+                dtype=np.float32
+            ), categorical))
         else:
-            transformers.append(('cat', OneHotEncoder(handle_unknown='ignore'), categorical))
-    if numeric and req.normalize_numeric:
-        transformers.append(('num', StandardScaler(), numeric))
-
-    if transformers:
-        preprocessor: Any = ColumnTransformer(transformers=transformers, remainder='passthrough')
+            transformers.append(('cat', OneHotEncoder(handle_unknown='ignore', dtype=np.float32), categorical))
+    if transformers or req.normalize_numeric:
+        # Numeric columns get an explicit block rather than riding along as the remainder, so they
+        # keep 'num__' feature names (and their importances) whether or not they are scaled
+        if numeric:
+            transformers.append(('num', StandardScaler(copy=False) if req.normalize_numeric else 'passthrough', numeric))
+        preprocessor: Any = ColumnTransformer(transformers=transformers, remainder='drop', sparse_threshold=sparse_threshold)
     else:
         preprocessor = 'passthrough'
 
     steps: List[Tuple[str, Any]] = [('prep', preprocessor)]
 
-    effective_model_type = req.model_type
-
-    if problem_type == 'classification':
-        if effective_model_type in {
-            'linear_regression',
-            'ridge_regression',
-            'lasso_regression',
-            'polynomial_regression',
-            'weighted_least_squares'
-        }:
-            effective_model_type = 'logistic_regression'
-        elif effective_model_type == 'random_forest_regression':
-            effective_model_type = 'random_forest_classification'
-    elif problem_type == 'regression':
-        if effective_model_type in {'logistic_regression', 'random_forest_classification'}:
-            effective_model_type = 'random_forest_regression' if effective_model_type == 'random_forest_classification' else 'linear_regression'
-
     if effective_model_type == 'polynomial_regression' and problem_type == 'regression':
         degree = req.polynomial_degree or 2
         if degree < 2:
@@ -240,7 +687,7 @@ def _build_pipeline(
             n_estimators=n_estimators,
             max_depth=req.max_depth,
             random_state=req.random_state,
-            n_jobs=-1
+            n_jobs=_forest_jobs(len(X))
         )
     elif effective_model_type == 'random_forest_classification':
         n_estimators = req.n_estimators or 300
@@ -248,7 +695,7 @@ def _build_pipeline(
             n_estimators=n_estimators,
             max_depth=req.max_depth,
             random_state=req.random_state,
-            n_jobs=-1
+            n_jobs=_forest_jobs(len(X))
         )
     elif effective_model_type == 'weighted_least_squares':
         if weight_series is None:
@@ -263,13 +710,15 @@ def _build_pipeline(
     return X, y, pipe, feature_cols, categorical, numeric, weight_series
 
 
-def _compute_feature_importance(pipeline: SklearnPipeline, feature_cols: List[str], categorical: List[str]) -> List[schemas.FeatureImportanceItem]:
+def _compute_feature_importance(pipeline: SklearnPipeline, feature_cols: List[str], categorical: List[str]) -> Tuple[List[str], List[float]]:
+    """Feature names and importances as two parallel lists, most important first (both empty when
+    the model has no feature_importances_)."""
     model = pipeline.named_steps['model']
     importances = None
     if hasattr(model, 'feature_importances_'):
         importances = model.feature_importances_
     if importances is None:
-        return []
+        return [], []
     # Need to expand one-hot columns if present
     prep = pipeline.named_steps['prep']
     expanded_names: List[str] = []
@@ -281,33 +730,136 @@ def _compute_feature_importance(pipeline: SklearnPipeline, feature_cols: List[st
                 expanded_names.extend(cols)
     else:
         expanded_names = feature_cols
-    items = []
-    for f, imp in zip(expanded_names, importances):
-        items.append(schemas.FeatureImportanceItem(feature=f, importance=float(imp)))
-    items.sort(key=lambda x: x.importance, reverse=True)
-    return items
+    n = min(len(expanded_names), len(importances))
+    values = np.asarray(importances[:n], dtype=float)
+    # Stable descending order: ties keep their column order
+    order = np.argsort(-values, kind='stable')
+    return [expanded_names[i] for i in order], values[order].tolist()
+
+
+def _gram_with_intercept(X: np.ndarray, w: Optional[np.ndarray] = None) -> np.ndarray:
+    """X1' W X1 for X1 = [1, X] and W = diag(w) (identity when w is None).
+
+    Assembled from blocks (sum of weights, X'w, X'WX) so neither the (n, p+1) design matrix with
+    the ones column nor an (n, n) weight matrix is ever materialized. X may be a scipy sparse
+    matrix (one-hot output); only the (p+1, p+1) result is dense then.
+    The products are always accumulated in float64: the float32 model inputs lose too much over
+    n rows (an uncentred column can make the Gram numerically singular).
+    """
+    n, p = X.shape
+    G = np.empty((p + 1, p + 1))
+    if sparse.issparse(X):
+        X = sparse.csr_matrix(X, dtype=np.float64)
+        if w is None:
+            G[0, 0] = n
+            G[0, 1:] = np.asarray(X.sum(axis=0)).ravel()
+            G[1:, 1:] = (X.T @ X).toarray()
+        else:
+            G[0, 0] = w.sum()
+            G[0, 1:] = X.T @ w
+            G[1:, 1:] = (X.T @ X.multiply(w[:, None]).tocsr()).toarray()
+    else:
+        X = np.asarray(X, dtype=np.float64)
+        if w is None:
+            G[0, 0] = n
+            G[0, 1:] = X.sum(axis=0)
+            G[1:, 1:] = X.T @ X
+        else:
+            G[0, 0] = w.sum()
+            G[0, 1:] = X.T @ w
+            # X'WX as S'S with S = sqrt(W) X (the weights are non-negative): numpy hands a product of
+            # an array with its own transpose to BLAS syrk, which computes only one triangle
+            Xs = X * np.sqrt(w)[:, None]
+            G[1:, 1:] = Xs.T @ Xs
+    G[1:, 0] = G[0, 1:]
+    return G
+
+
+def _inverse_diagonal(gram: np.ndarray) -> np.ndarray:
+    """diag(inv(gram)) for a symmetric positive semi-definite Gram/Fisher matrix.
+
+    Uses a Cholesky factor L (with a tiny ridge) instead of a full inverse: diag(inv(LL')) is the
+    column-wise sum of squares of inv(L). inv(L) comes from LAPACK's triangular inverse (trtri),
+    about a third of the work of solving L against the identity. Raises np.linalg.LinAlgError if
+    the factorization fails.
+    """
+    p = gram.shape[0]
+    L = cholesky(gram + 1e-10 * np.eye(p), lower=True)
+    trtri, = get_lapack_funcs(('trtri',), (L,))
+    L_inv, info = trtri(L, lower=1)
+    if info != 0:
+        raise np.linalg.LinAlgError(f'triangular inverse failed (info={info})')
+    # trtri leaves the strict upper triangle as it found it (zeros from cholesky)
+    return np.einsum('ij,ij->j', L_inv, L_inv)
+
+
+def _coefficient_tests(estimates: np.ndarray, std_errors: np.ndarray, df: Optional[int] = None):
+    """Test statistics and two-sided p-values for all coefficients at once.
+
+    Uses Student's t with `df` degrees of freedom, or the normal distribution (z) when df is None.
+    Entries whose standard error is not positive come back as NaN.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stat = np.where(std_errors > 0, estimates / std_errors, np.nan)
+    dist = stats.norm if df is None else stats.t(df)
+    return stat, 2 * dist.sf(np.abs(stat))
+
+
+def _coefficient_rows(feature_names, intercept: float, coefs, std_errors: np.ndarray,
+                      stat: np.ndarray, p_values: np.ndarray) -> List[schemas.CoefficientSummary]:
+    """'(Intercept)' plus one CoefficientSummary per feature, reading the arrays from
+    _coefficient_tests (intercept first). A coefficient past the end of std_errors gets no
+    statistics; one whose statistic is NaN keeps its standard error only.
+    """
+    names = ['(Intercept)'] + [str(name) for name in feature_names]
+    estimates = [float(intercept)] + np.asarray(coefs, dtype=float).tolist()
+    se = std_errors.tolist()
+    stat_list = stat.tolist()
+    p_list = p_values.tolist()
+    has_stat = (~np.isnan(stat)).tolist()
+    return _COEFFICIENT_ROWS.validate_python([
+        {
+            'feature': name,
+            'estimate': estimate,
+            'std_error': se[i] if i < len(se) else None,
+            't_value': stat_list[i] if i < len(se) and has_stat[i] else None,
+            'p_value': p_list[i] if i < len(se) and has_stat[i] else None
+        }
+        for i, (name, estimate) in enumerate(zip(names, estimates))
+    ])
+
+
+def _model_inputs(pipeline: SklearnPipeline, X):
+    """X as the final 'model' step sees it: through prep and, for polynomial regression, poly."""
+    return pipeline[:-1].transform(X)
+
+
+def _model_feature_names(pipeline: SklearnPipeline, feature_cols: List[str]) -> List[str]:
+    """Names of the columns _model_inputs produces (the raw feature columns when prep passes through)."""
+    try:
+        names = pipeline[:-1].get_feature_names_out()
+    except Exception:
+        names = None
+    return list(names) if names is not None else list(feature_cols)
 
 
 def _compute_comprehensive_summary(pipeline: SklearnPipeline, X_train, X_test, y_train, y_test, 
                                  y_pred, problem_type: str, feature_cols: List[str]) -> schemas.ModelSummary:
     """Compute comprehensive model statistics similar to R's lm.summary()"""
-    import numpy as np
-    from sklearn.metrics import classification_report
-    import scipy.stats as stats
-    
     summary = schemas.ModelSummary()
     
     if problem_type == 'regression':
         # Calculate residuals
         residuals = y_test - y_pred
         
-        # Residual summary statistics
+        # Residual summary statistics (all five order statistics from one quantile pass)
+        r_min, r_q1, r_median, r_q3, r_max = np.quantile(np.asarray(residuals, dtype=float), [0.0, 0.25, 0.5, 0.75, 1.0])
         summary.residuals = schemas.ResidualSummary(
-            min=float(np.min(residuals)),
-            q1=float(np.percentile(residuals, 25)),
-            median=float(np.median(residuals)),
-            q3=float(np.percentile(residuals, 75)),
-            max=float(np.max(residuals)),
+            min=float(r_min),
+            q1=float(r_q1),
+            median=float(r_median),
+            q3=float(r_q3),
+            max=float(r_max),
             standard_error=float(np.std(residuals))
         )
         
@@ -339,78 +891,42 @@ def _compute_comprehensive_summary(pipeline: SklearnPipeline, X_train, X_test, y
         if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
             try:
                 # Calculate standard errors, t-values, and p-values
-                from sklearn.linear_model import LinearRegression
-                
-                # Get the transformed training data
-                X_transformed = pipeline.named_steps['prep'].transform(X_train) if pipeline.named_steps['prep'] != 'passthrough' else X_train
-                
-                # Convert to numpy array if it's sparse
-                if hasattr(X_transformed, 'toarray'):
-                    X_transformed = X_transformed.toarray()
+                # Transform the training data once; the model's predictions and the Gram matrix both
+                # read this (pipeline.predict would run the preprocessing again)
+                X_transformed = _model_inputs(pipeline, X_train)
+                y_pred_train = model.predict(X_transformed)
                 
-                # Ensure we have numpy arrays
-                X_transformed = np.array(X_transformed)
-                y_train_arr = np.array(y_train)
-                y_pred_train = pipeline.predict(X_train)
+                # Sparse one-hot output stays sparse; _gram_with_intercept handles both. asarray, not
+                # array: a dense ndarray from the transform is used as is rather than copied
+                if not sparse.issparse(X_transformed):
+                    X_transformed = np.asarray(X_transformed)
+                y_train_arr = np.asarray(y_train)
                 
                 # Calculate residuals and MSE
                 residuals_train = y_train_arr - y_pred_train
                 mse = np.mean(residuals_train ** 2)
                 
-                # Calculate design matrix (X with intercept column)
                 n_samples, n_features = X_transformed.shape
-                X_with_intercept = np.column_stack([np.ones(n_samples), X_transformed])
                 
-                # Calculate standard errors using the formula: SE = sqrt(MSE * diag(inv(X'X)))
+                # Calculate standard errors using the formula: SE = sqrt(MSE * diag(inv(X'X))),
+                # X here being the design matrix with an intercept column
                 try:
-                    XtX_inv = np.linalg.inv(X_with_intercept.T @ X_with_intercept)
-                    var_coef = mse * np.diag(XtX_inv)
+                    var_coef = mse * _inverse_diagonal(_gram_with_intercept(X_transformed))
                     std_errors = np.sqrt(np.abs(var_coef))  # abs to handle numerical issues
                     
                     # Get feature names after preprocessing
-                    if hasattr(pipeline.named_steps['prep'], 'get_feature_names_out'):
-                        feature_names = list(pipeline.named_steps['prep'].get_feature_names_out())
-                    else:
-                        feature_names = feature_cols
-                    
-                    coefficients = []
-                    
-                    # Intercept
-                    intercept_se = std_errors[0] if len(std_errors) > 0 else None
-                    intercept_t = model.intercept_ / intercept_se if intercept_se and intercept_se > 0 else None
-                    intercept_p = 2 * (1 - stats.t.cdf(abs(intercept_t), n_samples - n_features - 1)) if intercept_t is not None else None
-                    
-                    coefficients.append(schemas.CoefficientSummary(
-                        feature='(Intercept)',
-                        estimate=float(model.intercept_),
-                        std_error=float(intercept_se) if intercept_se is not None else None,
-                        t_value=float(intercept_t) if intercept_t is not None else None,
-                        p_value=float(intercept_p) if intercept_p is not None else None
-                    ))
-                    
-                    # Feature coefficients
-                    for i, (name, coef) in enumerate(zip(feature_names, model.coef_)):
-                        se_idx = i + 1  # +1 because intercept is at index 0
-                        coef_se = std_errors[se_idx] if se_idx < len(std_errors) else None
-                        coef_t = coef / coef_se if coef_se and coef_se > 0 else None
-                        coef_p = 2 * (1 - stats.t.cdf(abs(coef_t), n_samples - n_features - 1)) if coef_t is not None else None
-                        
-                        coefficients.append(schemas.CoefficientSummary(
-                            feature=str(name),
-                            estimate=float(coef),
-                            std_error=float(coef_se) if coef_se is not None else None,
-                            t_value=float(coef_t) if coef_t is not None else None,
-                            p_value=float(coef_p) if coef_p is not None else None
-                        ))
+                    feature_names = _model_feature_names(pipeline, feature_cols)
                     
-                    summary.coefficients = coefficients
+                    # Intercept first, then the features
+                    estimates = np.concatenate([[model.intercept_], model.coef_])[:len(std_errors)]
+                    t_values, p_values = _coefficient_tests(estimates, std_errors, n_samples - n_features - 1)
+                    summary.coefficients = _coefficient_rows(
+                        feature_names, model.intercept_, model.coef_, std_errors, t_values, p_values
+                    )
                     
                 except np.linalg.LinAlgError:
                     # If matrix is singular, fall back to coefficients without statistics
-                    if hasattr(pipeline.named_steps['prep'], 'get_feature_names_out'):
-                        feature_names = list(pipeline.named_steps['prep'].get_feature_names_out())
-                    else:
-                        feature_names = feature_cols
+                    feature_names = _model_feature_names(pipeline, feature_cols)
                     
                     coefficients = []
                     coefficients.append(schemas.CoefficientSummary(
@@ -442,13 +958,8 @@ def _compute_comprehensive_summary(pipeline: SklearnPipeline, X_train, X_test, y
         model = pipeline.named_steps['model']
         if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
             try:
-                from sklearn.linear_model import LogisticRegression
-                
                 # Get feature names after preprocessing
-                if hasattr(pipeline.named_steps['prep'], 'get_feature_names_out'):
-                    feature_names = list(pipeline.named_steps['prep'].get_feature_names_out())
-                else:
-                    feature_names = feature_cols
+                feature_names = _model_feature_names(pipeline, feature_cols)
                 
                 coefficients = []
                 
@@ -456,63 +967,34 @@ def _compute_comprehensive_summary(pipeline: SklearnPipeline, X_train, X_test, y
                 if isinstance(model, LogisticRegression):
                     try:
                         # Get the transformed training data
-                        X_transformed = pipeline.named_steps['prep'].transform(X_train) if pipeline.named_steps['prep'] != 'passthrough' else X_train
+                        X_transformed = _model_inputs(pipeline, X_train)
                         
-                        # Convert to numpy array if it's sparse
-                        if hasattr(X_transformed, 'toarray'):
-                            X_transformed = X_transformed.toarray()
-                        
-                        X_transformed = np.array(X_transformed)
+                        # Sparse one-hot output stays sparse; _gram_with_intercept handles both
+                        if not sparse.issparse(X_transformed):
+                            X_transformed = np.asarray(X_transformed)
                         n_samples, n_features = X_transformed.shape
                         
                         # Get predictions on training data
                         proba = model.predict_proba(X_transformed)
                         
-                        # Handle binary vs multiclass
-                        if model.coef_.ndim == 1:
+                        # Handle binary vs multiclass: a binary model stores its coefficients as one (1, p) row
+                        if model.coef_.shape[0] == 1:
                             # Binary classification
+                            coef = model.coef_[0]
                             p = proba[:, 1]  # Probability of positive class
                             
-                            # Create design matrix with intercept
-                            X_with_intercept = np.column_stack([np.ones(n_samples), X_transformed])
-                            
-                            # Calculate Fisher Information Matrix approximation
-                            W = np.diag(p * (1 - p))  # Weight matrix
-                            
                             try:
-                                # Fisher Information Matrix: X'WX
-                                fisher_info = X_with_intercept.T @ W @ X_with_intercept
-                                covariance_matrix = np.linalg.inv(fisher_info)
-                                std_errors = np.sqrt(np.diag(covariance_matrix))
-                                
-                                # Intercept
-                                intercept_se = std_errors[0] if len(std_errors) > 0 else None
-                                intercept_z = model.intercept_[0] / intercept_se if intercept_se and intercept_se > 0 else None
-                                intercept_p = 2 * (1 - stats.norm.cdf(abs(intercept_z))) if intercept_z is not None else None
+                                # Fisher Information Matrix: X'WX with W = diag(p(1-p)), intercept included
+                                fisher_info = _gram_with_intercept(X_transformed, p * (1 - p))
+                                std_errors = np.sqrt(_inverse_diagonal(fisher_info))
                                 
-                                coefficients.append(schemas.CoefficientSummary(
-                                    feature='(Intercept)',
-                                    estimate=float(model.intercept_[0]),
-                                    std_error=float(intercept_se) if intercept_se is not None else None,
-                                    t_value=float(intercept_z) if intercept_z is not None else None,  # Using z-score for logistic
-                                    p_value=float(intercept_p) if intercept_p is not None else None
+                                # Intercept first, then the features; t_value carries the z-score for logistic
+                                estimates = np.concatenate([model.intercept_[:1], coef])[:len(std_errors)]
+                                z_values, p_values = _coefficient_tests(estimates, std_errors)
+                                coefficients.extend(_coefficient_rows(
+                                    feature_names, model.intercept_[0], coef, std_errors, z_values, p_values
                                 ))
                                 
-                                # Feature coefficients
-                                for i, (name, coef) in enumerate(zip(feature_names, model.coef_)):
-                                    se_idx = i + 1
-                                    coef_se = std_errors[se_idx] if se_idx < len(std_errors) else None
-                                    coef_z = coef / coef_se if coef_se and coef_se > 0 else None
-                                    coef_p = 2 * (1 - stats.norm.cdf(abs(coef_z))) if coef_z is not None else None
-                                    
-                                    coefficients.append(schemas.CoefficientSummary(
-                                        feature=str(name),
-                                        estimate=float(coef),
-                                        std_error=float(coef_se) if coef_se is not None else None,
-                                        t_value=float(coef_z) if coef_z is not None else None,
-                                        p_value=float(coef_p) if coef_p is not None else None
-                                    ))
-                                
                             except np.linalg.LinAlgError:
                                 # Fall back to estimates only
                                 coefficients.append(schemas.CoefficientSummary(
@@ -520,10 +1002,10 @@ def _compute_comprehensive_summary(pipeline: SklearnPipeline, X_train, X_test, y
                                     estimate=float(model.intercept_[0])
                                 ))
                                 
-                                for name, coef in zip(feature_names, model.coef_):
+                                for name, value in zip(feature_names, coef):
                                     coefficients.append(schemas.CoefficientSummary(
                                         feature=str(name),
-                                        estimate=float(coef)
+                                        estimate=float(value)
                                     ))
                         else:
                             # Multiclass - just show first class for simplicity (no statistics)
@@ -595,55 +1077,113 @@ def _compute_comprehensive_summary(pipeline: SklearnPipeline, X_train, X_test, y
     return summary
 
 
-def _to_serializable(value: Any) -> Any:
-    """Convert numpy scalars to native Python types for JSON serialization."""
-    if isinstance(value, np.generic):  # type: ignore[arg-type]
-        return value.item()
-    return value
-
-
 def _format_index_value(value: Any) -> str:
-    if isinstance(value, pd.Timestamp):
-        return value.isoformat()
-    if isinstance(value, datetime):
+    if isinstance(value, datetime):  # pd.Timestamp included
         return value.isoformat()
     return str(value)
 
 
+def _format_index(index: pd.Index) -> Sequence[str]:
+    """_format_index_value for every label of ``index``.
+
+    A tz-naive DatetimeIndex of whole seconds (the usual time-series case) is formatted in one
+    numpy call, which matches Timestamp.isoformat() for such values, and returned as that string
+    array; anything else goes label by label into a list.
+    """
+    if isinstance(index, pd.DatetimeIndex) and index.tz is None and not (index.asi8 % 1_000_000_000).any():
+        return np.datetime_as_string(index.values, unit='s')
+    return [_format_index_value(value) for value in index]
+
+
+def _validate_target(y: pd.Series, problem_type: str) -> Tuple[str, Optional[pd.Index]]:
+    """Check a classification target's class counts before the feature pipeline is built.
+
+    Returns the problem type to train with (numeric targets unfit for classification fall back to
+    regression) and the classes whose rows should be dropped for having fewer than 2 samples, if
+    any. Raises ValueError when a non-numeric target can't be classified.
+    """
+    if problem_type != 'classification':
+        return problem_type, None
+    y = y.dropna()
+    value_counts = y.value_counts()
+    too_small = value_counts[value_counts < 2]
+    if len(value_counts) == 1:
+        if pd.api.types.is_numeric_dtype(y):
+            return 'regression', None
+        raise ValueError("Target has only one class; need at least two distinct classes for classification.")
+    if not too_small.empty:
+        rare_frac = y.isin(too_small.index).mean()
+        if rare_frac < 0.02:
+            return problem_type, too_small.index
+        if pd.api.types.is_numeric_dtype(y):
+            return 'regression', None
+        raise ValueError(f"Classes with <2 samples present: {', '.join(too_small.index.astype(str))}.")
+    return problem_type, None
+
+
+def _f1_and_accuracy(y_true: pd.Series, y_pred: np.ndarray) -> Tuple[float, float]:
+    """Weighted F1 and accuracy, both read off one confusion matrix.
+
+    Same values as f1_score(average='weighted') (over the labels in either array, a label's F1
+    being 0 when it is never predicted correctly) and accuracy_score, without each of them
+    re-encoding the labels and rebuilding the matrix.
+    """
+    y_true_arr = np.asarray(y_true)
+    labels, codes = np.unique(np.concatenate([y_true_arr, np.asarray(y_pred)]), return_inverse=True)
+    n_labels = len(labels)
+    n = len(y_true_arr)
+    matrix = np.bincount(codes[:n] * n_labels + codes[n:], minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+    tp = np.diag(matrix)
+    support = matrix.sum(axis=1)
+    # F1 = 2TP / (2TP + FP + FN) = 2TP / (true count + predicted count)
+    denom = support + matrix.sum(axis=0)
+    f1 = np.divide(2.0 * tp, denom, out=np.zeros(n_labels), where=denom > 0)
+    return float(f1 @ support / n), float(tp.sum() / n)
+
+
 def _train_tabular_model(
     df: pd.DataFrame,
     request: schemas.ModelTaskRequest,
     problem_type: str
 ) -> Dict[str, Any]:
-    X, y, pipeline, feature_cols, cat_cols, num_cols, weight_series = _build_pipeline(df, request.target, request, problem_type)
-    current_problem_type = problem_type
+    # Target checks first, so a degenerate target fails before any feature preparation, and the
+    # estimator is chosen for the problem type they settle on (a numeric target unfit for
+    # classification gets a regressor straight away)
+    current_problem_type, rare_classes = _validate_target(df[request.target], problem_type)
+    X, y, pipeline, feature_cols, cat_cols, num_cols, weight_series = _build_pipeline(df, request.target, request, current_problem_type)
+    if rare_classes is not None:
+        rare_idx = y.isin(rare_classes)
+        X = X.loc[~rare_idx]
+        y = y.loc[~rare_idx]
+        if weight_series is not None:
+            weight_series = weight_series.loc[X.index]
 
+    # Classification splits are stratified unless one side would be too small to hold every class
+    # (where train_test_split refuses to stratify). Classes with fewer than 2 rows were dropped
+    # above, so the split sizes are the only thing left to check.
+    stratify_arg = None
     if current_problem_type == 'classification':
-        value_counts = y.value_counts()
-        too_small = value_counts[value_counts < 2]
-        if len(value_counts) == 1:
-            if pd.api.types.is_numeric_dtype(y):
-                current_problem_type = 'regression'
-            else:
-                raise ValueError("Target has only one class; need at least two distinct classes for classification.")
-        elif not too_small.empty:
-            rare_idx = y.isin(too_small.index)
-            rare_frac = rare_idx.mean()
-            if rare_frac < 0.02:
-                X = X.loc[~rare_idx]
-                y = y.loc[~rare_idx]
-                if weight_series is not None:
-                    weight_series = weight_series.loc[X.index]
-            elif pd.api.types.is_numeric_dtype(y):
-                current_problem_type = 'regression'
-            else:
-                raise ValueError(f"Classes with <2 samples present: {', '.join(too_small.index.astype(str))}.")
+        n_test = int(np.ceil(request.test_size * len(y)))
+        if min(n_test, len(y) - n_test) >= y.nunique():
+            stratify_arg = y
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y,
+        test_size=request.test_size,
+        random_state=request.random_state,
+        stratify=stratify_arg
+    )
 
-    if pipeline.named_steps['model'].__class__.__name__.endswith('Classifier') and current_problem_type == 'regression':
-        X, y, pipeline, feature_cols, cat_cols, num_cols, weight_series = _build_pipeline(df, request.target, request, 'regression')
-        current_problem_type = 'regression'
+    fit_kwargs: Dict[str, Any] = {}
+    weight_test = None
+    if weight_series is not None:
+        weight_series = weight_series.reindex(y.index).fillna(0)
+        weight_train = weight_series.reindex(y_train.index).fillna(0)
+        weight_test = weight_series.reindex(y_test.index).fillna(0)
+        fit_kwargs['model__sample_weight'] = weight_train.to_numpy()
 
     additional: Dict[str, Any] = {}
+    holdout_pool: Optional[ThreadPoolExecutor] = None
+    holdout_fit: Optional[Future] = None
     if request.cv_folds and request.cv_folds >= 2 and len(X) >= request.cv_folds:
         if weight_series is None:
             try:
@@ -659,7 +1199,24 @@ def _train_tabular_model(
                         'rmse': 'neg_root_mean_squared_error',
                         'r2': 'r2'
                     }
-                cv_results = cross_validate(pipeline, X, y, cv=cv, scoring=scoring, n_jobs=-1)
+                # folds run on threads: sklearn's fit/predict kernels release the GIL, and this
+                # avoids spawning worker processes and pickling X/y for each request. At most one
+                # thread per fold; none at all for small inputs.
+                # The folds clone their own unfitted copy up front, as the holdout fit may be
+                # mutating `pipeline` on another thread while they run.
+                cv_pipeline = clone(pipeline)
+                if len(X) * request.cv_folds < CV_SERIAL_MAX_FOLD_ROWS:
+                    cv_jobs = 1
+                else:
+                    cpus = os.cpu_count() or 1
+                    cv_jobs = min(request.cv_folds, cpus)
+                    if cpus > 1:
+                        # The holdout fit below doesn't depend on the folds, so it runs on its own
+                        # thread alongside them rather than after them
+                        holdout_pool = ThreadPoolExecutor(max_workers=1)
+                        holdout_fit = holdout_pool.submit(pipeline.fit, X_train, y_train, **fit_kwargs)
+                with parallel_backend('threading'):
+                    cv_results = cross_validate(cv_pipeline, X, y, cv=cv, scoring=scoring, n_jobs=cv_jobs)
                 cv_summary: Dict[str, Dict[str, float]] = {}
                 for label in scoring.keys():
                     values = np.array(cv_results[f'test_{label}'], dtype=float)
@@ -678,60 +1235,48 @@ def _train_tabular_model(
         else:
             additional['cross_validation_note'] = 'Cross-validation skipped because sample weights were provided.'
 
-    stratify_arg = y if current_problem_type == 'classification' else None
-    try:
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y,
-            test_size=request.test_size,
-            random_state=request.random_state,
-            stratify=stratify_arg
-        )
-    except ValueError:
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y,
-            test_size=request.test_size,
-            random_state=request.random_state,
-            stratify=None
-        )
-
-    fit_kwargs: Dict[str, Any] = {}
-    weight_test = None
-    if weight_series is not None:
-        weight_series = weight_series.reindex(y.index).fillna(0)
-        weight_train = weight_series.reindex(y_train.index).fillna(0)
-        weight_test = weight_series.reindex(y_test.index).fillna(0)
-        fit_kwargs['model__sample_weight'] = weight_train.to_numpy()
+    if holdout_fit is not None:
+        try:
+            holdout_fit.result()
+        finally:
+            holdout_pool.shutdown()
+    else:
+        pipeline.fit(X_train, y_train, **fit_kwargs)
 
-    pipeline.fit(X_train, y_train, **fit_kwargs)
-    preds = pipeline.predict(X_test)
+    # One inference pass over X_test: classifier labels are read off the probabilities. The fitted
+    # pipeline is not kept once the run is recorded, so this is the only predict call it ever serves
+    # (random forests already spread it across cores with n_jobs=-1). This holds for multiclass
+    # models too: a forest's predict() averages the same per-tree probabilities and logistic
+    # regression's only skips a softmax, so predicting labels alone would not save a pass.
+    proba = None
+    if current_problem_type == 'classification' and hasattr(pipeline.named_steps['model'], 'predict_proba'):
+        try:
+            proba = pipeline.predict_proba(X_test)
+        except Exception as prob_err:
+            additional['probability_warning'] = str(prob_err)
+    if proba is not None:
+        preds = pipeline.classes_.take(np.argmax(proba, axis=1))
+    else:
+        preds = pipeline.predict(X_test)
 
     metrics_primary = ''
     metric_value = 0.0
-    proba = None
     if current_problem_type == 'classification':
         metrics_primary = 'f1'
         try:
-            metric_value = float(f1_score(y_test, preds, average='weighted'))
+            metric_value, additional['accuracy'] = _f1_and_accuracy(y_test, preds)
         except Exception:
-            metric_value = float(accuracy_score(y_test, preds))
-        additional['accuracy'] = float(accuracy_score(y_test, preds))
-        if hasattr(pipeline.named_steps['model'], 'predict_proba'):
+            metric_value = additional['accuracy'] = float(accuracy_score(y_test, preds))
+        if proba is not None and proba.shape[1] == 2:
             try:
-                proba = pipeline.predict_proba(X_test)
-                if proba.shape[1] == 2:
-                    roc = roc_auc_score(y_test, proba[:, 1])
-                    additional['roc_auc'] = float(roc)
+                roc = roc_auc_score(y_test, proba[:, 1])
+                additional['roc_auc'] = float(roc)
             except Exception as prob_err:
                 additional['probability_warning'] = str(prob_err)
-                proba = None
     else:
         metrics_primary = 'rmse'
-        try:
-            rmse = mean_squared_error(y_test, preds, squared=False)
-        except TypeError:
-            import math
-            rmse = math.sqrt(mean_squared_error(y_test, preds))
-        metric_value = float(rmse)
+        rmse = float(np.sqrt(mean_squared_error(y_test, preds)))
+        metric_value = rmse
         try:
             additional['r2'] = float(r2_score(y_test, preds))
         except Exception:
@@ -744,51 +1289,51 @@ def _train_tabular_model(
     if weight_series is not None:
         additional['sample_weight_column'] = request.weight_column
 
-    importances = _compute_feature_importance(pipeline, feature_cols, cat_cols)
-    if request.top_n_importances and importances:
-        importances = importances[:request.top_n_importances]
+    # Kept column-wise as well: that is the feature_importance visual's payload as it is
+    importance_features, importance_values = _compute_feature_importance(pipeline, feature_cols, cat_cols)
+    if request.top_n_importances:
+        importance_features = importance_features[:request.top_n_importances]
+        importance_values = importance_values[:request.top_n_importances]
+    importances = _FEATURE_IMPORTANCES.validate_python([
+        {'feature': feature, 'importance': importance}
+        for feature, importance in zip(importance_features, importance_values)
+    ])
 
     comprehensive_summary = _compute_comprehensive_summary(
         pipeline, X_train, X_test, y_train, y_test, preds, current_problem_type, feature_cols
     )
 
-    sample_rows: List[schemas.ModelPreviewRow] = []
     sample_size = min(25, len(preds))
     classes = list(getattr(pipeline.named_steps['model'], 'classes_', [])) if current_problem_type == 'classification' else []
-    for idx in range(sample_size):
-        if hasattr(X_test, 'index'):
-            raw_index = X_test.index[idx]
+    # Slice once and convert to native Python values in bulk rather than indexing row by row
+    # Row labels are the frame's integer row positions; any other index falls back to preview positions
+    index_head = X_test.index[:sample_size]
+    row_indexes = index_head.tolist() if pd.api.types.is_integer_dtype(index_head) else list(range(sample_size))
+    prediction_vals = np.asarray(preds)[:sample_size].tolist()
+    actual_vals = y_test.iloc[:sample_size].tolist()
+    if current_problem_type == 'classification' and proba is not None:
+        proba_rows = proba[:sample_size].tolist()
+        if classes and proba.shape[1] == len(classes):
+            class_keys = [str(cls) for cls in classes]
+            probability_vals = [dict(zip(class_keys, row)) for row in proba_rows]
         else:
-            raw_index = idx
-        try:
-            row_index_val = int(raw_index)
-        except Exception:
-            row_index_val = idx
-        prediction_val = _to_serializable(preds[idx])
-        actual_val = _to_serializable(y_test.iloc[idx])
-        probability_val: Optional[Any] = None
-        if current_problem_type == 'classification' and proba is not None:
-            row_proba = proba[idx]
-            if classes and len(row_proba) == len(classes):
-                probability_val = {str(cls): float(row_proba[class_idx]) for class_idx, cls in enumerate(classes)}
-            else:
-                probability_val = [float(x) for x in row_proba]
-        sample_rows.append(
-            schemas.ModelPreviewRow(
-                row_index=row_index_val,
-                prediction=prediction_val,
-                actual=actual_val,
-                probability=probability_val
-            )
-        )
-
-    y_test_list = y_test.tolist() if len(y_test) <= 50000 else y_test.head(50000).tolist()
-    preds_list = preds.tolist() if hasattr(preds, 'tolist') else list(preds)
-    if len(preds_list) > 50000:
-        preds_list = preds_list[:50000]
-    proba_list = proba.tolist() if proba is not None else None
-    if proba_list is not None and len(proba_list) > 50000:
-        proba_list = proba_list[:50000]
+            probability_vals = proba_rows
+    else:
+        probability_vals = [None] * sample_size
+
+    sample_rows = _PREVIEW_ROWS.validate_python([
+        {'row_index': row_index, 'prediction': prediction_val, 'actual': actual_val, 'probability': probability_val}
+        for row_index, prediction_val, actual_val, probability_val in zip(row_indexes, prediction_vals, actual_vals, probability_vals)
+    ])
+
+    # Stored as arrays; _store_run_arrays writes them out and model_visual converts on read
+    y_test_arr = y_test.to_numpy()[:50000]
+    preds_arr = np.asarray(preds)[:50000]
+    # The ROC visual only needs the positive-class column of a binary model's probabilities, and
+    # only their order, so float32 is plenty
+    prob_pos_arr = proba[:50000, 1].astype(np.float32) if proba is not None and proba.shape[1] == 2 else None
+    # Kept as a tuple so it stays in memory with the record rather than going to disk
+    unique_labels = tuple(np.unique(y_test_arr).tolist()) if current_problem_type == 'classification' else None
 
     metrics = schemas.ModelMetrics(
         problem_type=current_problem_type,
@@ -803,11 +1348,13 @@ def _train_tabular_model(
         'metrics': metrics,
         'summary': comprehensive_summary,
         'feature_importance': importances,
+        '_feature_importance_columns': {'features': importance_features, 'importance': importance_values},
         'sample_predictions': sample_rows,
         'completed_at': datetime.utcnow(),
-        '_y_test': y_test_list,
-        '_preds': preds_list,
-        '_proba': proba_list
+        '_y_test': y_test_arr,
+        '_preds': preds_arr,
+        '_prob_pos': prob_pos_arr,
+        '_unique_labels': unique_labels
     }
 
 
@@ -822,19 +1369,20 @@ def _train_time_series_model(
     if time_column not in df.columns:
         raise HTTPException(status_code=400, detail=f"Time column '{time_column}' not found")
 
-    ts_df = df[[time_column, request.target]].dropna()
-    if ts_df.empty:
+    # Parse both columns once, drop rows where either is missing or unparseable with one mask, and
+    # sort on the parsed timestamps (an integer sort, in true time order whatever the text format)
+    times = pd.to_datetime(df[time_column], errors='coerce')
+    values = pd.to_numeric(df[request.target], errors='coerce')
+    keep = (times.notna() & values.notna()).to_numpy()
+    if not keep.any():
         raise HTTPException(status_code=400, detail='No rows available after dropping missing values for time-series modeling')
-
-    ts_df = ts_df.sort_values(time_column)
-    ts_df[time_column] = pd.to_datetime(ts_df[time_column], errors='coerce')
-    ts_df = ts_df.dropna(subset=[time_column])
-    ts_df['_value'] = pd.to_numeric(ts_df[request.target], errors='coerce')
-    ts_df = ts_df.dropna(subset=['_value'])
-
-    series = ts_df['_value']
-    series.index = ts_df[time_column]
-    series.name = request.target
+    times = times.to_numpy()[keep]
+    order = np.argsort(times, kind='stable')
+    series = pd.Series(
+        values.to_numpy()[keep][order],
+        index=pd.Index(times[order], name=time_column),
+        name=request.target
+    )
 
     if len(series) < 10:
         raise HTTPException(status_code=400, detail='Time-series modeling requires at least 10 observations after cleaning')
@@ -884,7 +1432,8 @@ def _train_time_series_model(
         enforce_stationarity=False,
         enforce_invertibility=False
     )
-    results = model.fit(disp=False)
+    # Parameter standard errors are never reported, so their covariance is skipped
+    results = model.fit(disp=False, cov_type='none')
 
     residuals = results.resid
     fitted = results.fittedvalues
@@ -900,12 +1449,16 @@ def _train_time_series_model(
     if test_count > 0:
         forecast_test = results.get_forecast(steps=test_count)
         test_pred = forecast_test.predicted_mean
-        rmse = float(mean_squared_error(test_series, test_pred, squared=False))
+        rmse = float(np.sqrt(mean_squared_error(test_series, test_pred)))
         metric_value = rmse
         metrics_additional['mae'] = float(mean_absolute_error(test_series, test_pred))
-        denom = test_series.replace(0, np.nan)
-        if not denom.isna().all():
-            mape = float(np.nanmean(np.abs((test_series - test_pred) / denom)) * 100)
+        # Over the non-zero actuals, position by position like the RMSE/MAE above
+        actual_arr = test_series.to_numpy(dtype=float)
+        nonzero = actual_arr != 0
+        if nonzero.any():
+            actual_nz = actual_arr[nonzero]
+            pred_nz = test_pred.to_numpy(dtype=float)[nonzero]
+            mape = float(np.mean(np.abs((actual_nz - pred_nz) / actual_nz)) * 100)
             if np.isfinite(mape):
                 metrics_additional['mape'] = mape
         metrics_additional['holdout_start'] = _format_index_value(test_series.index[0])
@@ -923,18 +1476,20 @@ def _train_time_series_model(
     future_conf = forecast_future.conf_int()
 
     diagnostics: Dict[str, Any] = {}
-    acf_values_list: Optional[List[float]] = None
-    pacf_values_list: Optional[List[float]] = None
-    acf_lags: Optional[List[int]] = None
+    acf_values: Optional[np.ndarray] = None
+    pacf_values: Optional[np.ndarray] = None
+    acf_lags: Optional[np.ndarray] = None
     if request.return_diagnostics:
         resid_clean = residuals.dropna()
         nlags = min(40, len(resid_clean) - 1) if len(resid_clean) > 1 else 0
         if nlags >= 1:
             acf_array = sm_acf(resid_clean, nlags=nlags, fft=True)
-            pacf_array = sm_pacf(resid_clean, nlags=nlags)
-            acf_values_list = list(map(float, acf_array))
-            pacf_values_list = list(map(float, pacf_array))
-            acf_lags = list(range(len(acf_values_list)))
+            # Levinson-Durbin on the adjusted autocovariances: the same values as the default
+            # Yule-Walker solve, without solving a fresh Toeplitz system for every lag
+            pacf_array = sm_pacf(resid_clean, nlags=nlags, method='ldadjusted')
+            acf_values = np.asarray(acf_array, dtype=float)
+            pacf_values = np.asarray(pacf_array, dtype=float)
+            acf_lags = np.arange(len(acf_values))
             try:
                 lb_df = acorr_ljungbox(resid_clean, lags=[min(10, nlags)], return_df=True)
                 lb_row = lb_df.iloc[-1]
@@ -947,27 +1502,30 @@ def _train_time_series_model(
                 diagnostics['ljung_box'] = None
         diagnostics['residual_variance'] = float(resid_clean.var()) if len(resid_clean) else None
 
+    # Training and holdout labels are slices of the full series' labels, which are formatted once
+    series_labels = np.asarray(_format_index(series.index))
+    train_labels = series_labels[:len(train_series)]
+
     if test_count > 0:
         storage_actual = test_series
         storage_pred = test_pred
+        storage_labels = series_labels[len(train_series):]
     else:
         fitted_aligned = fitted.reindex(train_series.index)
         mask = ~fitted_aligned.isna()
         storage_actual = train_series.loc[mask]
         storage_pred = fitted_aligned.loc[mask]
+        storage_labels = train_labels[mask.to_numpy()]
 
-    sample_rows: List[schemas.ModelPreviewRow] = []
     storage_length = len(storage_pred)
-    if storage_length > 0:
-        sample_size = min(25, storage_length)
-        for idx in range(sample_size):
-            sample_rows.append(
-                schemas.ModelPreviewRow(
-                    row_index=idx,
-                    prediction=float(storage_pred.iloc[idx]),
-                    actual=float(storage_actual.iloc[idx])
-                )
-            )
+    sample_size = min(25, storage_length)
+    sample_rows = _PREVIEW_ROWS.validate_python([
+        {'row_index': idx, 'prediction': prediction_val, 'actual': actual_val}
+        for idx, (prediction_val, actual_val) in enumerate(zip(
+            storage_pred.iloc[:sample_size].to_numpy(dtype=float).tolist(),
+            storage_actual.iloc[:sample_size].to_numpy(dtype=float).tolist()
+        ))
+    ])
 
     metrics = schemas.ModelMetrics(
         problem_type='time_series',
@@ -998,9 +1556,9 @@ def _train_time_series_model(
         storage_actual_slice = storage_actual
         storage_pred_slice = storage_pred
 
-    y_storage_list = storage_actual_slice.tolist()
-    preds_storage_list = storage_pred_slice.tolist()
-    storage_index_list = [_format_index_value(idx) for idx in storage_actual_slice.index]
+    y_storage_arr = storage_actual_slice.to_numpy()
+    preds_storage_arr = storage_pred_slice.to_numpy()
+    storage_index = storage_labels[:50000]
 
     return {
         'status': 'completed',
@@ -1010,36 +1568,47 @@ def _train_time_series_model(
         'feature_importance': None,
         'sample_predictions': sample_rows or None,
         'completed_at': datetime.utcnow(),
-        '_y_test': y_storage_list,
-        '_preds': preds_storage_list,
-        '_proba': None,
+        '_y_test': y_storage_arr,
+        '_preds': preds_storage_arr,
+        '_prob_pos': None,
         'time_series_details': time_series_details,
-    '_ts_storage_index': storage_index_list,
-        '_ts_series_index': [_format_index_value(idx) for idx in series.index],
-        '_ts_series_values': [float(val) for val in series.tolist()],
-        '_ts_residual_index': [_format_index_value(idx) for idx in residuals.index],
-        '_ts_residuals': [float(val) for val in residuals.tolist()],
-        '_ts_fitted_index': [_format_index_value(idx) for idx in fitted.index],
-        '_ts_fitted_values': [float(val) for val in fitted.tolist()],
-        '_ts_forecast_index': [_format_index_value(idx) for idx in future_mean.index],
-        '_ts_forecast_mean': [float(val) for val in future_mean.tolist()],
-        '_ts_forecast_lower': [float(val) for val in future_conf.iloc[:, 0].tolist()] if future_conf is not None else None,
-        '_ts_forecast_upper': [float(val) for val in future_conf.iloc[:, 1].tolist()] if future_conf is not None else None,
-        '_ts_acf': acf_values_list,
+        '_ts_storage_index': storage_index,
+        '_ts_series_index': series_labels,
+        '_ts_series_values': series.to_numpy(dtype=float),
+        '_ts_residual_index': train_labels if residuals.index.equals(train_series.index) else _format_index(residuals.index),
+        '_ts_residuals': residuals.to_numpy(dtype=float),
+        '_ts_fitted_index': train_labels if fitted.index.equals(train_series.index) else _format_index(fitted.index),
+        '_ts_fitted_values': fitted.to_numpy(dtype=float),
+        '_ts_forecast_index': _format_index(future_mean.index),
+        '_ts_forecast_mean': future_mean.to_numpy(dtype=float),
+        '_ts_forecast_lower': future_conf.iloc[:, 0].to_numpy(dtype=float) if future_conf is not None else None,
+        '_ts_forecast_upper': future_conf.iloc[:, 1].to_numpy(dtype=float) if future_conf is not None else None,
+        '_ts_acf': acf_values,
         '_ts_acf_lags': acf_lags,
-        '_ts_pacf': pacf_values_list
+        '_ts_pacf': pacf_values
     }
 
 @router.post('/datasets/{dataset_id}/model/runs', response_model=schemas.ModelRunResponse)
 async def create_model_run(dataset_id: int, request: schemas.ModelTaskRequest, db: Session = Depends(get_db)):
     _require_sklearn()
     ds = _get_dataset_or_404(dataset_id, db)
-    df = _load_cleaned_dataframe(dataset_id)
+    is_time_series = request.problem_type == 'time_series' or request.model_type in ('arima', 'sarima')
+    df = None
+    columns = _model_columns(dataset_id, request)
+    if request.max_rows and not is_time_series:
+        # tabular models train on at most max_rows target-bearing rows, so only those are read
+        df = _load_sampled_dataframe(dataset_id, request.target, request.max_rows, request.random_state, columns)
+    sampled = df is not None
+    if df is None:
+        df = _load_cleaned_dataframe(dataset_id, columns)
     if request.target not in df.columns:
         raise HTTPException(status_code=400, detail=f"Target column '{request.target}' not found")
     problem_type = request.problem_type
     if problem_type == 'auto':
-        problem_type = _infer_problem_type(df, request.target)
+        if sampled:
+            problem_type = _infer_problem_type(df, request.target)
+        else:
+            problem_type = _table_problem_type(dataset_id, columns, request.target)
 
     run_id = str(uuid.uuid4())
     run_record: Dict[str, Any] = {
@@ -1050,18 +1619,23 @@ async def create_model_run(dataset_id: int, request: schemas.ModelTaskRequest, d
         'problem_type': problem_type,
         'created_at': datetime.utcnow(),
     }
-    _MODEL_RUNS[run_id] = run_record
+    _MODEL_RUNS.put(run_id, run_record)
+    _MODEL_RUNS.prune(dataset_id, MODEL_RUNS_PER_DATASET)
 
     try:
         if problem_type == 'time_series' or request.model_type in ('arima', 'sarima'):
             _require_statsmodels()
             update = _train_time_series_model(df, request, problem_type)
         else:
-            update = _train_tabular_model(df, request, problem_type)
+            with threadpool_limits(limits=SKLEARN_BLAS_THREADS, user_api='blas'):
+                update = _train_tabular_model(df, request, problem_type)
         run_record.update(update)
+        _store_run_arrays(run_id, run_record)
     except Exception as e:
         friendly = _friendly_error(str(e), problem_type)
         run_record.update({'status': 'failed', 'message': friendly, 'completed_at': datetime.utcnow()})
+    finally:
+        _MODEL_RUNS.put(run_id, run_record)
 
     return schemas.ModelRunResponse(**run_record)
 
@@ -1080,106 +1654,141 @@ def _friendly_error(msg: str, problem_type: str) -> str:
     return msg
 
 
+def _sample_positions(total: int, max_points: int) -> Union[slice, np.ndarray]:
+    """Index selecting the stored points a visual plots.
+
+    A slice over all of them (so indexing the stored arrays takes views, not copies), or
+    max_points positions spread evenly from the first point to the last. The selection is
+    deterministic, so repeat requests and every kind of visual show the same points, in their
+    stored (for time series, chronological) order with even coverage of the whole range.
+    Per-point values (residuals, fitted values) are then computed for these positions only.
+    """
+    if total <= max_points:
+        return slice(None)
+    return np.linspace(0, total - 1, max_points).round().astype(np.intp)
+
+
+def _roc_payload(rec: Dict[str, Any], y_true_arr: np.ndarray, max_points: int) -> Dict[str, Any]:
+    """fpr/tpr lists for a binary classification run's ROC visual, at most max_points long."""
+    # Only for binary classification
+    unique = rec.get('_unique_labels')
+    if unique is None:
+        unique = np.unique(y_true_arr).tolist()
+    prob_pos = _run_array(rec, '_prob_pos', as_list=False)
+    if len(unique) != 2 or prob_pos is None:
+        raise HTTPException(status_code=400, detail='ROC requires binary classification with probabilities')
+    # Compute simple ROC curve
+    try:
+        # prob_pos rows line up with y_true_arr
+        pos = y_true_arr == unique[1]
+        # Exact curve: sort once by descending score, then cumulative positive/negative counts
+        # at each distinct score are the TP/FP counts for that threshold. Only the count at the end
+        # of each run of tied scores is read, so the sort needn't be stable.
+        order = np.argsort(prob_pos)[::-1]
+        scores = prob_pos[order]
+        threshold_idx = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+        tps = np.cumsum(pos[order])[threshold_idx]
+        fps = threshold_idx + 1 - tps
+        tps = np.r_[0, tps]
+        fps = np.r_[0, fps]
+        # Drop points lying on a straight segment between their neighbours (as roc_curve's
+        # drop_intermediate does): the curve is unchanged, and max_points thinning keeps its corners
+        if len(tps) > 2:
+            corner = np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True]
+            tps = tps[corner]
+            fps = fps[corner]
+        tpr = tps / tps[-1] if tps[-1] > 0 else np.zeros(len(tps))
+        fpr = fps / fps[-1] if fps[-1] > 0 else np.zeros(len(fps))
+        if len(fpr) > max_points:
+            keep = np.unique(np.linspace(0, len(fpr) - 1, max_points).round().astype(int))
+            fpr = fpr[keep]
+            tpr = tpr[keep]
+        data = {'fpr': _json_array(fpr), 'tpr': _json_array(tpr)}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f'ROC generation failed: {e}')
+    return data
+
+
 @router.post('/datasets/{dataset_id}/model/visual', response_model=schemas.ModelVisualResponse)
 async def model_visual(dataset_id: int, request: schemas.ModelVisualRequest, db: Session = Depends(get_db)):
     _require_sklearn()
     _ = _get_dataset_or_404(dataset_id, db)
-    rec = _MODEL_RUNS.get(request.run_id)
-    if not rec or rec['dataset_id'] != dataset_id:
+    rec = _MODEL_RUNS.get(dataset_id, request.run_id)
+    if not rec:
         raise HTTPException(status_code=404, detail='Model run not found')
     if rec.get('status') != 'completed':
         raise HTTPException(status_code=400, detail='Model run not completed')
     problem_type = rec.get('problem_type','unknown')
     is_time_series = problem_type == 'time_series'
-    y_true = rec.get('_y_test')
-    y_pred = rec.get('_preds')
-    proba = rec.get('_proba')
-    ts_storage_index = rec.get('_ts_storage_index') if is_time_series else None
-    if not is_time_series and (y_true is None or y_pred is None):
+    y_true_arr = _run_array(rec, '_y_test', as_list=False)
+    y_pred_arr = _run_array(rec, '_preds', as_list=False)
+    ts_storage_index = _run_array(rec, '_ts_storage_index', as_list=False) if is_time_series else None
+    if not is_time_series and (y_true_arr is None or y_pred_arr is None):
         raise HTTPException(status_code=400, detail='Run lacks stored predictions')
-    if is_time_series and (y_true is None or y_pred is None) and request.kind not in ('acf', 'pacf', 'ts_diagnostics', 'forecast'):
+    if is_time_series and (y_true_arr is None or y_pred_arr is None) and request.kind not in ('acf', 'pacf', 'ts_diagnostics', 'forecast'):
         raise HTTPException(status_code=400, detail='Time-series run lacks stored predictions for this visualization')
-    total = len(y_true) if y_true is not None else 0
-    import random
-    idx = list(range(total))
-    if request.kind in ('pred_vs_actual','residuals') and total > request.max_points:
-        random.seed(42)
-        idx = random.sample(idx, request.max_points)
+    total = len(y_true_arr) if y_true_arr is not None else 0
+    idx = _sample_positions(total, request.max_points) if request.kind == 'pred_vs_actual' else slice(None)
     # Build payload
     requested_kind = request.kind
     kind = 'roc' if requested_kind == 'roc_curve' else requested_kind
     data: Dict[str, Any] = {}
     if kind == 'pred_vs_actual':
-        if y_true is None or y_pred is None:
+        if y_true_arr is None or y_pred_arr is None:
             raise HTTPException(status_code=400, detail='No prediction data available for this visualization')
         data = {
-            'actual': [y_true[i] for i in idx],
-            'pred': [y_pred[i] for i in idx]
+            'actual': _json_array(y_true_arr[idx]),
+            'pred': _json_array(y_pred_arr[idx])
         }
-        if is_time_series and ts_storage_index:
-            data['index'] = [ts_storage_index[i] for i in idx]
+        if is_time_series and ts_storage_index is not None and ts_storage_index.size:
+            data['index'] = _json_array(ts_storage_index[idx])
     elif kind == 'residuals':
+        # Pick the points first, then compute residuals for those only
+        idx = _sample_positions(total, request.max_points)
         try:
-            residuals = [y_true[i] - y_pred[i] for i in range(len(y_true))]
+            residuals = np.subtract(y_true_arr[idx], y_pred_arr[idx])
         except Exception:
-            residuals = []
-        if residuals:
-            if len(residuals) > request.max_points:
-                random.seed(43)
-                sample_idx = random.sample(range(len(residuals)), request.max_points)
-            else:
-                sample_idx = list(range(len(residuals)))
+            residuals = np.empty(0)
+        if residuals.size:
             data = {
-                'residuals': [residuals[i] for i in sample_idx]
+                'residuals': _json_array(residuals)
             }
-            if is_time_series and ts_storage_index:
-                data['index'] = [ts_storage_index[i] for i in sample_idx]
+            if is_time_series and ts_storage_index is not None and ts_storage_index.size:
+                data['index'] = _json_array(ts_storage_index[idx])
     elif kind == 'confusion_matrix':
         if problem_type != 'classification':
             raise HTTPException(status_code=400, detail='Confusion matrix only for classification')
-        from collections import defaultdict
-        labels = sorted(set(y_true))
-        label_to_idx = {v:i for i,v in enumerate(labels)}
-        matrix = [[0 for _ in labels] for _ in labels]
-        for a, p in zip(y_true, y_pred):
-            if a in label_to_idx and p in label_to_idx:
-                matrix[label_to_idx[a]][label_to_idx[p]] += 1
-        data = {'labels': labels, 'matrix': matrix}
+        # A finished run's predictions never change, so the matrix is built once and saved with the
+        # run (surviving its record's eviction from memory)
+        cached = rec.get('_confusion_matrix')
+        if cached is None:
+            # Encode both sides as positions in the sorted labels (predictions outside them are skipped);
+            # the true side's codes come out of the same sort that finds the labels
+            labels_arr, true_codes = np.unique(y_true_arr, return_inverse=True)
+            labels = labels_arr.tolist()
+            pred_codes = np.minimum(np.searchsorted(labels_arr, y_pred_arr), len(labels) - 1)
+            known = labels_arr[pred_codes] == y_pred_arr
+            n_labels = len(labels)
+            flat = true_codes[known].astype(np.int64) * n_labels + pred_codes[known]
+            matrix = np.bincount(flat, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+            cached = rec['_confusion_matrix'] = {'labels': labels, 'matrix': _json_array(matrix)}
+            _MODEL_RUNS.put(request.run_id, rec)
+        data = dict(cached)
     elif kind == 'roc':
         if problem_type != 'classification':
             raise HTTPException(status_code=400, detail='ROC only for classification')
-        # Only for binary classification
-        unique = sorted(set(y_true))
-        if len(unique) != 2 or proba is None:
-            raise HTTPException(status_code=400, detail='ROC requires binary classification with probabilities')
-        # Compute simple ROC curve
-        try:
-            import numpy as np
-            y_arr = np.array(y_true)
-            # assume order corresponds to proba rows
-            prob_pos = np.array([row[1] for row in proba]) if len(proba[0])==2 else None
-            if prob_pos is None:
-                raise ValueError('Probability array not binary')
-            thresholds = np.linspace(0,1,101)
-            tpr = []
-            fpr = []
-            pos = y_arr == unique[1]
-            neg = ~pos
-            for th in thresholds:
-                pred_pos = prob_pos >= th
-                tp = (pred_pos & pos).sum()
-                fp = (pred_pos & neg).sum()
-                fn = (~pred_pos & pos).sum()
-                tn = (~pred_pos & neg).sum()
-                tpr.append(tp / (tp+fn) if (tp+fn)>0 else 0.0)
-                fpr.append(fp / (fp+tn) if (fp+tn)>0 else 0.0)
-            data = {'fpr': list(map(float,fpr)), 'tpr': list(map(float,tpr))}
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f'ROC generation failed: {e}')
+        cached_roc = rec.get('_roc_curve')
+        if cached_roc is not None and cached_roc[0] == request.max_points:
+            data = dict(cached_roc[1])
+        else:
+            data = _roc_payload(rec, y_true_arr, request.max_points)
+            rec['_roc_curve'] = (request.max_points, data)
+            _MODEL_RUNS.put(request.run_id, rec)
+            data = dict(data)
     elif kind == 'acf':
-        acf_vals = rec.get('_ts_acf')
-        lags = rec.get('_ts_acf_lags')
-        if not acf_vals or not lags:
+        acf_vals = _run_json(rec, '_ts_acf')
+        lags = _run_json(rec, '_ts_acf_lags')
+        if acf_vals is None or not len(acf_vals) or lags is None or not len(lags):
             raise HTTPException(status_code=400, detail='Autocorrelation diagnostics not available for this run')
         data = {
             'lags': lags,
@@ -1187,9 +1796,9 @@ async def model_visual(dataset_id: int, request: schemas.ModelVisualRequest, db:
         }
         total = len(acf_vals)
     elif kind == 'pacf':
-        pacf_vals = rec.get('_ts_pacf')
-        lags = rec.get('_ts_acf_lags')
-        if not pacf_vals or not lags:
+        pacf_vals = _run_json(rec, '_ts_pacf')
+        lags = _run_json(rec, '_ts_acf_lags')
+        if pacf_vals is None or not len(pacf_vals) or lags is None or not len(lags):
             raise HTTPException(status_code=400, detail='Partial autocorrelation diagnostics not available for this run')
         data = {
             'lags': lags,
@@ -1197,29 +1806,29 @@ async def model_visual(dataset_id: int, request: schemas.ModelVisualRequest, db:
         }
         total = len(pacf_vals)
     elif kind == 'ts_diagnostics':
-        residuals = rec.get('_ts_residuals') or []
-        residual_index = rec.get('_ts_residual_index') or []
+        residuals = _run_json(rec, '_ts_residuals')
+        residual_index = _run_json(rec, '_ts_residual_index')
         details = rec.get('time_series_details') or {}
         data = {
             'residuals': {
-                'index': residual_index,
-                'values': residuals
+                'index': residual_index if residual_index is not None else [],
+                'values': residuals if residuals is not None else []
             },
             'details': details
         }
-        total = len(residuals)
+        total = len(data['residuals']['values'])
     elif kind == 'forecast':
-        forecast_index = rec.get('_ts_forecast_index')
-        forecast_mean = rec.get('_ts_forecast_mean')
-        if not forecast_index or not forecast_mean:
+        forecast_index = _run_json(rec, '_ts_forecast_index')
+        forecast_mean = _run_json(rec, '_ts_forecast_mean')
+        if forecast_index is None or not len(forecast_index) or forecast_mean is None or not len(forecast_mean):
             raise HTTPException(status_code=400, detail='Forecast data not available for this run')
         data = {
             'forecast_index': forecast_index,
             'forecast_mean': forecast_mean,
-            'forecast_lower': rec.get('_ts_forecast_lower'),
-            'forecast_upper': rec.get('_ts_forecast_upper'),
-            'history_index': rec.get('_ts_series_index'),
-            'history_values': rec.get('_ts_series_values')
+            'forecast_lower': _run_json(rec, '_ts_forecast_lower'),
+            'forecast_upper': _run_json(rec, '_ts_forecast_upper'),
+            'history_index': _run_json(rec, '_ts_series_index'),
+            'history_values': _run_json(rec, '_ts_series_values')
         }
         total = len(forecast_mean)
     elif kind == 'qq_plot':
@@ -1227,61 +1836,54 @@ async def model_visual(dataset_id: int, request: schemas.ModelVisualRequest, db:
         if problem_type != 'regression':
             raise HTTPException(status_code=400, detail='Q-Q plot only for regression')
         try:
-            import numpy as np
-            import scipy.stats as stats
-            residuals = np.array([y_true[i] - y_pred[i] for i in range(len(y_true))])
-            # Sample if too many points
-            if len(residuals) > request.max_points:
-                random.seed(44)
-                sample_idx = random.sample(range(len(residuals)), request.max_points)
-                residuals = residuals[sample_idx]
+            # Sample if too many points, then compute residuals for the sample only
+            sample_idx = _sample_positions(len(y_true_arr), request.max_points)
+            residuals = np.subtract(y_true_arr[sample_idx], y_pred_arr[sample_idx])
             
-            # Compute theoretical quantiles
-            residuals_sorted = np.sort(residuals)
-            n = len(residuals_sorted)
-            theoretical_quantiles = stats.norm.ppf(np.linspace(0.5/n, 1-0.5/n, n))
+            # Theoretical normal quantiles: ndtri is the standard normal ppf without scipy.stats dispatch
+            n = len(residuals)
+            if n > QQ_FULL_SORT_MAX:
+                # Only QQ_GRID_POINTS order statistics are plotted, so select them in linear time
+                # rather than sorting everything
+                positions = np.unique(np.linspace(0, n - 1, QQ_GRID_POINTS).round().astype(int))
+                residuals_sorted = np.partition(residuals, positions)[positions]
+                theoretical_quantiles = ndtri((positions + 0.5) / n)
+            else:
+                residuals_sorted = np.sort(residuals)
+                theoretical_quantiles = ndtri(np.linspace(0.5/n, 1-0.5/n, n))
             
             data = {
-                'theoretical': list(map(float, theoretical_quantiles)),
-                'sample': list(map(float, residuals_sorted))
+                'theoretical': _json_array(theoretical_quantiles),
+                'sample': _json_array(residuals_sorted)
             }
         except Exception as e:
             raise HTTPException(status_code=400, detail=f'Q-Q plot generation failed: {e}')
     elif kind == 'feature_importance':
         # Feature importance plot
-        feature_importance = rec.get('feature_importance', [])
-        if not feature_importance:
+        columns = rec.get('_feature_importance_columns')
+        if not columns or not columns['features']:
             raise HTTPException(status_code=400, detail='No feature importance data available')
-        
-        data = {
-            'features': [item['feature'] for item in feature_importance],
-            'importance': [item['importance'] for item in feature_importance]
-        }
+        data = dict(columns)
     elif kind == 'residuals_vs_fitted':
         # Residuals vs fitted values plot (regression only)
         if problem_type != 'regression':
             raise HTTPException(status_code=400, detail='Residuals vs fitted plot only for regression')
         try:
-            residuals = [y_true[i] - y_pred[i] for i in range(len(y_true))]
-            fitted = y_pred.copy()
-            
-            # Sample if too many points
-            if len(residuals) > request.max_points:
-                random.seed(45)
-                sample_idx = random.sample(range(len(residuals)), request.max_points)
-                residuals = [residuals[i] for i in sample_idx]
-                fitted = [fitted[i] for i in sample_idx]
+            # Sample if too many points, before computing anything per point
+            sample_idx = _sample_positions(len(y_true_arr), request.max_points)
+            fitted = y_pred_arr[sample_idx]
+            residuals = np.subtract(y_true_arr[sample_idx], fitted)
             
             data = {
-                'fitted': fitted,
-                'residuals': residuals
+                'fitted': _json_array(fitted),
+                'residuals': _json_array(residuals)
             }
         except Exception as e:
             raise HTTPException(status_code=400, detail=f'Residuals vs fitted plot generation failed: {e}')
     else:
         raise HTTPException(status_code=400, detail='Unsupported visual kind')
     if kind in ('pred_vs_actual', 'residuals'):
-        sampled = len(idx)
+        sampled = min(total, request.max_points)
     elif kind in ('acf', 'pacf'):
         sampled = len(data.get('lags', []))
     elif kind == 'ts_diagnostics':
@@ -1289,28 +1891,34 @@ async def model_visual(dataset_id: int, request: schemas.ModelVisualRequest, db:
     elif kind == 'forecast':
         sampled = len(data.get('forecast_mean', []))
     else:
-        sampled = len(y_true) if y_true is not None else total
-
-    return schemas.ModelVisualResponse(
-        run_id=request.run_id,
-        kind=kind,
-        problem_type=problem_type,
-        sampled=sampled,
-        total=total,
-        data=data
-    )
+        sampled = len(y_true_arr) if y_true_arr is not None else total
+
+    # Rendered straight to orjson: validating a ModelVisualResponse would walk every point of
+    # the payload again in Python, and its numeric arrays are serialised by orjson natively
+    return ORJSONResponse({
+        'run_id': request.run_id,
+        'kind': kind,
+        'problem_type': problem_type,
+        'sampled': int(sampled),
+        'total': int(total),
+        'data': data,
+        'message': None
+    })
 
 @router.get('/datasets/{dataset_id}/model/runs', response_model=schemas.ListModelRunsResponse)
 async def list_model_runs(dataset_id: int, db: Session = Depends(get_db)):
     _ = _get_dataset_or_404(dataset_id, db)
-    runs = [schemas.ModelRunResponse(**r) for r in _MODEL_RUNS.values() if r['dataset_id']==dataset_id]
-    runs.sort(key=lambda r: r.created_at, reverse=True)
+    records = [rec for rec in (_MODEL_RUNS.get(dataset_id, rid, keep=False) for rid in _MODEL_RUNS.run_ids(dataset_id))
+               if rec is not None]
+    # Newest first
+    records.sort(key=lambda rec: rec['created_at'], reverse=True)
+    runs = _RUN_RESPONSES.validate_python(records)
     return schemas.ListModelRunsResponse(runs=runs)
 
 @router.get('/datasets/{dataset_id}/model/runs/{run_id}', response_model=schemas.ModelRunResponse)
 async def get_model_run(dataset_id: int, run_id: str, db: Session = Depends(get_db)):
     _ = _get_dataset_or_404(dataset_id, db)
-    rec = _MODEL_RUNS.get(run_id)
-    if not rec or rec['dataset_id'] != dataset_id:
+    rec = _MODEL_RUNS.get(dataset_id, run_id)
+    if not rec:
         raise HTTPException(status_code=404, detail='Model run not found')
     return schemas.ModelRunResponse(**rec)
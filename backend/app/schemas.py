@@ -1,6 +1,12 @@
+import sys
 from datetime import datetime
-from typing import List, Dict, Any, Literal, Optional, Union, Annotated
-from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Literal, Optional, Tuple, Union, Annotated
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+# Column names in batch payloads repeat across every item; interning makes them one shared object
+ColumnName = Annotated[str, AfterValidator(sys.intern)]
+# A value SQLite can store in a cell. Smart-mode union: JSON true/1/1.0/"1" each keep their own type
+CellValue = Union[bool, int, float, str, None]
 
 
 class DatasetBasic(BaseModel):
@@ -13,8 +19,7 @@ class DatasetBasic(BaseModel):
     n_cols_clean: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CleaningConfig(BaseModel):
@@ -43,11 +48,14 @@ class TimeFormatResponse(BaseModel):
     columns: List[str]
 
 
-# Mutation request batches used by dataset router
+# Mutation request batches used by dataset router. Their items (like the per-feature/per-row
+# items of model runs below) are built once per element and never modified, so they are frozen.
 class CellEdit(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     rowid: int
-    column: str
-    value: Any
+    column: ColumnName
+    value: CellValue
 
 class CellEditBatch(BaseModel):
     edits: List[CellEdit]
@@ -56,21 +64,27 @@ class CellEditResponse(BaseModel):
     updated: int
 
 class ColumnRename(BaseModel):
-    old: str
-    new: str
+    model_config = ConfigDict(frozen=True)
+
+    old: ColumnName
+    new: ColumnName
 
 class ColumnRenameBatch(BaseModel):
     renames: List[ColumnRename]
 
 class RoundSpec(BaseModel):
-    column: str
+    model_config = ConfigDict(frozen=True)
+
+    column: ColumnName
     decimals: int
 
 class RoundBatch(BaseModel):
     rounds: List[RoundSpec]
 
 class ImputeSpec(BaseModel):
-    column: str
+    model_config = ConfigDict(frozen=True)
+
+    column: ColumnName
     strategy: Literal['mean','median','zero','mode','constant']
     constant: Optional[str] = None
 
@@ -79,7 +93,9 @@ class ImputeBatch(BaseModel):
 
 
 class FilterCondition(BaseModel):
-    column: str
+    model_config = ConfigDict(frozen=True)
+
+    column: ColumnName
     operator: Literal[
         'eq', 'ne', 'gt', 'gte', 'lt', 'lte',
         'contains', 'not_contains', 'startswith', 'endswith',
@@ -102,7 +118,9 @@ class FilterRowsOperation(BaseModel):
 
 
 class SortKey(BaseModel):
-    column: str
+    model_config = ConfigDict(frozen=True)
+
+    column: ColumnName
     ascending: bool = True
 
 
@@ -151,7 +169,9 @@ class NormalizeColumnsOperation(BaseModel):
 
 
 class AggregationSpec(BaseModel):
-    column: str
+    model_config = ConfigDict(frozen=True)
+
+    column: ColumnName
     func: Literal['count', 'sum', 'mean', 'median', 'min', 'max', 'std']
     alias: Optional[str] = None
 
@@ -232,7 +252,9 @@ class DatasetSource(BaseModel):
 
 class PreviewBlock(BaseModel):
     columns: List[str]
-    rows: List[Dict[str, Any]]
+    rows: List[Dict[str, Any]] = Field(default_factory=list)
+    # Same rows as value lists aligned with `columns`, filled instead of `rows` when requested
+    rows_columnar: Optional[List[List[Any]]] = None
     total_rows: Optional[int] = None  # optional for paginated preview
     offset: Optional[int] = None
     limit: Optional[int] = None
@@ -241,7 +263,7 @@ class PreviewBlock(BaseModel):
 class ReportBlock(BaseModel):
     duplicates_removed: int
     rows_dropped_for_missing: int
-    missing_by_column: Dict[str, Dict[str, Union[int, Any]]]
+    missing_by_column: Dict[str, Dict[str, int]]  # column -> {"before": n, "after": n}
     dtype_inference: Dict[str, str]
     date_columns_standardized: List[str]
     notes: List[str]
@@ -296,8 +318,7 @@ class DatasetListItem(BaseModel):
     cols_clean: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ListDatasetsResponse(BaseModel):
@@ -310,7 +331,7 @@ class GraphConfigRequest(BaseModel):
     xlabel: Optional[str] = None
     ylabel: Optional[str] = None
     color_palette: str = "viridis"
-    figsize: tuple = (10, 6)
+    figsize: Tuple[float, float] = (10, 6)  # (width, height) in inches
     dpi: int = 100
     style: str = "whitegrid"
     font_size: int = 12
@@ -352,6 +373,7 @@ class CreateGraphRequest(BaseModel):
     group_by: Optional[str] = None
     aggregation: Optional[Literal['count','sum','mean','median','min','max']] = None
     return_data: Optional[bool] = False
+    return_binary: Optional[bool] = False  # respond with the raw PNG (image/png) instead of JSON
     config: Optional[GraphConfigRequest] = None
     custom_plot: Optional[CustomPlotSpec] = None
 
@@ -371,6 +393,10 @@ class AvailableColumnsResponse(BaseModel):
 
 # --- Modeling / Feature Lab Schemas ---
 class ModelTaskRequest(BaseModel):
+    # model_type is part of the public request body; opt out of pydantic's "model_" namespace
+    # guard so importing the schemas does not warn on every worker start
+    model_config = ConfigDict(protected_namespaces=())
+
     target: str
     problem_type: Optional[Literal['auto','classification','regression','time_series']] = 'auto'
     model_type: Literal[
@@ -389,7 +415,7 @@ class ModelTaskRequest(BaseModel):
     exclude_columns: Optional[List[str]] = None  # blacklist (applied after include)
     test_size: float = 0.2
     random_state: int = 42
-    max_rows: Optional[int] = 50000  # sampling cap for performance
+    max_rows: Optional[int] = Field(50000, ge=0)  # sampling cap for performance; 0 or None reads every row
     normalize_numeric: bool = True
     encode_categoricals: Literal['auto','onehot','ordinal'] = 'auto'
     feature_interactions: bool = True
@@ -408,6 +434,8 @@ class ModelTaskRequest(BaseModel):
     return_diagnostics: bool = True
 
 class FeatureImportanceItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     feature: str
     importance: float
 
@@ -418,6 +446,8 @@ class ModelMetrics(BaseModel):
     additional: Dict[str, Any]
 
 class CoefficientSummary(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     feature: str
     estimate: float
     std_error: Optional[float] = None
@@ -444,6 +474,8 @@ class ModelSummary(BaseModel):
     classification_report: Optional[Dict[str, Any]] = None
 
 class ModelPreviewRow(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     row_index: int
     prediction: Any
     actual: Optional[Any] = None